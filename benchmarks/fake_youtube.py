@@ -0,0 +1,189 @@
+"""
+Local stand-in for the YouTube resumable upload endpoint.
+
+Implements the parts of the videos.insert resumable protocol used by
+youtube_uploader.upload_video(): session creation (POST), chunk uploads
+(PUT with Content-Range, answered by 308 + Range or by the final 200) and
+offset queries (PUT with "bytes */total"). The uploaded bytes are discarded,
+only offsets are kept, so multi-GB files can be sent without using disk.
+
+Latency, bandwidth, 5xx errors and dropped connections can be injected to
+reproduce a slow or unreliable link.
+"""
+import collections
+import http.server
+import json
+import random
+import re
+import threading
+import time
+import urllib.parse
+
+READ_BLOCK_SIZE = 64 * 1024
+
+
+class FakeYouTubeServer(http.server.ThreadingHTTPServer):
+    """
+    Serveur HTTP local qui imite l'API d'upload résumable de YouTube.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, latency=0.0, bandwidth=0, error_rate=0.0, drop_rate=0.0, seed=None):
+        """
+        Args:
+            latency (float): Délai ajouté avant chaque réponse, en secondes
+            bandwidth (int): Débit maximal de réception en octets/s (0 = illimité)
+            error_rate (float): Probabilité qu'un chunk reçoive une erreur 503
+            drop_rate (float): Probabilité qu'une connexion soit coupée en plein chunk
+            seed (int): Graine du générateur aléatoire (résultats reproductibles)
+        """
+        super().__init__(('127.0.0.1', 0), FakeYouTubeHandler)
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.error_rate = error_rate
+        self.drop_rate = drop_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.sessions = {}
+        self.calls = collections.Counter()
+        self.bytes_received = 0
+        self._thread = None
+
+    @property
+    def root_url(self):
+        return f'http://127.0.0.1:{self.server_address[1]}/'
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, name='fake-youtube', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def roll(self, probability):
+        with self.lock:
+            return probability > 0 and self.random.random() < probability
+
+
+class FakeYouTubeHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, code, body=b'', headers=None):
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        self.send_response(code)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, code, payload, headers=None):
+        headers = dict(headers or {}, **{'Content-Type': 'application/json'})
+        self._send(code, json.dumps(payload).encode('utf-8'), headers)
+
+    def _read_body(self, drop_after=None):
+        """
+        Lit (et jette) le corps de la requête au débit configuré.
+
+        Returns:
+            int: Nombre d'octets lus, ou None si la connexion a été coupée
+        """
+        length = int(self.headers.get('Content-Length', 0))
+        received = 0
+        started = time.monotonic()
+        while received < length:
+            block = self.rfile.read(min(READ_BLOCK_SIZE, length - received))
+            if not block:
+                return None
+            received += len(block)
+            if drop_after is not None and received >= drop_after:
+                return None
+            if self.server.bandwidth:
+                ahead = received / self.server.bandwidth - (time.monotonic() - started)
+                if ahead > 0:
+                    time.sleep(ahead)
+        with self.server.lock:
+            self.server.bytes_received += received
+        return received
+
+    def do_POST(self):
+        path = urllib.parse.urlparse(self.path).path
+        self._read_body()
+        if path.endswith('/videos'):
+            with self.server.lock:
+                self.server.calls['videos.insert'] += 1
+                upload_id = str(len(self.server.sessions) + 1)
+                self.server.sessions[upload_id] = 0
+            location = f'{self.server.root_url}upload/youtube/v3/videos?uploadType=resumable&upload_id={upload_id}'
+            self._send(200, headers={'Location': location})
+        elif '/thumbnails/set' in path:
+            with self.server.lock:
+                self.server.calls['thumbnails.set'] += 1
+            self._send_json(200, {'items': []})
+        else:
+            self._send_json(404, {'error': {'code': 404, 'message': 'Not Found'}})
+
+    def do_PUT(self):
+        query = urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query)
+        upload_id = query.get('upload_id', [None])[0]
+        content_range = self.headers.get('Content-Range', '')
+
+        with self.server.lock:
+            self.server.calls['upload.put'] += 1
+            offset = self.server.sessions.get(upload_id)
+        if offset is None:
+            self._read_body()
+            self._send_json(404, {'error': {'code': 404, 'message': 'Upload session not found'}})
+            return
+
+        # Requête d'offset : "bytes */total"
+        query_match = re.match(r'bytes \*/(\d+|\*)', content_range)
+        if query_match:
+            self._read_body()
+            with self.server.lock:
+                self.server.calls['upload.status'] += 1
+            self._send(308, headers={'Range': f'bytes=0-{offset - 1}'} if offset else {})
+            return
+
+        chunk_match = re.match(r'bytes (\d+)-(\d+)/(\d+|\*)', content_range)
+        if not chunk_match:
+            self._read_body()
+            self._send_json(400, {'error': {'code': 400, 'message': 'Bad Content-Range'}})
+            return
+        first, last, total = int(chunk_match[1]), int(chunk_match[2]), chunk_match[3]
+
+        # Connexion coupée au milieu du chunk : le client doit redemander l'offset
+        if self.server.roll(self.server.drop_rate):
+            with self.server.lock:
+                self.server.calls['injected.drop'] += 1
+            self._read_body(drop_after=max(1, (last - first + 1) // 2))
+            self.close_connection = True
+            return
+
+        if self._read_body() is None:
+            self.close_connection = True
+            return
+
+        if self.server.roll(self.server.error_rate):
+            with self.server.lock:
+                self.server.calls['injected.5xx'] += 1
+            self._send_json(503, {'error': {'code': 503, 'message': 'Backend Error'}})
+            return
+
+        # Les octets au-delà de l'offset courant sont acceptés, les doublons ignorés
+        if first <= offset:
+            offset = max(offset, last + 1)
+            with self.server.lock:
+                self.server.sessions[upload_id] = offset
+
+        if total != '*' and offset == int(total):
+            self._send_json(200, {'id': f'fake{upload_id}', 'kind': 'youtube#video'})
+        else:
+            self._send(308, headers={'Range': f'bytes=0-{offset - 1}'})
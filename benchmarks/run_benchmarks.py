@@ -0,0 +1,286 @@
+"""
+Offline benchmarks for the upload path, the folder scan and the upload ledger.
+
+Usage:
+    python benchmarks/run_benchmarks.py [upload|media|scan|ledger|all] [options]
+
+Every benchmark runs in a temporary working directory (data/ files included),
+so the real data/ folder is never touched. Results report wall time, MB/s,
+CPU time, peak RSS and the API calls seen by the fake server.
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+SCRIPT = os.path.abspath(__file__)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import youtube_uploader as ytu  # noqa: E402
+from fake_youtube import FakeYouTubeServer  # noqa: E402
+from googleapiclient.discovery import build_from_document  # noqa: E402
+
+
+class Measure:
+    """
+    Mesure le temps écoulé, le temps CPU et le pic de mémoire d'un bloc.
+    """
+
+    def __enter__(self):
+        self.wall = time.perf_counter()
+        self.cpu = time.process_time()
+        return self
+
+    def __exit__(self, *exc):
+        self.wall = time.perf_counter() - self.wall
+        self.cpu = time.process_time() - self.cpu
+        # ru_maxrss est en Kio sous Linux
+        self.max_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        return False
+
+    def as_dict(self):
+        return {
+            'wall_seconds': round(self.wall, 3),
+            'cpu_seconds': round(self.cpu, 3),
+            'max_rss_mb': round(self.max_rss_mb, 1)
+        }
+
+
+def build_fake_service(server):
+    """
+    Construit un service YouTube qui pointe vers le faux serveur.
+
+    Args:
+        server (FakeYouTubeServer): Serveur démarré
+
+    Returns:
+        googleapiclient.discovery.Resource: Service YouTube
+    """
+    document = dict(json.loads(ytu.load_discovery_document()), rootUrl=server.root_url)
+    return build_from_document(document, http=ytu.build_throttled_http(), requestBuilder=ytu.QuotaHttpRequest)
+
+
+def api_call_counts():
+    """
+    Returns:
+        dict: Appels à l'API comptés par youtube_uploader, par méthode
+    """
+    return {entry['labels']['method']: entry['value']
+            for entry in ytu.get_metrics().snapshot().get('ytu_api_calls_total', [])}
+
+
+def create_sparse_file(path, size):
+    """
+    Crée un fichier creux : aucun bloc n'est écrit sur le disque.
+    """
+    with open(path, 'wb') as f:
+        f.truncate(size)
+
+
+MEDIA_CLASSES = {
+    'file': ytu.MediaFileUpload,
+    'mmap': ytu.MmapMediaUpload,
+}
+
+
+def benchmark_upload(args):
+    """
+    Uploade un fichier creux de --size-gb Gio vers le faux serveur.
+    """
+    server = FakeYouTubeServer(latency=args.latency_ms / 1000,
+                               bandwidth=int(args.bandwidth_mbps * 1024 * 1024),
+                               error_rate=args.error_rate, drop_rate=args.drop_rate,
+                               seed=args.seed).start()
+    try:
+        youtube = build_fake_service(server)
+        video_path = os.path.abspath('benchmark-video.mp4')
+        size = int(args.size_gb * 1024 * 1024 * 1024)
+        create_sparse_file(video_path, size)
+
+        chunk_controller = ytu.ChunkSizeController(
+            initial_size=args.chunk_size_mb * 1024 * 1024,
+            max_size=max(args.chunk_size_mb, args.max_chunk_size_mb) * 1024 * 1024,
+            fixed=args.fixed_chunk_size)
+        limiter = None
+        if args.max_rate_mbps:
+            limiter = ytu.UploadThrottle(ytu.BandwidthLimiter(args.max_rate_mbps * 1024 * 1024))
+        api_calls_before = api_call_counts()
+
+        with Measure() as measure:
+            result = ytu.upload_video(youtube, video_path, {'title': 'benchmark'},
+                                      limiter=limiter, chunk_controller=chunk_controller,
+                                      max_retries=args.max_retries, progress_interval=3600,
+                                      media_class=MEDIA_CLASSES[args.media])
+
+        os.remove(video_path)
+        return dict(measure.as_dict(), **{
+            'success': bool(result and result.get('success')),
+            'size_mb': round(size / 1024 / 1024, 1),
+            'media': args.media,
+            'mb_per_second': round(size / 1024 / 1024 / measure.wall, 1),
+            'cpu_seconds_per_gb': round(measure.cpu / max(size / 1024 ** 3, 1e-9), 3),
+            'final_chunk_size_mb': chunk_controller.chunk_size / 1024 / 1024,
+            'server_calls': dict(server.calls),
+            'api_calls': {method: count - api_calls_before.get(method, 0)
+                          for method, count in api_call_counts().items()},
+            'bytes_received_mb': round(server.bytes_received / 1024 / 1024, 1)
+        })
+    finally:
+        server.stop()
+
+
+def benchmark_media(args):
+    """
+    Compare MediaFileUpload et MmapMediaUpload : chaque upload tourne dans son
+    propre processus, le pic de mémoire (ru_maxrss) ne redescendant jamais.
+    """
+    forwarded = []
+    for option in ('size_gb', 'chunk_size_mb', 'max_chunk_size_mb', 'latency_ms', 'bandwidth_mbps',
+                   'error_rate', 'drop_rate', 'max_rate_mbps', 'max_retries', 'seed'):
+        forwarded += ['--' + option.replace('_', '-'), str(getattr(args, option))]
+    for flag in ('fixed_chunk_size', 'keep_backoff'):
+        if getattr(args, flag):
+            forwarded.append('--' + flag.replace('_', '-'))
+
+    results = {}
+    for media in MEDIA_CLASSES:
+        output = subprocess.run([sys.executable, SCRIPT, 'upload', '--json', '--media', media] + forwarded,
+                                check=True, capture_output=True, text=True).stdout
+        upload = json.loads(output)['upload']
+        results[media] = {key: upload[key] for key in ('success', 'wall_seconds', 'mb_per_second', 'cpu_seconds',
+                                                       'cpu_seconds_per_gb', 'max_rss_mb')}
+    return results
+
+
+def create_tree(root, entries, per_folder):
+    """
+    Crée une arborescence de type Ganymede : channel/vod/vod-video.mp4.
+
+    Returns:
+        list: Chemins des vidéos créées
+    """
+    videos = []
+    for index in range(entries):
+        folder = os.path.join(root, f'channel{index // (per_folder * 100)}', f'vod{index // per_folder}')
+        if index % per_folder == 0:
+            os.makedirs(folder, exist_ok=True)
+        path = os.path.join(folder, f'{index}-video.mp4')
+        open(path, 'w').close()
+        videos.append(path)
+
+    # Dossiers vieillis : le cache de scan ignore les dossiers modifiés il y a moins de 2 s
+    past = time.time() - 3600
+    for folder, _, _ in os.walk(root):
+        os.utime(folder, (past, past))
+    return videos
+
+
+def benchmark_scan(args):
+    """
+    Scanne une arborescence de --entries fichiers, sans puis avec le cache de scan.
+    """
+    root = os.path.abspath('videos')
+    create_tree(root, args.entries, args.per_folder)
+    results = {'entries': args.entries}
+    for label, scan_cache in (('walk', False), ('cache_cold', True), ('cache_warm', True)):
+        config = ytu.Config(videos_folder=root, scan_cache=scan_cache)
+        with Measure() as measure:
+            found = ytu.scan_for_videos(config)
+        results[label] = dict(measure.as_dict(), videos=len(found))
+    return results
+
+
+def benchmark_ledger(args):
+    """
+    Enregistre --entries uploads puis filtre et recharge le registre.
+    """
+    paths = [f'/videos/channel/vod{index}/{index}-video.mp4' for index in range(args.entries)]
+    results = {'entries': args.entries}
+
+    with Measure() as measure:
+        for index, path in enumerate(paths):
+            ytu.record_upload(path, f'id{index}')
+    results['record'] = measure.as_dict()
+
+    candidates = paths + [path + '.new' for path in paths]
+    with Measure() as measure:
+        new_videos = ytu.filter_new_videos(candidates)
+    results['filter_new'] = dict(measure.as_dict(), new=len(new_videos))
+
+    with Measure() as measure:
+        ytu.get_ledger().reload()
+    results['reload'] = measure.as_dict()
+
+    with Measure() as measure:
+        for path in paths[:1000]:
+            ytu.is_already_uploaded(path)
+    results['is_already_uploaded_x1000'] = measure.as_dict()
+    return results
+
+
+BENCHMARKS = {
+    'upload': benchmark_upload,
+    'media': benchmark_media,
+    'scan': benchmark_scan,
+    'ledger': benchmark_ledger,
+}
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description='PyYTUploader offline benchmarks')
+    parser.add_argument('benchmark', nargs='?', default='all', choices=sorted(BENCHMARKS) + ['all'])
+    parser.add_argument('--size-gb', type=float, default=2, help='Size of the sparse video file')
+    parser.add_argument('--chunk-size-mb', type=int, default=10, help='Initial chunk size')
+    parser.add_argument('--max-chunk-size-mb', type=int, default=200, help='Maximum adaptive chunk size')
+    parser.add_argument('--fixed-chunk-size', action='store_true', help='Disable adaptive chunk sizing')
+    parser.add_argument('--latency-ms', type=float, default=0, help='Latency added to every response')
+    parser.add_argument('--bandwidth-mbps', type=float, default=0, help='Server bandwidth in MB/s (0 = unlimited)')
+    parser.add_argument('--error-rate', type=float, default=0, help='Probability of a 503 per chunk')
+    parser.add_argument('--drop-rate', type=float, default=0, help='Probability of a dropped connection per chunk')
+    parser.add_argument('--media', default='file', choices=sorted(MEDIA_CLASSES),
+                        help='Media source: MediaFileUpload (file) or MmapMediaUpload (mmap)')
+    parser.add_argument('--max-rate-mbps', type=float, default=0, help='Client upload rate cap in MB/s (0 = unlimited)')
+    parser.add_argument('--max-retries', type=int, default=10, help='Consecutive retries per chunk')
+    parser.add_argument('--keep-backoff', action='store_true', help='Sleep between retries like production')
+    parser.add_argument('--seed', type=int, default=1, help='Random seed for injected failures')
+    parser.add_argument('--entries', type=int, default=10000, help='Files in the scan tree / ledger entries')
+    parser.add_argument('--per-folder', type=int, default=1, help='Videos per VOD folder in the scan tree')
+    parser.add_argument('--json', action='store_true', help='Print the results as JSON')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+    ytu.setup_logging('text', 'ERROR')
+    if not args.keep_backoff:
+        # Pas d'attente entre deux tentatives : seul le chemin d'upload est mesuré
+        ytu.RETRY_MAX_DELAY = 0
+
+    names = sorted(BENCHMARKS) if args.benchmark == 'all' else [args.benchmark]
+    results = {}
+    for name in names:
+        with tempfile.TemporaryDirectory(prefix=f'ytu-bench-{name}-') as workdir:
+            previous_dir = os.getcwd()
+            os.chdir(workdir)
+            os.makedirs('data')
+            try:
+                results[name] = BENCHMARKS[name](args)
+            finally:
+                os.chdir(previous_dir)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for name, result in results.items():
+        print(f'== {name}')
+        for key, value in result.items():
+            print(f'  {key}: {value}')
+
+
+if __name__ == '__main__':
+    main()
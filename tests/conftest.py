@@ -0,0 +1,49 @@
+"""
+Fixtures partagées : chaque test tourne dans un dossier temporaire (les
+fichiers d'état sont des chemins relatifs sous data/) avec des singletons
+remis à zéro, si bien que le vrai dossier data/ n'est jamais touché.
+"""
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+import youtube_uploader as ytu  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def workdir(tmp_path, monkeypatch):
+    """
+    Dossier de travail temporaire avec un dossier data/ vide.
+    """
+    monkeypatch.chdir(tmp_path)
+    os.makedirs('data')
+    for name in ('_upload_sessions', '_ledger', '_upload_queue', '_stability_gate', '_scan_cache'):
+        monkeypatch.setattr(ytu, name, None)
+    monkeypatch.setattr(ytu, '_accounts', {})
+    monkeypatch.setattr(ytu, '_account_routes', {})
+    monkeypatch.setattr(ytu, '_default_account_name', 'default')
+    yield tmp_path
+    for account in ytu._accounts.values():
+        account.close()
+
+
+def write_file(path, data=b'x', mtime=None):
+    """
+    Crée un fichier (et ses dossiers parents), avec un mtime donné si précisé.
+
+    Returns:
+        str: Chemin du fichier
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+    return path
@@ -0,0 +1,56 @@
+import youtube_uploader as ytu
+
+MIB = 1024 * 1024
+
+
+def test_sizes_are_rounded_and_clamped():
+    controller = ytu.ChunkSizeController(initial_size=10 * MIB + 1000, min_size=4 * MIB, max_size=64 * MIB)
+    assert controller.chunk_size == 10 * MIB
+    assert controller.chunk_size % ytu.CHUNK_SIZE_UNIT == 0
+    assert ytu.ChunkSizeController(initial_size=1, min_size=4 * MIB).chunk_size == 4 * MIB
+    assert ytu.ChunkSizeController(initial_size=1024 * MIB, max_size=64 * MIB).chunk_size == 64 * MIB
+
+
+def test_grows_at_most_twofold_towards_the_target():
+    controller = ytu.ChunkSizeController(initial_size=8 * MIB, max_size=128 * MIB, target_seconds=8)
+    # 100 Mio/s : la cible (800 Mio) est bornée au double de la taille courante
+    assert controller.record(8 * MIB, 0.08) == 16 * MIB
+    assert controller.record(16 * MIB, 0.16) == 32 * MIB
+    assert controller.record(32 * MIB, 0.32) == 64 * MIB
+    assert controller.record(64 * MIB, 0.64) == 128 * MIB
+    assert controller.record(128 * MIB, 1.28) == 128 * MIB
+
+
+def test_shrinks_at_most_by_half_on_a_slow_link():
+    controller = ytu.ChunkSizeController(initial_size=64 * MIB, target_seconds=8)
+    # 1 Mio/s : 8 Mio visés, mais la taille ne fait que diminuer de moitié
+    assert controller.record(64 * MIB, 64) == 32 * MIB
+    assert controller.throughput == MIB
+
+
+def test_throughput_is_smoothed():
+    controller = ytu.ChunkSizeController()
+    controller.record(10 * MIB, 1)
+    controller.record(20 * MIB, 1)
+    assert controller.throughput == 0.7 * 10 * MIB + 0.3 * 20 * MIB
+
+
+def test_ignores_empty_samples():
+    controller = ytu.ChunkSizeController(initial_size=8 * MIB)
+    assert controller.record(0, 1) == 8 * MIB
+    assert controller.record(MIB, 0) == 8 * MIB
+    assert controller.throughput is None
+
+
+def test_on_error_halves_down_to_the_minimum():
+    controller = ytu.ChunkSizeController(initial_size=8 * MIB, min_size=4 * MIB)
+    assert controller.on_error() == 4 * MIB
+    assert controller.on_error() == 4 * MIB
+
+
+def test_fixed_size_never_changes():
+    controller = ytu.ChunkSizeController(initial_size=256 * MIB, fixed=True)
+    assert controller.chunk_size == 256 * MIB
+    assert controller.record(MIB, 10) == 256 * MIB
+    assert controller.on_error() == 256 * MIB
+    assert controller.throughput is not None
@@ -0,0 +1,76 @@
+import json
+import os
+
+import youtube_uploader as ytu
+
+from .conftest import write_file
+
+
+def make_ledger(legacy_file='data/uploads.json'):
+    return ytu.UploadLedger(db_path='data/uploads.db', legacy_file=legacy_file)
+
+
+def test_migrates_legacy_json_once():
+    with open('data/uploads.json', 'w') as f:
+        json.dump({
+            '/videos/a.mp4': {'video_id': 'id-a', 'upload_time': '2024-01-01T00:00:00'},
+            '/videos/b.mp4': 'id-b'
+        }, f)
+
+    ledger = make_ledger()
+    assert len(ledger) == 2
+    assert ledger.get('/videos/a.mp4') == {'video_id': 'id-a', 'upload_time': '2024-01-01T00:00:00'}
+    assert ledger.get('/videos/b.mp4')['video_id'] == 'id-b'
+    assert not os.path.exists('data/uploads.json')
+    assert os.path.exists('data/uploads.json.migrated')
+
+    # Un second démarrage relit la base sans réimporter
+    assert len(make_ledger()) == 2
+
+
+def test_filter_new_keeps_order_and_skips_recorded():
+    ledger = make_ledger()
+    ledger.record('/videos/b.mp4', 'id-b')
+    assert ledger.filter_new(['/videos/c.mp4', '/videos/b.mp4', '/videos/a.mp4']) == [
+        '/videos/c.mp4', '/videos/a.mp4']
+    assert '/videos/b.mp4' in ledger
+
+
+def test_moved_file_is_matched_to_existing_upload():
+    ledger = make_ledger()
+    original = os.path.abspath(write_file('chan/a.mp4', os.urandom(300000)))
+    ledger.record(original, 'id-a')
+
+    moved = os.path.abspath('chan/renamed.mp4')
+    os.rename(original, moved)
+    assert ledger.filter_new([moved]) == []
+    assert ledger.get(moved)['video_id'] == 'id-a'
+    # Déplacement : l'ancien chemin disparaît du registre
+    assert original not in ledger
+
+
+def test_copied_file_keeps_both_paths():
+    ledger = make_ledger()
+    data = os.urandom(300000)
+    original = os.path.abspath(write_file('chan/a.mp4', data))
+    ledger.record(original, 'id-a')
+
+    copy = os.path.abspath(write_file('other/a.mp4', data))
+    assert ledger.filter_new([copy]) == []
+    assert original in ledger and copy in ledger
+
+
+def test_different_content_with_same_size_is_new():
+    ledger = make_ledger()
+    ledger.record(os.path.abspath(write_file('a.mp4', os.urandom(300000))), 'id-a')
+    other = os.path.abspath(write_file('b.mp4', os.urandom(300000)))
+    assert ledger.filter_new([other]) == [other]
+
+
+def test_content_dedup_disabled():
+    ledger = make_ledger()
+    data = os.urandom(300000)
+    ledger.record(os.path.abspath(write_file('a.mp4', data)), 'id-a')
+    ledger.content_dedup = False
+    copy = os.path.abspath(write_file('b.mp4', data))
+    assert ledger.filter_new([copy]) == [copy]
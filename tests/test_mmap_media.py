@@ -0,0 +1,86 @@
+import os
+
+import pytest
+
+import youtube_uploader as ytu
+
+from .conftest import write_file
+
+
+@pytest.fixture
+def data(monkeypatch):
+    # Blocs et zone résidente réduits pour exercer la libération des pages
+    monkeypatch.setattr(ytu, 'MEDIA_BLOCK_SIZE', 4096)
+    monkeypatch.setattr(ytu, 'MMAP_RESIDENT_SIZE', 8192)
+    return os.urandom(100000)
+
+
+def read_all(stream, n=-1):
+    blocks = []
+    while True:
+        block = stream.read(n)
+        if not len(block):
+            return b''.join(bytes(b) for b in blocks)
+        blocks.append(block)
+
+
+def test_stream_reads_the_whole_file(data):
+    media = ytu.MmapMediaUpload(write_file('a.mp4', data), mimetype='video/mp4', chunksize=32768)
+    assert media.size() == len(data)
+    assert media.mimetype() == 'video/mp4'
+    assert media.chunksize() == 32768
+    assert media.resumable() and media.has_stream()
+
+    stream = media.stream()
+    block = stream.read(10 ** 9)
+    assert isinstance(block, memoryview)
+    assert len(block) == ytu.MEDIA_BLOCK_SIZE
+    stream.seek(0)
+    assert read_all(stream) == data
+    media.close()
+
+
+def test_seek_back_after_an_error(data):
+    media = ytu.MmapMediaUpload(write_file('a.mp4', data))
+    stream = media.stream()
+    read_all(stream)
+    assert stream.tell() == len(data)
+
+    # Reprise au dernier offset confirmé par le serveur
+    stream.seek(30000)
+    assert read_all(stream) == data[30000:]
+    stream.seek(-100, os.SEEK_END)
+    assert read_all(stream) == data[-100:]
+    media.close()
+
+
+def test_getbytes(data):
+    media = ytu.MmapMediaUpload(write_file('a.mp4', data))
+    assert media.getbytes(1000, 5000) == data[1000:6000]
+    assert media.getbytes(len(data) - 10, 100) == data[-10:]
+    media.close()
+
+
+def test_empty_file():
+    media = ytu.MmapMediaUpload(write_file('a.mp4', b''))
+    assert media.size() == 0
+    assert read_all(media.stream()) == b''
+    media.close()
+
+
+def test_close_with_a_block_still_referenced(data):
+    media = ytu.MmapMediaUpload(write_file('a.mp4', data))
+    block = media.stream().read(100)
+    media.close()
+    assert bytes(block) == data[:100]
+
+
+def test_json_round_trip(data):
+    media = ytu.MmapMediaUpload(write_file('a.mp4', data), mimetype='video/mp4', chunksize=65536)
+    restored = ytu.MmapMediaUpload.from_json(media.to_json())
+    assert restored.size() == len(data)
+    assert restored.mimetype() == 'video/mp4'
+    assert restored.chunksize() == 65536
+    assert restored.getbytes(0, 100) == data[:100]
+    media.close()
+    restored.close()
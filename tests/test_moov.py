@@ -0,0 +1,50 @@
+import struct
+
+import youtube_uploader as ytu
+
+from .conftest import write_file
+
+
+def box(box_type, payload=b''):
+    return struct.pack('>I4s', 8 + len(payload), box_type) + payload
+
+
+def large_box(box_type, payload=b''):
+    return struct.pack('>I4sQ', 1, box_type, 16 + len(payload)) + payload
+
+
+def test_moov_after_mdat():
+    path = write_file('a.mp4', box(b'ftyp', b'isom') + box(b'mdat', b'\0' * 1000) + box(b'moov', b'\0' * 16))
+    assert ytu.has_moov_atom(path)
+
+
+def test_missing_moov():
+    path = write_file('a.mp4', box(b'ftyp', b'isom') + box(b'mdat', b'\0' * 1000))
+    assert not ytu.has_moov_atom(path)
+
+
+def test_truncated_moov():
+    path = write_file('a.mp4', box(b'ftyp', b'isom') + box(b'moov', b'\0' * 100)[:50])
+    assert not ytu.has_moov_atom(path)
+
+
+def test_truncated_mdat_still_being_written():
+    data = box(b'ftyp', b'isom') + box(b'mdat', b'\0' * 1000)
+    path = write_file('a.mp4', data[:-10])
+    assert not ytu.has_moov_atom(path)
+
+
+def test_64_bit_box_size():
+    path = write_file('a.mp4', box(b'ftyp', b'isom') + large_box(b'mdat', b'\0' * 1000) + box(b'moov'))
+    assert ytu.has_moov_atom(path)
+
+
+def test_box_extending_to_end_of_file():
+    path = write_file('a.mp4', box(b'ftyp', b'isom') + struct.pack('>I4s', 0, b'mdat') + b'\0' * 100)
+    assert not ytu.has_moov_atom(path)
+    path = write_file('b.mp4', box(b'ftyp', b'isom') + struct.pack('>I4s', 0, b'moov') + b'\0' * 100)
+    assert ytu.has_moov_atom(path)
+
+
+def test_missing_file():
+    assert not ytu.has_moov_atom('missing.mp4')
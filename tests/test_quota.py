@@ -0,0 +1,79 @@
+import json
+
+import pytest
+
+import youtube_uploader as ytu
+
+INSERT = 'youtube.videos.insert'
+PLAYLIST = 'youtube.playlistItems.insert'
+
+
+@pytest.fixture
+def ledger():
+    return ytu.QuotaLedger(2000, state_file='data/quota.json')
+
+
+def test_reserve_refuses_what_the_budget_cannot_cover(ledger):
+    first = ledger.reserve({INSERT: 1600})
+    assert first == {INSERT: 1600}
+    assert ledger.reserve({INSERT: 1600}) is None
+    assert ledger.status()['reserved'] == 1600
+
+
+def test_charge_consumes_the_reservation(ledger):
+    reservation = ledger.reserve({INSERT: 1600, PLAYLIST: 50})
+    ledger.charge(INSERT, reservations=[reservation])
+
+    status = ledger.status()
+    assert status['spent'] == ytu.QUOTA_COSTS[INSERT]
+    assert status['reserved'] == 50
+    assert reservation == {INSERT: 0, PLAYLIST: 50}
+
+    ledger.release(reservation)
+    assert ledger.status()['reserved'] == 0
+    assert ledger.remaining() == 2000 - ytu.QUOTA_COSTS[INSERT]
+
+
+def test_release_only_named_methods(ledger):
+    reservation = ledger.reserve({INSERT: 1600, PLAYLIST: 50})
+    ledger.release(reservation, PLAYLIST)
+    assert reservation == {INSERT: 1600}
+    assert ledger.status()['reserved'] == 1600
+
+
+def test_uncovered_charge_does_not_touch_reservations(ledger):
+    reservation = ledger.reserve({PLAYLIST: 50})
+    ledger.charge('youtube.playlists.list', reservations=[reservation])
+    assert reservation == {PLAYLIST: 50}
+    assert ledger.status()['reserved'] == 50
+
+
+def test_api_calls_are_charged_to_the_current_reservations(monkeypatch, ledger):
+    monkeypatch.setattr(ytu, 'get_quota_ledger', lambda config=None: ledger)
+    reservation = ledger.reserve({PLAYLIST: 50})
+    with ytu.use_quota_reservations([reservation]):
+        ytu._record_api_call(PLAYLIST)
+    ytu._record_api_call(PLAYLIST)
+
+    assert reservation == {PLAYLIST: 0}
+    assert ledger.status()['spent'] == 2 * ytu.QUOTA_COSTS[PLAYLIST]
+    assert ledger.status()['reserved'] == 0
+
+
+def test_state_is_persisted_for_the_day(ledger):
+    ledger.charge(INSERT)
+    ledger.mark_exhausted()
+    with open('data/quota.json') as f:
+        assert json.load(f)['spent'] == ytu.QUOTA_COSTS[INSERT]
+
+    reloaded = ytu.QuotaLedger(2000, state_file='data/quota.json')
+    assert reloaded.status()['spent'] == ytu.QUOTA_COSTS[INSERT]
+    assert reloaded.remaining() == 0
+    assert reloaded.reserve({PLAYLIST: 50}) is None
+
+
+def test_previous_day_is_ignored():
+    with open('data/quota.json', 'w') as f:
+        json.dump({'day': '2000-01-01', 'spent': 9000, 'exhausted': True}, f)
+    ledger = ytu.QuotaLedger(10000, state_file='data/quota.json')
+    assert ledger.remaining() == 10000
@@ -0,0 +1,38 @@
+import datetime
+
+import pytest
+
+import youtube_uploader as ytu
+
+
+def at(hour, minute=0):
+    return datetime.datetime(2024, 1, 1, hour, minute)
+
+
+def test_parse_rate_schedule():
+    assert ytu.parse_rate_schedule('02:00-08:00=0, 18:00-23:30=2.5') == (
+        (120, 480, 0.0), (1080, 1410, 2.5))
+    assert ytu.parse_rate_schedule('') == ()
+    assert ytu.parse_rate_schedule('22:00-24:00=1') == ((1320, 1440, 1.0),)
+
+
+@pytest.mark.parametrize('value', ['02:00-08:00', '2-8=1', '25:00-26:00=1', '08:00-24:30=1', '08:00-09:00=fast'])
+def test_parse_rate_schedule_rejects_malformed_entries(value):
+    with pytest.raises(ValueError):
+        ytu.parse_rate_schedule(value)
+
+
+def test_scheduled_rate():
+    schedule = ytu.parse_rate_schedule('02:00-08:00=0,18:00-23:00=2.5')
+    assert ytu.scheduled_rate(schedule, 5, now=at(3)) == 0
+    assert ytu.scheduled_rate(schedule, 5, now=at(18)) == 2.5
+    assert ytu.scheduled_rate(schedule, 5, now=at(23)) == 5
+    assert ytu.scheduled_rate(schedule, 5, now=at(12)) == 5
+
+
+def test_scheduled_rate_window_across_midnight():
+    schedule = ytu.parse_rate_schedule('22:00-02:00=1')
+    assert ytu.scheduled_rate(schedule, 0, now=at(23, 30)) == 1
+    assert ytu.scheduled_rate(schedule, 0, now=at(1, 59)) == 1
+    assert ytu.scheduled_rate(schedule, 0, now=at(2)) == 0
+    assert ytu.scheduled_rate(schedule, 0, now=at(21, 59)) == 0
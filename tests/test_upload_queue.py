@@ -0,0 +1,183 @@
+import json
+import os
+import time
+
+import pytest
+
+import youtube_uploader as ytu
+
+from .conftest import write_file
+
+NOW = time.time()
+
+
+def entry(path, channel='chan', size=1, created_at=0):
+    return {'path': path, 'channel': channel, 'size': size, 'created_at': created_at}
+
+
+def paths(entries):
+    return [e['path'] for e in entries]
+
+
+def video(name, channel='chan', size=1, age=3600):
+    """
+    Crée videos/<channel>/<name> dont le mtime date de age secondes.
+    """
+    return write_file(os.path.join('videos', channel, name), b'x' * size, mtime=NOW - age)
+
+
+def drain(queue, config, account=None):
+    popped = []
+    while True:
+        video_path = queue.pop(config, account)
+        if video_path is None:
+            return popped
+        popped.append(os.path.basename(video_path))
+        queue.done(video_path)
+
+
+ENTRIES = [
+    entry('a', 'one', size=3, created_at=100),
+    entry('b', 'one', size=1, created_at=300),
+    entry('c', 'two', size=2, created_at=200),
+    entry('d', 'one', size=4, created_at=400),
+]
+
+
+@pytest.mark.parametrize('policy, expected', [
+    ('fifo', ['a', 'b', 'c', 'd']),
+    ('newest', ['d', 'b', 'c', 'a']),
+    ('smallest', ['b', 'c', 'a', 'd']),
+    ('round_robin', ['d', 'c', 'b', 'a']),
+])
+def test_policies(policy, expected):
+    assert paths(ytu.order_upload_queue(ENTRIES, ytu.Config(queue_policy=policy))) == expected
+
+
+def test_deadline_policy():
+    config = ytu.Config(queue_policy='deadline', upload_deadline_hours=1)
+    entries = [
+        entry('late-old', created_at=NOW - 10 * 3600),
+        entry('due-later', created_at=NOW - 600),
+        entry('due-soon', created_at=NOW - 3000),
+        entry('late-recent', created_at=NOW - 2 * 3600),
+    ]
+    assert paths(ytu.order_upload_queue(entries, config)) == ['due-soon', 'due-later', 'late-recent', 'late-old']
+
+
+def test_unknown_policy_falls_back_to_fifo():
+    assert paths(ytu.order_upload_queue(ENTRIES, ytu.Config(queue_policy='nope'))) == ['a', 'b', 'c', 'd']
+
+
+def test_register_queue_policy(monkeypatch):
+    monkeypatch.setitem(ytu.QUEUE_POLICIES, 'largest',
+                        lambda entries, config: sorted(entries, key=lambda e: e['size'], reverse=True))
+    assert paths(ytu.order_upload_queue(ENTRIES, ytu.Config(queue_policy='largest'))) == ['d', 'a', 'c', 'b']
+
+
+def test_pop_follows_the_policy():
+    config = ytu.Config(queue_policy='smallest', stability_seconds=0)
+    queue = ytu.UploadQueue()
+    assert queue.add([video('big.mp4', size=30), video('small.mp4', size=10), video('mid.mp4', size=20)], config) == 3
+    assert queue.add([video('small.mp4', size=10)], config) == 0
+    assert queue.count() == 3
+    assert drain(queue, config) == ['small.mp4', 'mid.mp4', 'big.mp4']
+    assert queue.count() == 0
+
+
+def test_arrival_during_a_batch_jumps_ahead():
+    config = ytu.Config(queue_policy='newest')
+    queue = ytu.UploadQueue()
+    queue.add([video('old1.mp4', age=3000), video('old2.mp4', age=2000), video('old3.mp4', age=1000)], config)
+    first = queue.pop(config)
+    queue.done(first)
+
+    queue.add([video('fresh.mp4', age=10)], config)
+    assert drain(queue, config) == ['fresh.mp4', 'old2.mp4', 'old1.mp4']
+
+
+def test_requeued_video_keeps_its_place():
+    config = ytu.Config(queue_policy='fifo')
+    queue = ytu.UploadQueue()
+    queue.add([video('a.mp4'), video('b.mp4'), video('c.mp4')], config)
+    first = queue.pop(config)
+    queue.done(first, requeue=True)
+    assert drain(queue, config) == ['a.mp4', 'b.mp4', 'c.mp4']
+
+
+def test_deleted_video_is_skipped():
+    config = ytu.Config()
+    queue = ytu.UploadQueue()
+    queue.add([video('a.mp4'), video('b.mp4')], config)
+    os.remove('videos/chan/a.mp4')
+    assert drain(queue, config) == ['b.mp4']
+
+
+def test_videos_are_routed_to_their_account():
+    with open('data/accounts.json', 'w') as f:
+        json.dump({'accounts': {'main': {}, 'second': {}}, 'routes': {'other': 'second'}}, f)
+    ytu.load_accounts()
+    main, second = ytu.get_account('main'), ytu.get_account('second')
+
+    config = ytu.Config()
+    queue = ytu.UploadQueue()
+    queue.add([video('a.mp4'), video('b.mp4', channel='other'), video('c.mp4')], config)
+    assert queue.count(main) == 2 and queue.count(second) == 1
+    assert queue.count_by_account() == {main: 2, second: 1}
+
+    assert drain(queue, config, second) == ['b.mp4']
+    assert queue.count_by_account() == {main: 2}
+    assert drain(queue, config, main) == ['a.mp4', 'c.mp4']
+
+
+def test_saves_are_batched(monkeypatch):
+    config = ytu.Config()
+    queue = ytu.UploadQueue()
+    queue.add([video('a.mp4')], config)
+    with open(ytu.UPLOAD_QUEUE_FILE) as f:
+        assert paths(json.load(f)['items']) == [os.path.join('videos', 'chan', 'a.mp4')]
+
+    # Pas de réécriture avant QUEUE_SAVE_INTERVAL, sauf en fin de lot
+    queue.add([video('b.mp4')], config)
+    queue.pop(config)
+    with open(ytu.UPLOAD_QUEUE_FILE) as f:
+        assert len(json.load(f)['items']) == 1
+    queue.save(force=True)
+    with open(ytu.UPLOAD_QUEUE_FILE) as f:
+        state = json.load(f)
+    assert len(state['uploading']) == 1 and len(state['items']) == 1
+
+
+def test_restored_entries_are_checked_for_stability():
+    config = ytu.Config(stability_seconds=60)
+    queue = ytu.UploadQueue()
+    queue.add([video('interrupted.mp4'), video('growing.mp4'), video('stable.mp4')], config)
+    interrupted = queue.pop(config)
+    queue.save(force=True)
+
+    # Redémarrage : l'upload interrompu repasse en attente, en tête ; le
+    # fichier modifié depuis est laissé au prochain scan
+    restored = ytu.UploadQueue()
+    assert restored.count() == 3
+    write_file('videos/chan/growing.mp4', b'x' * 100)
+    assert restored.pop(config) == interrupted
+    restored.done(interrupted)
+    assert drain(restored, config) == ['stable.mp4']
+
+
+def test_show_upload_queue_is_read_only(capsys):
+    config = ytu.Config()
+    ytu.show_upload_queue(config)
+    assert 'empty' in capsys.readouterr().out
+
+    queue = ytu.UploadQueue()
+    queue.add([video('a.mp4'), video('b.mp4')], config)
+    queue.pop(config)
+    queue.save(force=True)
+    mtime = os.stat(ytu.UPLOAD_QUEUE_FILE).st_mtime_ns
+
+    ytu.show_upload_queue(config)
+    out = capsys.readouterr().out
+    assert '1 videos waiting, 1 uploading' in out
+    assert 'a.mp4' in out and 'b.mp4' in out
+    assert os.stat(ytu.UPLOAD_QUEUE_FILE).st_mtime_ns == mtime
@@ -0,0 +1,80 @@
+"""
+Uploads contre le faux serveur de benchmarks/fake_youtube.py.
+"""
+import json
+import os
+
+import pytest
+from googleapiclient.discovery import build_from_document
+
+import fake_youtube
+import youtube_uploader as ytu
+
+MIB = 1024 * 1024
+
+
+@pytest.fixture
+def server():
+    server = fake_youtube.FakeYouTubeServer(bandwidth=16 * MIB).start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def youtube(server):
+    document = dict(json.loads(ytu.load_discovery_document()), rootUrl=server.root_url)
+    return build_from_document(document, http=ytu.build_throttled_http(), requestBuilder=ytu.QuotaHttpRequest)
+
+
+@pytest.fixture
+def quota(monkeypatch):
+    ledger = ytu.QuotaLedger(10000, state_file='data/quota.json')
+    monkeypatch.setattr(ytu, 'get_quota_ledger', lambda config=None: ledger)
+    monkeypatch.setattr(ytu, '_retry_delay', lambda attempt: 0.01)
+    return ledger
+
+
+def sparse_video(size):
+    path = os.path.abspath('video.mp4')
+    with open(path, 'wb') as f:
+        f.truncate(size)
+    return path
+
+
+def test_resumed_upload_does_not_inflate_the_throughput(server, youtube, quota):
+    video_path = sparse_video(64 * MIB)
+    # Session ouverte par un run précédent, interrompu à 56 Mio
+    server.sessions['1'] = 56 * MIB
+    uri = f'{server.root_url}upload/youtube/v3/videos?uploadType=resumable&upload_id=1'
+    ytu.get_upload_sessions().save(video_path, uri, 56 * MIB)
+
+    controller = ytu.ChunkSizeController(initial_size=2 * MIB)
+    result = ytu.upload_video(youtube, video_path, {'title': 'resume'},
+                              chunk_controller=controller, progress_interval=3600)
+
+    assert result['success']
+    assert server.calls['videos.insert'] == 0
+    assert quota.status()['spent'] == 0
+    # Les 56 Mio déjà confirmés ne comptent pas dans le débit mesuré
+    assert controller.throughput < 2 * 16 * MIB
+    assert ytu.get_upload_sessions().get(video_path) is None
+
+
+def test_failed_session_opening_is_charged_once(monkeypatch, server, youtube, quota):
+    failures = {'left': 2}
+    do_post = fake_youtube.FakeYouTubeHandler.do_POST
+
+    def flaky_post(handler):
+        if failures['left']:
+            failures['left'] -= 1
+            handler._read_body()
+            handler._send_json(503, {'error': {'code': 503, 'message': 'Backend Error'}})
+            return
+        do_post(handler)
+
+    monkeypatch.setattr(fake_youtube.FakeYouTubeHandler, 'do_POST', flaky_post)
+    result = ytu.upload_video(youtube, sparse_video(3 * MIB), {'title': 'retry'}, progress_interval=3600)
+
+    assert result['success']
+    assert failures['left'] == 0
+    assert quota.status()['by_method'] == {'youtube.videos.insert': ytu.QUOTA_COSTS['youtube.videos.insert']}
@@ -0,0 +1,81 @@
+import datetime
+import json
+import os
+
+import youtube_uploader as ytu
+
+from .conftest import write_file
+
+URI = 'https://www.googleapis.com/upload/youtube/v3/videos?uploadType=resumable&upload_id=abc'
+
+
+def make_store():
+    return ytu.UploadSessionStore(state_file='data/upload_sessions.json')
+
+
+def test_session_is_persisted_and_reloaded():
+    path = os.path.abspath(write_file('a.mp4', b'x' * 1000))
+    store = make_store()
+    store.save(path, URI, 256)
+    store.save(path, URI, 512)
+
+    session = make_store().get(path)
+    assert session['uri'] == URI
+    assert session['offset'] == 512
+    assert ytu._upload_session_id(session['uri']) == 'abc'
+
+
+def test_new_uri_replaces_the_session():
+    path = os.path.abspath(write_file('a.mp4', b'x' * 1000))
+    store = make_store()
+    store.save(path, URI, 512)
+    store.save(path, URI + 'def', 0)
+    session = store.get(path)
+    assert (session['uri'], session['offset']) == (URI + 'def', 0)
+
+
+def test_modified_file_drops_the_session():
+    path = os.path.abspath(write_file('a.mp4', b'x' * 1000))
+    store = make_store()
+    store.save(path, URI, 512)
+    write_file(path, b'y' * 2000)
+    assert store.get(path) is None
+    assert make_store().get(path) is None
+
+
+def test_expired_sessions_are_removed_on_load():
+    path = os.path.abspath(write_file('a.mp4', b'x' * 1000))
+    store = make_store()
+    store.save(path, URI, 512)
+
+    with open('data/upload_sessions.json') as f:
+        sessions = json.load(f)
+    created_at = datetime.datetime.utcnow() - ytu.UPLOAD_SESSION_MAX_AGE - datetime.timedelta(minutes=1)
+    sessions[path]['created_at'] = created_at.isoformat()
+    with open('data/upload_sessions.json', 'w') as f:
+        json.dump(sessions, f)
+
+    store = make_store()
+    assert store.get(path) is None
+    with open('data/upload_sessions.json') as f:
+        assert json.load(f) == {}
+
+
+def test_cleanup_removes_sessions_of_deleted_files():
+    kept = os.path.abspath(write_file('a.mp4'))
+    deleted = os.path.abspath(write_file('b.mp4'))
+    store = make_store()
+    store.save(kept, URI, 0)
+    store.save(deleted, URI, 0)
+    os.remove(deleted)
+
+    assert store.cleanup() == 1
+    assert store.get(kept) is not None
+
+
+def test_remove():
+    path = os.path.abspath(write_file('a.mp4'))
+    store = make_store()
+    store.save(path, URI, 0)
+    store.remove(path)
+    assert make_store().get(path) is None
@@ -3,18 +3,35 @@ import sys
 import json
 import time
 import argparse
+import contextlib
+import contextvars
+import dataclasses
 import datetime
-import glob
+import signal
+import hashlib
+import mmap
+import logging
 import re
+import select
+import struct
+import ctypes
+import ctypes.util
+import collections
 import http.client
+import http.server
 import httplib2
 import random
+import socket
+import sqlite3
+import threading
 import requests
-import google.oauth2.credentials
-import google_auth_oauthlib.flow
-from googleapiclient.discovery import build
+import concurrent.futures
+import urllib.parse
+import google_auth_httplib2
+from googleapiclient.discovery import build_from_document
+from googleapiclient import discovery_cache
 from googleapiclient.errors import HttpError
-from googleapiclient.http import MediaFileUpload
+from googleapiclient.http import DEFAULT_HTTP_TIMEOUT_SEC, HttpRequest, MediaFileUpload, MediaUpload
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
@@ -26,7 +43,206 @@ SCOPES = ['https://www.googleapis.com/auth/youtube.upload', 'https://www.googlea
 API_SERVICE_NAME = 'youtube'
 API_VERSION = 'v3'
 TOKEN_FILE = 'data/token.json'
+# Le token d'accès est renouvelé en arrière-plan 10 minutes avant son expiration
+TOKEN_REFRESH_MARGIN = timedelta(minutes=10)
+TOKEN_REFRESH_RETRY_DELAY = 60
 UPLOADS_FILE = 'data/uploads.json'
+LEDGER_FILE = 'data/uploads.db'
+# Empreinte rapide d'un fichier : taille + hash de quelques blocs répartis dans le fichier
+FINGERPRINT_SAMPLES = 8
+FINGERPRINT_BLOCK_SIZE = 64 * 1024
+CONTENT_HASH_BLOCK_SIZE = 8 * 1024 * 1024
+CONTENT_HASH_WORKERS = 2
+DAILY_UPLOADS_FILE = 'data/daily_uploads.json'
+UPLOAD_SESSIONS_FILE = 'data/upload_sessions.json'
+SCAN_CACHE_FILE = 'data/scan_cache.json'
+PLAYLISTS_CACHE_FILE = 'data/playlists.json'
+CONFIG_FILE = 'data/config.env'
+ACCOUNTS_FILE = 'data/accounts.json'
+NOTIFICATIONS_FILE = 'data/notifications.json'
+NOTIFICATIONS_FAILED_FILE = 'data/notifications_failed.json'
+UPLOAD_QUEUE_FILE = 'data/queue.json'
+QUOTA_FILE = 'data/quota.json'
+STATUS_FILE = 'data/status.json'
+# Discord accepte au plus 10 embeds par message
+DISCORD_MAX_EMBEDS = 10
+DISCORD_TIMEOUT = (5, 15)
+DISCOVERY_CACHE_FILE = f'data/discovery_{API_SERVICE_NAME}_{API_VERSION}.json'
+DISCOVERY_URL = f'https://www.googleapis.com/discovery/v1/apis/{API_SERVICE_NAME}/{API_VERSION}/rest'
+# Une session d'upload résumable YouTube reste valide environ une semaine
+UPLOAD_SESSION_MAX_AGE = timedelta(days=6)
+# Les chunks d'un upload résumable doivent être des multiples de 256 Kio
+CHUNK_SIZE_UNIT = 256 * 1024
+DEFAULT_CHUNK_SIZE = 10 * 1024 * 1024
+
+# Erreurs temporaires pour lesquelles un chunk est renvoyé après une pause.
+# Seules les erreurs réseau sont listées : les autres OSError (fichier
+# supprimé ou illisible) échouent immédiatement
+RETRIABLE_STATUS_CODES = (429, 500, 502, 503, 504)
+RETRIABLE_EXCEPTIONS = (httplib2.HttpLib2Error, socket.timeout, ConnectionError,
+                        http.client.NotConnected, http.client.IncompleteRead,
+                        http.client.ImproperConnectionState, http.client.CannotSendRequest,
+                        http.client.CannotSendHeader, http.client.ResponseNotReady,
+                        http.client.BadStatusLine)
+RETRY_BASE_DELAY = 1
+RETRY_MAX_DELAY = 64
+# Limitation du débit : envoi découpé en tranches, rafale autorisée (en secondes de débit)
+THROTTLE_SLICE_SIZE = 64 * 1024
+THROTTLE_BURST_SECONDS = 0.25
+# Upload via mmap : taille des blocs envoyés au socket et pages gardées en mémoire
+MEDIA_BLOCK_SIZE = 1024 * 1024
+MMAP_RESIDENT_SIZE = 4 * 1024 * 1024
+# Étapes après l'upload (miniature, playlist, notification) : threads et essais
+POST_UPLOAD_WORKERS = 2
+POST_UPLOAD_MAX_ATTEMPTS = 5
+# Lecture du watcher avant chaque upload d'un lot : attente maximale en secondes
+WATCHER_POLL_TIMEOUT = 0.05
+# File d'uploads : recalcul de l'ordre d'envoi et écriture de data/queue.json (secondes)
+QUEUE_REORDER_INTERVAL = 300
+QUEUE_SAVE_INTERVAL = 30
+# Les quotas YouTube sont remis à zéro à minuit heure du Pacifique
+QUOTA_TIMEZONE = 'America/Los_Angeles'
+
+# Métriques exposées sur /metrics : nom -> (type, description)
+METRICS = {
+    'ytu_upload_bytes_total': ('counter', 'Bytes acknowledged by YouTube'),
+    'ytu_uploads_total': ('counter', 'Finished uploads by result'),
+    'ytu_upload_retries_total': ('counter', 'Retried chunks'),
+    'ytu_post_upload_steps_total': ('counter', 'Post-upload step attempts by step and result'),
+    'ytu_post_upload_pending': ('gauge', 'Post-upload jobs waiting or running'),
+    'ytu_chunk_duration_seconds': ('histogram', 'Duration of each next_chunk() call'),
+    'ytu_chunk_size_bytes': ('gauge', 'Current chunk size by worker'),
+    'ytu_upload_throughput_mb_per_second': ('histogram', 'Average throughput of each upload in MB/s'),
+    'ytu_last_upload_throughput_mb_per_second': ('gauge', 'Average throughput of the last upload in MB/s'),
+    'ytu_queue_depth': ('gauge', 'Videos waiting to be uploaded'),
+    'ytu_scan_duration_seconds': ('gauge', 'Duration of the last folder scan'),
+    'ytu_scan_videos': ('gauge', 'Videos found by the last folder scan'),
+    'ytu_api_calls_total': ('counter', 'YouTube API calls by method'),
+    'ytu_token_refreshes_total': ('counter', 'OAuth token refreshes by result'),
+    'ytu_quota_remaining_units': ('gauge', 'API quota units left for the current quota day'),
+}
+METRICS_BUCKETS = {
+    'ytu_chunk_duration_seconds': (0.25, 0.5, 1, 2, 4, 8, 16, 32, 64),
+    'ytu_upload_throughput_mb_per_second': (1, 2, 5, 10, 20, 50, 100, 200),
+}
+
+# Coût en unités de quota de chaque méthode de l'API (les lectures coûtent 1 unité)
+QUOTA_COSTS = {
+    'youtube.videos.insert': 1600,
+    'youtube.thumbnails.set': 50,
+    'youtube.playlists.insert': 50,
+    'youtube.playlistItems.insert': 50,
+    'youtube.playlists.list': 1,
+    'youtube.channels.list': 1,
+}
+QUOTA_DEFAULT_COST = 1
+DEFAULT_DAILY_QUOTA = 10000
+QUOTA_ERROR_REASONS = (b'quotaExceeded', b'dailyLimitExceeded', b'uploadLimitExceeded')
+
+# Champs de contexte ajoutés à chaque ligne de log
+LOG_CONTEXT_FIELDS = ('account', 'video', 'session', 'offset', 'elapsed_ms')
+
+logger = logging.getLogger('pyytuploader')
+_log_context = contextvars.ContextVar('ytu_log_context', default={})
+
+
+@contextlib.contextmanager
+def log_context(**fields):
+    """
+    Ajoute des champs au contexte de log le temps d'un bloc.
+
+    Le champ 'started' (time.monotonic()) sert à calculer elapsed_ms.
+
+    Args:
+        **fields: Champs du contexte (account, video, session, offset, started)
+    """
+    token = _log_context.set({**_log_context.get(), **fields})
+    try:
+        yield
+    finally:
+        _log_context.reset(token)
+
+
+def update_log_context(**fields):
+    """
+    Met à jour le contexte de log courant (ex: offset après chaque chunk).
+
+    Args:
+        **fields: Champs à modifier
+    """
+    _log_context.set({**_log_context.get(), **fields})
+
+
+class LogContextFilter(logging.Filter):
+    """
+    Copie le contexte de log courant sur chaque enregistrement.
+    """
+
+    def filter(self, record):
+        context = _log_context.get()
+        record.account = context.get('account')
+        record.video = context.get('video')
+        record.session = context.get('session')
+        record.offset = context.get('offset')
+        started = context.get('started')
+        record.elapsed_ms = int((time.monotonic() - started) * 1000) if started is not None else None
+        return True
+
+
+class JsonLogFormatter(logging.Formatter):
+    """
+    Une ligne JSON par message, avec les champs de contexte renseignés.
+    """
+
+    def format(self, record):
+        entry = {
+            'time': datetime.datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'thread': record.threadName,
+            'message': record.getMessage()
+        }
+        for field in LOG_CONTEXT_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class TextLogFormatter(logging.Formatter):
+    """
+    Format lisible : le contexte est ajouté en fin de ligne sous forme clé=valeur.
+    """
+
+    def __init__(self):
+        super().__init__('%(asctime)s %(levelname)-7s [%(threadName)s] %(message)s')
+
+    def format(self, record):
+        line = super().format(record)
+        context = [f'{field}={getattr(record, field)}' for field in LOG_CONTEXT_FIELDS
+                   if getattr(record, field, None) is not None]
+        if context:
+            line += ' (' + ' '.join(context) + ')'
+        return line
+
+
+def setup_logging(log_format='text', log_level='INFO'):
+    """
+    Configure le logger de l'application (sortie standard).
+
+    Args:
+        log_format (str): 'text' ou 'json'
+        log_level (str): Niveau minimal (DEBUG, INFO, WARNING, ERROR)
+    """
+    handler = logging.StreamHandler(sys.stdout)
+    handler.addFilter(LogContextFilter())
+    handler.setFormatter(JsonLogFormatter() if log_format == 'json' else TextLogFormatter())
+    for previous in list(logger.handlers):
+        logger.removeHandler(previous)
+    logger.addHandler(handler)
+    logger.setLevel(getattr(logging, log_level.upper(), logging.INFO))
+    logger.propagate = False
 
 
 def is_token_expired(creds):
@@ -47,120 +263,234 @@ def is_token_expired(creds):
     return creds.expiry <= buffer_time
 
 
-def save_credentials(creds):
+def save_credentials(creds, token_file=TOKEN_FILE):
     """
     Sauvegarde les credentials dans le fichier token.
     
     Args:
         creds: Credentials object
+        token_file (str): Fichier token du compte
     
     Returns:
         bool: True si la sauvegarde a réussi
     """
     try:
         # Créer le dossier data s'il n'existe pas
-        os.makedirs('data', exist_ok=True)
+        os.makedirs(os.path.dirname(token_file) or '.', exist_ok=True)
         
-        with open(TOKEN_FILE, 'w') as token:
+        # Écriture atomique : un arrêt pendant la sauvegarde ne corrompt pas token.json
+        tmp_file = token_file + '.tmp'
+        with open(tmp_file, 'w') as token:
             token.write(creds.to_json())
+            token.flush()
+            os.fsync(token.fileno())
+        os.chmod(tmp_file, 0o600)
+        os.replace(tmp_file, token_file)
         
-        print(f"Credentials saved to {TOKEN_FILE}")
+        logger.info(f"Credentials saved to {token_file}")
         return True
         
     except Exception as e:
-        print(f"Error saving credentials: {e}")
+        logger.error(f"Error saving credentials: {e}")
         return False
 
 
-def load_credentials():
+def load_credentials(token_file=TOKEN_FILE):
     """
     Charge les credentials depuis le fichier token.
     
+    Args:
+        token_file (str): Fichier token du compte
+    
     Returns:
         Credentials: Credentials object ou None si erreur
     """
-    if not os.path.exists(TOKEN_FILE):
+    if not os.path.exists(token_file):
         return None
         
     try:
-        with open(TOKEN_FILE, 'r') as token:
+        with open(token_file, 'r') as token:
             token_data = json.load(token)
             
         creds = Credentials.from_authorized_user_info(token_data, SCOPES)
-        print(f"✓ Credentials loaded from {TOKEN_FILE}")
+        logger.info(f"Credentials loaded from {token_file}")
         
         # Vérifier la présence du refresh_token
         if not creds.refresh_token:
-            print("⚠ WARNING: No refresh_token found in saved credentials!")
-            print("⚠ Le token ne pourra pas être rafraîchi automatiquement.")
+            logger.warning("No refresh_token found in saved credentials, the token cannot be refreshed automatically")
         
         # Afficher les informations sur l'expiration du token
         if creds.expiry:
             time_until_expiry = creds.expiry - datetime.datetime.utcnow()
             if time_until_expiry.total_seconds() > 0:
-                print(f"Token expires in: {time_until_expiry}")
+                logger.debug(f"Token expires in: {time_until_expiry}")
             else:
-                print("Token has expired")
+                logger.debug("Token has expired")
         
         return creds
         
     except Exception as e:
-        print(f"Error loading credentials: {e}")
+        logger.error(f"Error loading credentials: {e}")
         return None
 
 
-def refresh_credentials(creds):
+def refresh_credentials(creds, token_file=TOKEN_FILE):
     """
     Rafraîchit les credentials en utilisant le refresh_token.
     
     Args:
         creds: Credentials object
+        token_file (str): Fichier token du compte
     
     Returns:
         Credentials: Credentials rafraîchis ou None si erreur
     """
     if not creds or not hasattr(creds, 'refresh_token') or not creds.refresh_token:
-        print("="*60)
-        print("ERROR: No refresh token available!")
-        print("="*60)
-        print("Le refresh_token est nécessaire pour renouveler automatiquement l'accès.")
-        print("")
-        print("SOLUTION:")
-        print("1. Supprimez le fichier: data/token.json")
-        print("2. Relancez avec: python youtube_uploader.py --reauth")
-        print("3. Lors de l'autorisation Google, assurez-vous d'accepter tous les accès")
-        print("="*60)
+        logger.error(f"No refresh token available, the access token cannot be renewed. "
+                     f"Delete {token_file} and run 'python youtube_uploader.py --reauth', "
+                     "accepting every requested permission")
         return None
         
     try:
-        print("Refreshing access token...")
+        logger.info("Refreshing access token...")
         request = Request()
         creds.refresh(request)
+        get_metrics().inc('ytu_token_refreshes_total', result='success')
         
         # Sauvegarder les nouveaux credentials
-        if save_credentials(creds):
-            print("✓ Token refreshed successfully!")
+        if save_credentials(creds, token_file):
+            logger.info("Token refreshed successfully!")
             if creds.expiry:
                 time_until_expiry = creds.expiry - datetime.datetime.utcnow()
-                print(f"✓ New token expires in: {time_until_expiry}")
+                logger.debug(f"New token expires in: {time_until_expiry}")
         else:
-            print("Warning: Token refreshed but failed to save to disk")
+            logger.warning("Token refreshed but failed to save to disk")
             
         return creds
         
     except Exception as e:
-        print("="*60)
-        print(f"ERROR: Token refresh failed!")
-        print(f"Error details: {type(e).__name__}: {e}")
-        print("="*60)
-        print("SOLUTION:")
-        print("1. Vérifiez votre connexion internet")
-        print("2. Supprimez data/token.json")
-        print("3. Relancez avec: python youtube_uploader.py --reauth")
-        print("="*60)
+        get_metrics().inc('ytu_token_refreshes_total', result='failure')
+        logger.error(f"Token refresh failed: {type(e).__name__}: {e}. Check the network connection, "
+                     f"or delete {token_file} and run 'python youtube_uploader.py --reauth'")
         return None
 
 
+class TokenManager:
+    """
+    Renouvelle le token d'accès en arrière-plan avant son expiration.
+
+    Le service principal et les workers partagent le même objet credentials :
+    creds.refresh() met le token à jour sur place, si bien qu'un upload en
+    cours n'attend jamais un rafraîchissement synchrone. Tous les
+    rafraîchissements passent par le même verrou.
+    """
+
+    def __init__(self, token_file=TOKEN_FILE, margin=TOKEN_REFRESH_MARGIN):
+        """
+        Args:
+            token_file (str): Fichier token où les credentials rafraîchis sont enregistrés
+            margin (timedelta): Délai avant l'expiration auquel le token est renouvelé
+        """
+        self.token_file = token_file
+        self.margin = margin
+        self._lock = threading.RLock()
+        self._wakeup = threading.Event()
+        self._creds = None
+        self._thread = None
+        self._stopped = False
+
+    @property
+    def credentials(self):
+        return self._creds
+
+    def set_credentials(self, creds):
+        """
+        Remplace les credentials suivis et démarre le thread de rafraîchissement.
+
+        Args:
+            creds: Credentials object
+        """
+        with self._lock:
+            changed = creds is not self._creds
+            self._creds = creds
+            if not self._stopped and (self._thread is None or not self._thread.is_alive()):
+                self._thread = threading.Thread(target=self._run, name=f'token-refresh-{os.path.basename(self.token_file)}',
+                                                daemon=True)
+                self._thread.start()
+        if changed:
+            self._wakeup.set()
+
+    def stop(self):
+        """
+        Arrête le thread de rafraîchissement (compte supprimé ou remplacé) :
+        le fichier token n'est plus réécrit.
+        """
+        with self._lock:
+            self._stopped = True
+        self._wakeup.set()
+
+    def _expires_soon(self, creds):
+        return creds.expiry is None or creds.expiry - datetime.datetime.utcnow() <= self.margin
+
+    def refresh(self, creds=None, force=False):
+        """
+        Rafraîchit le token s'il expire bientôt (ou toujours si force=True).
+
+        Un thread qui attendait le verrou pendant qu'un autre rafraîchissait
+        réutilise simplement le nouveau token.
+
+        Args:
+            creds: Credentials à suivre à partir de maintenant (optionnel)
+            force (bool): Rafraîchir même si le token est encore valide
+
+        Returns:
+            Credentials: Credentials rafraîchis, ou None si erreur
+        """
+        if creds is not None:
+            self.set_credentials(creds)
+        with self._lock:
+            creds = self._creds
+            if creds is None or self._stopped:
+                return creds
+            if not force and creds.valid and not self._expires_soon(creds):
+                return creds
+            return refresh_credentials(creds, self.token_file)
+
+    def _seconds_until_refresh(self):
+        creds = self._creds
+        if creds is None or not creds.refresh_token:
+            return None
+        if creds.expiry is None:
+            return 0
+        return max(0, (creds.expiry - self.margin - datetime.datetime.utcnow()).total_seconds())
+
+    def _run(self):
+        while not self._stopped:
+            self._wakeup.clear()
+            delay = self._seconds_until_refresh()
+            if delay is None:
+                self._wakeup.wait()
+                continue
+            # Réveillé plus tôt si les credentials changent (ré-authentification)
+            if delay > 0 and self._wakeup.wait(delay):
+                continue
+            if self._stopped:
+                break
+            if self.refresh() is None:
+                logger.warning(f"Background token refresh failed, retrying in {TOKEN_REFRESH_RETRY_DELAY}s")
+                self._wakeup.wait(TOKEN_REFRESH_RETRY_DELAY)
+
+
+def get_token_manager():
+    """
+    Retourne le gestionnaire de token du compte courant.
+
+    Returns:
+        TokenManager: Gestionnaire du compte
+    """
+    return get_current_account().token_manager
+
+
 def test_api_connection(youtube):
     """
     Teste la connexion à l'API YouTube pour vérifier que les credentials sont valides.
@@ -184,17 +514,365 @@ def test_api_connection(youtube):
             channel_name = "Unknown"
             if response['items']:
                 channel_name = response['items'][0]['snippet']['title']
-            print(f"API connection test successful. Connected as: {channel_name}")
+            logger.info(f"API connection test successful. Connected as: {channel_name}")
+            get_connection_health().record_probe(True)
             return True
         else:
-            print("API connection test: No channel data returned")
+            logger.warning("API connection test: No channel data returned")
+            get_connection_health().record_probe(False)
             return False
             
     except Exception as e:
-        print(f"API connection test failed: {e}")
+        logger.error(f"API connection test failed: {e}")
+        get_connection_health().record_probe(False)
         return False
 
 
+class ConnectionHealth:
+    """
+    Suivi de l'état de la connexion à l'API YouTube.
+
+    Au lieu d'appeler channels().list avant chaque upload, on ne vérifie la
+    connexion que si un appel récent a échoué, si le dernier succès date de
+    plus de check_interval, ou si le token arrive à expiration.
+    """
+
+    def __init__(self, check_interval=timedelta(minutes=30)):
+        """
+        Args:
+            check_interval (timedelta): Délai maximum sans vérification
+        """
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._last_success = None
+        self._failed = False
+        self.probes = 0
+        self.skipped_probes = 0
+
+    def record_success(self):
+        """
+        Enregistre un appel API réussi.
+        """
+        with self._lock:
+            self._last_success = datetime.datetime.utcnow()
+            self._failed = False
+
+    def record_failure(self):
+        """
+        Enregistre un appel API en échec : la prochaine vérification sera faite.
+        """
+        with self._lock:
+            self._failed = True
+
+    def needs_probe(self, creds=None):
+        """
+        Indique si la connexion doit être vérifiée avant le prochain upload.
+
+        Args:
+            creds: Credentials object utilisé par le service (optionnel)
+
+        Returns:
+            bool: True si un appel de test est nécessaire
+        """
+        with self._lock:
+            if self._failed or self._last_success is None:
+                return True
+            if datetime.datetime.utcnow() - self._last_success >= self.check_interval:
+                return True
+        return creds is not None and is_token_expired(creds)
+
+    def record_probe(self, success):
+        """
+        Enregistre le résultat d'un appel de test de la connexion.
+
+        Args:
+            success (bool): True si l'appel de test a réussi
+        """
+        with self._lock:
+            self.probes += 1
+        if success:
+            self.record_success()
+        else:
+            self.record_failure()
+
+    def record_skipped_probe(self):
+        """
+        Compte un appel de test évité grâce à un état de connexion récent.
+        """
+        with self._lock:
+            self.skipped_probes += 1
+
+    def reset_counters(self):
+        """
+        Remet à zéro les compteurs de vérifications.
+
+        Returns:
+            tuple: (vérifications faites, vérifications évitées) avant la remise à zéro
+        """
+        with self._lock:
+            counters = (self.probes, self.skipped_probes)
+            self.probes = 0
+            self.skipped_probes = 0
+            return counters
+
+
+def get_connection_health():
+    """
+    Retourne le suivi de connexion du compte courant.
+
+    Returns:
+        ConnectionHealth: Suivi de la connexion à l'API
+    """
+    return get_current_account().health
+
+
+def ensure_api_connection(youtube, config):
+    """
+    Vérifie la connexion uniquement si nécessaire et se ré-authentifie en cas d'échec.
+
+    Args:
+        youtube: Service YouTube API
+        config (Config): Application configuration
+
+    Returns:
+        googleapiclient.discovery.Resource: Service valide, ou None si la ré-authentification a échoué
+    """
+    health = get_connection_health()
+    creds = getattr(getattr(youtube, '_http', None), 'credentials', None)
+    if not health.needs_probe(creds):
+        health.record_skipped_probe()
+        return youtube
+
+    if test_api_connection(youtube):
+        return youtube
+
+    logger.warning("API connection lost, re-authenticating...")
+    youtube = get_authenticated_service(config, interactive=False)
+    if youtube and not test_api_connection(youtube):
+        return None
+    return youtube
+
+
+class Metrics:
+    """
+    Registre des métriques du processus (compteurs, jauges et histogrammes).
+
+    Les valeurs sont indexées par nom et par étiquettes, et rendues au format
+    texte Prometheus par render().
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = {}
+        self._histograms = {}
+
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted(labels.items()))
+
+    def inc(self, name, value=1, **labels):
+        """
+        Incrémente un compteur ou une jauge.
+
+        Args:
+            name (str): Nom de la métrique (voir METRICS)
+            value (float): Incrément
+            **labels: Étiquettes de la série
+        """
+        key = self._key(name, labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + value
+
+    def set(self, name, value, **labels):
+        """
+        Fixe la valeur d'une jauge.
+
+        Args:
+            name (str): Nom de la métrique (voir METRICS)
+            value (float): Nouvelle valeur
+            **labels: Étiquettes de la série
+        """
+        with self._lock:
+            self._values[self._key(name, labels)] = value
+
+    def observe(self, name, value, **labels):
+        """
+        Ajoute une observation à un histogramme.
+
+        Args:
+            name (str): Nom de la métrique (voir METRICS_BUCKETS)
+            value (float): Valeur observée
+            **labels: Étiquettes de la série
+        """
+        key = self._key(name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = {
+                    'buckets': [0] * len(METRICS_BUCKETS[name]), 'sum': 0.0, 'count': 0}
+            for index, bound in enumerate(METRICS_BUCKETS[name]):
+                if value <= bound:
+                    histogram['buckets'][index] += 1
+            histogram['sum'] += value
+            histogram['count'] += 1
+
+    @staticmethod
+    def _format_labels(labels, extra=()):
+        labels = tuple(labels) + tuple(extra)
+        if not labels:
+            return ''
+        return '{' + ','.join(f'{name}="{value}"' for name, value in labels) + '}'
+
+    def render(self):
+        """
+        Returns:
+            str: Métriques au format texte Prometheus
+        """
+        with self._lock:
+            values = dict(self._values)
+            histograms = {key: dict(value, buckets=list(value['buckets']))
+                          for key, value in self._histograms.items()}
+
+        lines = []
+        for name, (metric_type, description) in METRICS.items():
+            lines.append(f'# HELP {name} {description}')
+            lines.append(f'# TYPE {name} {metric_type}')
+            if metric_type != 'histogram':
+                for (key_name, labels), value in sorted(values.items()):
+                    if key_name == name:
+                        lines.append(f'{name}{self._format_labels(labels)} {value}')
+                continue
+            for (key_name, labels), histogram in sorted(histograms.items()):
+                if key_name != name:
+                    continue
+                for bound, count in zip(METRICS_BUCKETS[name], histogram['buckets']):
+                    lines.append(f'{name}_bucket{self._format_labels(labels, [("le", bound)])} {count}')
+                lines.append(f'{name}_bucket{self._format_labels(labels, [("le", "+Inf")])} '
+                             f'{histogram["count"]}')
+                lines.append(f'{name}_sum{self._format_labels(labels)} {histogram["sum"]}')
+                lines.append(f'{name}_count{self._format_labels(labels)} {histogram["count"]}')
+        return '\n'.join(lines) + '\n'
+
+    def snapshot(self):
+        """
+        Returns:
+            dict: Valeurs courantes, pour data/status.json
+        """
+        with self._lock:
+            snapshot = {}
+            for (name, labels), value in sorted(self._values.items()):
+                snapshot.setdefault(name, []).append({'labels': dict(labels), 'value': value})
+            for (name, labels), histogram in sorted(self._histograms.items()):
+                snapshot.setdefault(name, []).append({
+                    'labels': dict(labels), 'count': histogram['count'], 'sum': histogram['sum']})
+            return snapshot
+
+
+_metrics = Metrics()
+
+
+def get_metrics():
+    """
+    Retourne le registre de métriques du processus.
+
+    Returns:
+        Metrics: Registre partagé
+    """
+    return _metrics
+
+
+class _MetricsHandler(http.server.BaseHTTPRequestHandler):
+    """
+    Sert /metrics (format Prometheus) et /status (JSON).
+    """
+
+    def do_GET(self):
+        if self.path == '/metrics':
+            update_quota_gauges()
+            body = get_metrics().render().encode('utf-8')
+            content_type = 'text/plain; version=0.0.4; charset=utf-8'
+        elif self.path == '/status':
+            body = json.dumps(build_status(), indent=2).encode('utf-8')
+            content_type = 'application/json'
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_metrics_server(port):
+    """
+    Démarre le serveur HTTP des métriques dans un thread d'arrière-plan.
+
+    Args:
+        port (int): Port d'écoute
+
+    Returns:
+        http.server.ThreadingHTTPServer: Serveur démarré, ou None en cas d'erreur
+    """
+    try:
+        server = http.server.ThreadingHTTPServer(('', port), _MetricsHandler)
+    except OSError as e:
+        logger.error(f"Unable to start metrics server on port {port}: {e}")
+        return None
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='metrics', daemon=True).start()
+    logger.info(f"Metrics available on http://0.0.0.0:{server.server_address[1]}/metrics")
+    return server
+
+
+def update_quota_gauges():
+    """
+    Met à jour la jauge de quota restant de chaque compte.
+
+    Returns:
+        dict: État du quota par nom de compte
+    """
+    statuses = {}
+    for account in get_accounts():
+        statuses[account.name] = account.get_quota_ledger().status()
+        get_metrics().set('ytu_quota_remaining_units', statuses[account.name]['remaining'],
+                          account=account.name)
+    return statuses
+
+
+def build_status():
+    """
+    Rassemble l'état du processus : quota, historique et métriques.
+
+    Returns:
+        dict: État sérialisable en JSON
+    """
+    quota_statuses = update_quota_gauges()
+    return {
+        'generated_at': datetime.datetime.now().isoformat(),
+        'quota': quota_statuses[get_account().name],
+        'accounts': quota_statuses,
+        'uploads_in_history': len(get_ledger()),
+        'metrics': get_metrics().snapshot()
+    }
+
+
+def write_status_file():
+    """
+    Écrit l'état du processus dans data/status.json (écriture atomique).
+    """
+    tmp_file = STATUS_FILE + '.tmp'
+    try:
+        with open(tmp_file, 'w') as f:
+            json.dump(build_status(), f, indent=2)
+        os.replace(tmp_file, STATUS_FILE)
+    except Exception as e:
+        logger.error(f"Error writing status file: {e}")
+
+
 def get_local_timestamp():
     """
     Obtient le timestamp local en tenant compte du fuseau horaire défini.
@@ -223,36 +901,6 @@ def get_local_timestamp():
     return local_time.isoformat()
 
 
-def get_channel_display_name(video_path, fallback_channel_name):
-    """
-    Récupère le display_name de la chaîne depuis les métadonnées Ganymede.
-    
-    Args:
-        video_path (str): Chemin vers le fichier vidéo
-        fallback_channel_name (str): Nom de chaîne de fallback (depuis le dossier)
-    
-    Returns:
-        str: Display name de la chaîne ou fallback
-    """
-    try:
-        # Extraire l'ID vidéo depuis le nom de fichier
-        video_id_match = re.search(r'(\d+)-video\.mp4$', os.path.basename(video_path))
-        if not video_id_match:
-            return fallback_channel_name
-        video_id = video_id_match.group(1)
-        info_file = os.path.join(os.path.dirname(video_path), f"{video_id}-info.json")
-        if os.path.exists(info_file):
-            with open(info_file, 'r', encoding='utf-8') as f:
-                info_data = json.load(f)
-            # Priorité au display_name
-            if "channel" in info_data and "display_name" in info_data["channel"]:
-                return info_data["channel"]["display_name"]
-            elif "user_name" in info_data:
-                return info_data["user_name"]
-    except Exception as e:
-        print(f"Error extracting channel display_name: {e}")
-    return fallback_channel_name
-
 def clean_youtube_title(title):
     """
     Nettoie un titre pour le rendre compatible avec l'API YouTube.
@@ -273,26 +921,281 @@ def clean_youtube_title(title):
         return "Untitled Video"
     return title.strip()
 
-def send_discord_notification(webhook_url, message):
+_discord_session = None
+_discord_session_lock = threading.Lock()
+
+
+def get_discord_session():
+    """
+    Retourne la session HTTP réutilisée pour tous les appels au webhook Discord.
+
+    Returns:
+        requests.Session: Session avec pool de connexions
+    """
+    global _discord_session
+    with _discord_session_lock:
+        if _discord_session is None:
+            _discord_session = requests.Session()
+            _discord_session.headers.update({'Content-Type': 'application/json'})
+        return _discord_session
+
+
+def _discord_retry_after(response):
+    """
+    Extrait le délai imposé par Discord après une réponse 429.
+
+    Args:
+        response (requests.Response): Réponse du webhook
+
+    Returns:
+        float: Délai en secondes
+    """
+    try:
+        return float(response.json().get('retry_after', 1))
+    except Exception:
+        return float(response.headers.get('Retry-After', 1))
+
+
+def send_discord_notification(webhook_url, message, max_attempts=3):
     """
     Envoie une notification à un webhook Discord.
     Args:
         webhook_url (str): URL du webhook Discord
         message (dict): Message à envoyer (contenu, embeds, etc.)
+        max_attempts (int): Nombre d'essais (limites de débit Discord comprises)
     Returns:
-        bool: True si l'envoi a réussi, False sinon
+        bool: True si l'envoi a réussi, False en cas d'échec temporaire, None si
+            Discord refuse définitivement le message (erreur 4xx autre que 429 :
+            webhook supprimé, URL invalide, embed mal formé...)
     """
     if not webhook_url:
         return False
-    try:
-        headers = {'Content-Type': 'application/json'}
-        response = requests.post(webhook_url, json=message, headers=headers)
-        response.raise_for_status()
-        print(f"Discord notification sent successfully")
-        return True
-    except Exception as e:
-        print(f"Error sending Discord notification: {e}")
-        return False
+    for attempt in range(1, max_attempts + 1):
+        try:
+            response = get_discord_session().post(webhook_url, json=message, timeout=DISCORD_TIMEOUT)
+            if response.status_code == 429:
+                # Limite de débit Discord : attendre le délai indiqué
+                delay = _discord_retry_after(response)
+                logger.warning(f"Discord rate limit reached, retrying in {delay:.1f}s")
+                time.sleep(delay)
+                continue
+            if 400 <= response.status_code < 500:
+                # Inutile de réessayer : Discord renverra la même erreur
+                logger.error(f"Discord rejected the notification (HTTP {response.status_code}): {response.text[:200]}")
+                return None
+            response.raise_for_status()
+            logger.debug("Discord notification sent successfully")
+            return True
+        except Exception as e:
+            logger.error(f"Error sending Discord notification: {e}")
+            if attempt < max_attempts:
+                time.sleep(_retry_delay(attempt))
+    return False
+
+
+class DiscordNotifier:
+    """
+    File d'envoi des notifications Discord, traitée par un thread d'arrière-plan.
+
+    Les uploads n'attendent jamais Discord : les embeds sont mis en file et
+    regroupés (jusqu'à 10 par message et par webhook). La file est envoyée à
+    la fin de chaque lot d'uploads, dès que 10 embeds sont en attente, ou au
+    plus tard max_delay secondes après l'ajout du plus ancien. Les
+    notifications en attente sont persistées dans data/notifications.json.
+
+    Les webhooks sont servis à tour de rôle et chacun a son propre délai
+    d'attente après un échec : un webhook en panne ne bloque pas les autres.
+    Les messages refusés définitivement par Discord sont retirés de la file et
+    conservés dans data/notifications_failed.json.
+    """
+
+    def __init__(self, state_file=NOTIFICATIONS_FILE, max_delay=300, failed_file=NOTIFICATIONS_FAILED_FILE):
+        """
+        Args:
+            state_file (str): Fichier de persistance de la file
+            max_delay (float): Délai maximum avant l'envoi d'une notification
+            failed_file (str): Fichier des notifications refusées par Discord
+        """
+        self.state_file = state_file
+        self.max_delay = max_delay
+        self.failed_file = failed_file
+        self._condition = threading.Condition()
+        self._pending = []
+        self._flush_requested = False
+        self._sending = False
+        # webhook -> (échecs consécutifs, date du prochain essai)
+        self._backoff = {}
+        self._last_webhook = None
+
+        if os.path.exists(state_file):
+            try:
+                with open(state_file, 'r') as f:
+                    self._pending = json.load(f)
+                if self._pending:
+                    logger.info(f"Restored {len(self._pending)} pending Discord notifications")
+                    self._flush_requested = True
+            except Exception as e:
+                logger.error(f"Error loading pending notifications: {e}")
+
+        self._thread = threading.Thread(target=self._run, name='discord-notifier', daemon=True)
+        self._thread.start()
+
+    def _save(self):
+        tmp_file = self.state_file + '.tmp'
+        try:
+            with open(tmp_file, 'w') as f:
+                json.dump(self._pending, f)
+            os.replace(tmp_file, self.state_file)
+        except Exception as e:
+            logger.error(f"Error saving pending notifications: {e}")
+
+    def enqueue(self, webhook_url, embed):
+        """
+        Ajoute un embed à la file d'envoi.
+
+        Args:
+            webhook_url (str): URL du webhook Discord
+            embed (dict): Embed Discord décrivant la vidéo
+        """
+        with self._condition:
+            self._pending.append({'webhook': webhook_url, 'embed': embed, 'queued_at': time.time()})
+            self._save()
+            self._condition.notify()
+
+    def flush(self, wait=False, timeout=30):
+        """
+        Demande l'envoi immédiat des notifications en attente.
+
+        Args:
+            wait (bool): Attendre que la file soit vide
+            timeout (float): Durée maximale d'attente en secondes
+
+        Returns:
+            bool: True si la file est vide (toujours True si wait=False)
+        """
+        with self._condition:
+            self._flush_requested = True
+            self._condition.notify()
+            if not wait:
+                return True
+            return self._condition.wait_for(lambda: not self._pending and not self._sending, timeout)
+
+    def _dead_letter(self, batch, reason):
+        """
+        Retire de la file les notifications refusées par Discord et les
+        conserve dans le fichier des échecs (appelé avec le verrou).
+        """
+        failed = []
+        if os.path.exists(self.failed_file):
+            try:
+                with open(self.failed_file, 'r') as f:
+                    failed = json.load(f)
+            except Exception as e:
+                logger.error(f"Error loading failed notifications: {e}")
+        failed.extend(dict(item, error=reason, failed_at=time.time()) for item in batch)
+        tmp_file = self.failed_file + '.tmp'
+        try:
+            with open(tmp_file, 'w') as f:
+                json.dump(failed, f)
+            os.replace(tmp_file, self.failed_file)
+        except Exception as e:
+            logger.error(f"Error saving failed notifications: {e}")
+        logger.error(f"Dropped {len(batch)} Discord notifications rejected by the webhook, saved to {self.failed_file}")
+
+    def _next_webhook(self):
+        """
+        Choisit le prochain webhook à servir, à tour de rôle (appelé avec le verrou).
+
+        Returns:
+            tuple: (webhook prêt ou None, délai avant le prochain envoi possible ou None)
+        """
+        now = time.time()
+        webhooks = list(dict.fromkeys(item['webhook'] for item in self._pending))
+        if self._last_webhook in webhooks:
+            # Reprendre après le dernier webhook servi
+            start = webhooks.index(self._last_webhook) + 1
+            webhooks = webhooks[start:] + webhooks[:start]
+        delay = None
+        for webhook_url in webhooks:
+            items = [item for item in self._pending if item['webhook'] == webhook_url]
+            failures, retry_at = self._backoff.get(webhook_url, (0, 0))
+            if failures:
+                due = retry_at
+            elif self._flush_requested or len(items) >= DISCORD_MAX_EMBEDS:
+                due = now
+            else:
+                due = items[0]['queued_at'] + self.max_delay
+            if due <= now:
+                return webhook_url, None
+            delay = due - now if delay is None else min(delay, due - now)
+        return None, delay
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while True:
+                    webhook_url, delay = self._next_webhook()
+                    if webhook_url is not None:
+                        break
+                    # Seuls des webhooks en attente après un échec restent : la
+                    # demande d'envoi immédiat est traitée
+                    self._flush_requested = False
+                    self._condition.wait(max(0.1, delay) if delay is not None else None)
+
+                # Jusqu'à 10 embeds du webhook choisi
+                batch = [item for item in self._pending if item['webhook'] == webhook_url][:DISCORD_MAX_EMBEDS]
+                self._last_webhook = webhook_url
+                self._sending = True
+
+            sent = send_discord_notification(webhook_url, {'embeds': [item['embed'] for item in batch]})
+
+            with self._condition:
+                self._sending = False
+                if sent is False:
+                    # Webhook indisponible : ses notifications sont conservées et
+                    # renvoyées plus tard, les autres webhooks continuent d'être servis
+                    failures = self._backoff.get(webhook_url, (0, 0))[0] + 1
+                    delay = min(RETRY_MAX_DELAY * 5, RETRY_BASE_DELAY * 2 ** min(failures, 8))
+                    self._backoff[webhook_url] = (failures, time.time() + delay)
+                else:
+                    self._backoff.pop(webhook_url, None)
+                    if sent is None:
+                        self._dead_letter(batch, 'rejected by Discord')
+                    self._pending = [item for item in self._pending if item not in batch]
+                    self._save()
+                    if not self._pending:
+                        self._flush_requested = False
+                self._condition.notify_all()
+
+
+_discord_notifier = None
+_discord_notifier_lock = threading.Lock()
+
+
+def get_discord_notifier():
+    """
+    Retourne la file de notifications Discord du processus (démarrée à la demande).
+
+    Returns:
+        DiscordNotifier: File de notifications
+    """
+    global _discord_notifier
+    with _discord_notifier_lock:
+        if _discord_notifier is None:
+            _discord_notifier = DiscordNotifier()
+        return _discord_notifier
+
+
+def flush_discord_notifications(wait=False):
+    """
+    Envoie les notifications Discord en attente, si la file a été démarrée.
+
+    Args:
+        wait (bool): Attendre la fin de l'envoi (avant l'arrêt du programme)
+    """
+    if _discord_notifier is not None:
+        if not _discord_notifier.flush(wait=wait) and wait:
+            logger.warning("Some Discord notifications could not be sent, they will be retried on next start")
 
 
 def is_running_in_docker():
@@ -317,80 +1220,591 @@ def is_running_in_docker():
     return os.environ.get('DOCKER_CONTAINER', '').lower() == 'true'
 
 
-def delete_token_file():
+def delete_token_file(token_file=TOKEN_FILE):
     """
     Deletes the token file to force re-authentication.
+
+    Args:
+        token_file (str): Token file of the account
+    """
+    if os.path.exists(token_file):
+        os.remove(token_file)
+        logger.info("Token file deleted. Re-authentication will be required.")
+
+
+_discovery_document = None
+_discovery_lock = threading.Lock()
+
+
+def load_discovery_document():
     """
-    if os.path.exists(TOKEN_FILE):
-        os.remove(TOKEN_FILE)
-        print("Token file deleted. Re-authentication will be required.")
+    Charge le document de découverte de l'API YouTube une seule fois par processus.
 
+    Ordre de recherche : cache sur disque (data/), document fourni avec
+    google-api-python-client, puis téléchargement. Le document trouvé est
+    enregistré dans data/ pour que les démarrages suivants n'aient besoin
+    d'aucun accès réseau.
 
-def get_authenticated_service(interactive=False):
+    Returns:
+        str: Document de découverte (JSON)
     """
-    Authenticates with YouTube API and returns the service object.
-    Améliore la gestion du rafraîchissement automatique des tokens.
+    global _discovery_document
+    with _discovery_lock:
+        if _discovery_document is not None:
+            return _discovery_document
+
+        document = None
+        if os.path.exists(DISCOVERY_CACHE_FILE):
+            try:
+                with open(DISCOVERY_CACHE_FILE, 'r', encoding='utf-8') as f:
+                    document = f.read()
+                json.loads(document)
+            except Exception as e:
+                logger.error(f"Error loading cached discovery document: {e}")
+                document = None
+
+        from_disk = document is not None
+        if document is None:
+            document = discovery_cache.get_static_doc(API_SERVICE_NAME, API_VERSION)
+        if document is None:
+            logger.info("Downloading YouTube API discovery document...")
+            response = requests.get(DISCOVERY_URL, timeout=30)
+            response.raise_for_status()
+            document = response.text
+
+        if not from_disk:
+            try:
+                os.makedirs(os.path.dirname(DISCOVERY_CACHE_FILE), exist_ok=True)
+                tmp_file = DISCOVERY_CACHE_FILE + '.tmp'
+                with open(tmp_file, 'w', encoding='utf-8') as f:
+                    f.write(document)
+                os.replace(tmp_file, DISCOVERY_CACHE_FILE)
+            except Exception as e:
+                logger.error(f"Error caching discovery document: {e}")
+
+        _discovery_document = document
+        return document
+
+
+def _is_quota_error(error):
+    """
+    Indique si une erreur correspond à un quota journalier épuisé.
 
     Args:
-        interactive (bool): Whether to run in interactive mode for authentication.
+        error (Exception): Erreur levée par l'API
 
     Returns:
-        googleapiclient.discovery.Resource: YouTube API service object
+        bool: True pour quotaExceeded / uploadLimitExceeded
     """
-    config = get_config()
-    client_secrets_file = config['client_secrets']
-    
-    # Charger les credentials existants
-    creds = load_credentials()
-    
-    # Vérifier la validité des credentials
-    if creds:
-        if creds.valid:
-            print("Using existing valid credentials")
-        elif creds.expired and creds.refresh_token:
-            print("Credentials expired, attempting to refresh...")
-            creds = refresh_credentials(creds)
-            
-            # Si le rafraîchissement échoue, supprimer le token
-            if not creds:
-                print("Refresh failed, deleting token file...")
-                delete_token_file()
-        elif is_token_expired(creds) and creds.refresh_token:
-            print("Credentials expiring soon, proactively refreshing...")
-            creds = refresh_credentials(creds)
-        else:
-            print("Credentials invalid and no refresh token available")
-            creds = None
-    
-    # Si aucun credential valide, faire l'authentification
-    if not creds:
-        if not os.path.exists(client_secrets_file):
-            print(f"Client secrets file not found: {client_secrets_file}")
-            return None
+    return (isinstance(error, HttpError) and error.resp.status == 403
+            and any(reason in error.content for reason in QUOTA_ERROR_REASONS))
 
+
+def _record_api_call(method_id, count=1):
+    """
+    Impute un ou plusieurs appels à l'API au quota et aux métriques.
+
+    Args:
+        method_id (str): Identifiant de la méthode (ex: youtube.videos.insert)
+        count (int): Nombre d'appels
+    """
+    get_quota_ledger().charge(method_id, count=count, reservations=_quota_reservations.get())
+    get_metrics().inc('ytu_api_calls_total', count, method=method_id)
+
+
+class QuotaHttpRequest(HttpRequest):
+    """
+    HttpRequest qui impute le coût de chaque appel au registre de quota.
+
+    Un upload résumable n'est imputé qu'une fois sa session ouverte : reprendre
+    une session existante ou réessayer une ouverture en échec ne consomme pas
+    de quota.
+    """
+
+    def execute(self, http=None, num_retries=0):
+        if not self.resumable:
+            _record_api_call(self.methodId)
         try:
-            print("Starting OAuth2 flow...")
-            flow = InstalledAppFlow.from_client_secrets_file(
-                client_secrets_file, SCOPES)
+            return super().execute(http=http, num_retries=num_retries)
+        except HttpError as e:
+            if _is_quota_error(e):
+                get_quota_ledger().mark_exhausted()
+            raise
+
+    def next_chunk(self, http=None, num_retries=0):
+        initiating = self.resumable_uri is None
+        try:
+            return super().next_chunk(http=http, num_retries=num_retries)
+        except HttpError as e:
+            if _is_quota_error(e):
+                get_quota_ledger().mark_exhausted()
+            raise
+        finally:
+            # Facturé seulement si la session a été ouverte : une ouverture en
+            # échec (5xx, réseau, quotaExceeded) est réessayée sans être comptée
+            if initiating and self.resumable_uri is not None:
+                _record_api_call(self.methodId)
 
-            if interactive:
-                # Détecter l'environnement
-                in_docker = is_running_in_docker()
-                
-                print("="*60)
-                print("Running interactive authentication...")
-                if in_docker:
-                    print("🐳 Docker environment detected - Using OOB flow")
-                print("="*60)
-                
-                # Priorité à la méthode OOB (compatible Docker)
-                use_oob = in_docker or os.environ.get('YTU_USE_OOB', '').lower() == 'true'
-                
-                if use_oob:
-                    # Méthode OOB (Out-of-Band) - Compatible Docker
-                    print("\n📋 Méthode manuelle (compatible Docker)")
-                    print("="*60)
-                    
+
+_upload_throttle = contextvars.ContextVar('ytu_upload_throttle', default=None)
+
+
+@contextlib.contextmanager
+def throttle_uploads(throttle):
+    """
+    Applique un limiteur de débit aux envois faits par le thread courant
+    pendant la durée d'un bloc (connexions créées par ThrottledHttp).
+
+    Args:
+        throttle (UploadThrottle): Limiteur, ou None pour ne rien limiter
+    """
+    token = _upload_throttle.set(throttle)
+    try:
+        yield
+    finally:
+        _upload_throttle.reset(token)
+
+
+def _throttled_send(send, data):
+    """
+    Envoie data par tranches de THROTTLE_SLICE_SIZE octets, chacune débitée
+    du limiteur actif avant d'être écrite sur le socket.
+    """
+    throttle = _upload_throttle.get()
+    if throttle is None or not isinstance(data, (bytes, bytearray, memoryview)):
+        return send(data)
+    # memoryview : découpage sans copie du chunk
+    view = memoryview(data)
+    for start in range(0, len(view), THROTTLE_SLICE_SIZE):
+        block = view[start:start + THROTTLE_SLICE_SIZE]
+        throttle.consume(len(block))
+        send(block)
+
+
+class ThrottledHTTPConnection(httplib2.HTTPConnectionWithTimeout):
+    """
+    Connexion HTTP dont les envois passent par le limiteur de débit actif.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Corps de requête lus par blocs de 1 Mio au lieu de 8 Kio
+        self.blocksize = MEDIA_BLOCK_SIZE
+
+    def send(self, data):
+        _throttled_send(super().send, data)
+
+
+class ThrottledHTTPSConnection(httplib2.HTTPSConnectionWithTimeout):
+    """
+    Connexion HTTPS dont les envois passent par le limiteur de débit actif.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.blocksize = MEDIA_BLOCK_SIZE
+
+    def send(self, data):
+        _throttled_send(super().send, data)
+
+
+class ThrottledHttp(httplib2.Http):
+    """
+    httplib2.Http qui ouvre ses connexions avec ThrottledHTTP(S)Connection.
+
+    Chaque worker a son propre transport : le débit est limité au niveau du
+    socket, pendant l'envoi d'un chunk, et non après coup.
+    """
+
+    CONNECTION_TYPES = {'http': ThrottledHTTPConnection, 'https': ThrottledHTTPSConnection}
+
+    def request(self, uri, method='GET', body=None, headers=None,
+                redirections=httplib2.DEFAULT_MAX_REDIRECTS, connection_type=None):
+        if connection_type is None:
+            connection_type = self.CONNECTION_TYPES.get(urllib.parse.urlsplit(uri).scheme)
+        return super().request(uri, method=method, body=body, headers=headers,
+                               redirections=redirections, connection_type=connection_type)
+
+
+def build_throttled_http():
+    """
+    Équivalent de googleapiclient.http.build_http() avec un transport ThrottledHttp.
+
+    Returns:
+        ThrottledHttp: Transport HTTP
+    """
+    http = ThrottledHttp(timeout=socket.getdefaulttimeout() or DEFAULT_HTTP_TIMEOUT_SEC)
+    # Les 308 servent aux uploads résumables, pas à des redirections
+    http.redirect_codes = http.redirect_codes - {308}
+    return http
+
+
+def build_youtube_service(creds=None, http=None):
+    """
+    Construit un service YouTube à partir du document de découverte en cache.
+
+    Args:
+        creds: Credentials object (ignoré si http est fourni)
+        http: Transport httplib2 déjà autorisé (optionnel)
+
+    Returns:
+        googleapiclient.discovery.Resource: YouTube API service object
+    """
+    if http is None:
+        http = google_auth_httplib2.AuthorizedHttp(creds, http=build_throttled_http())
+    return build_from_document(load_discovery_document(), http=http,
+                               requestBuilder=QuotaHttpRequest)
+
+
+def _account_state_file(state_file, account_name):
+    """
+    Fichier d'état propre à un compte : data/quota.json -> data/quota_<compte>.json.
+    """
+    base, extension = os.path.splitext(state_file)
+    return f'{base}_{account_name}{extension}'
+
+
+class Account:
+    """
+    Compte Google vers lequel une ou plusieurs chaînes sont routées.
+
+    Chaque compte a ses propres credentials (et leur rafraîchissement), son
+    service YouTube, son budget de quota, son cache de playlists et son
+    nombre de workers. Le compte par défaut garde les fichiers historiques
+    (data/token.json, data/quota.json, data/playlists.json).
+    """
+
+    def __init__(self, name, token_file=TOKEN_FILE, is_default=True):
+        """
+        Args:
+            name (str): Nom du compte dans data/accounts.json
+            token_file (str): Fichier token du compte
+            is_default (bool): Compte par défaut (fichiers d'état historiques)
+        """
+        self.name = name
+        self.token_file = token_file
+        self.client_secrets = None
+        self.daily_quota = None
+        self.max_parallel = None
+        self.quota_file = QUOTA_FILE if is_default else _account_state_file(QUOTA_FILE, name)
+        self.playlists_file = (PLAYLISTS_CACHE_FILE if is_default
+                               else _account_state_file(PLAYLISTS_CACHE_FILE, name))
+        self.token_manager = TokenManager(token_file)
+        self.health = ConnectionHealth()
+        self.service = None
+        self.pending_playlist_additions = {}
+        self._quota_ledger = None
+        self._playlist_cache = None
+        self._upload_executor = None
+        self._upload_workers = 0
+        self._lock = threading.Lock()
+
+    def get_quota_ledger(self, config=None):
+        """
+        Args:
+            config (Config): Application configuration (met à jour le budget si fourni)
+
+        Returns:
+            QuotaLedger: Registre de quota du compte
+        """
+        with self._lock:
+            daily_quota = self.daily_quota or (config.daily_quota if config else DEFAULT_DAILY_QUOTA)
+            if self._quota_ledger is None:
+                self._quota_ledger = QuotaLedger(daily_quota, state_file=self.quota_file)
+            elif config is not None or self.daily_quota:
+                self._quota_ledger.daily_quota = daily_quota
+            return self._quota_ledger
+
+    def get_playlist_cache(self, config=None):
+        """
+        Args:
+            config (Config, optional): Application configuration (TTL du cache)
+
+        Returns:
+            PlaylistCache: Cache des playlists du compte
+        """
+        with self._lock:
+            if self._playlist_cache is None:
+                self._playlist_cache = PlaylistCache(cache_file=self.playlists_file)
+            if config:
+                self._playlist_cache.ttl = timedelta(hours=config.playlist_cache_ttl)
+            return self._playlist_cache
+
+    def parallel_uploads(self, config):
+        """
+        Returns:
+            int: Nombre d'uploads simultanés autorisés pour ce compte
+        """
+        return self.max_parallel or config.max_parallel_uploads
+
+    def get_upload_executor(self, config):
+        """
+        Retourne le pool d'upload du compte, gardé d'un lot à l'autre : ses
+        threads conservent leur service YouTube et leurs connexions (voir
+        get_worker_service()). Il est recréé si le nombre de workers change.
+
+        Args:
+            config (Config): Application configuration
+
+        Returns:
+            concurrent.futures.ThreadPoolExecutor: Pool d'upload
+        """
+        workers = self.parallel_uploads(config)
+        with self._lock:
+            if self._upload_executor is None or self._upload_workers != workers:
+                if self._upload_executor is not None:
+                    self._upload_executor.shutdown(wait=False)
+                self._upload_executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=workers, thread_name_prefix=f'upload-{self.name}')
+                self._upload_workers = workers
+            return self._upload_executor
+
+    def close(self):
+        """
+        Arrête le rafraîchissement du token et le pool d'upload (compte retiré ou remplacé).
+        """
+        self.token_manager.stop()
+        with self._lock:
+            if self._upload_executor is not None:
+                self._upload_executor.shutdown(wait=False)
+                self._upload_executor = None
+
+
+_accounts = {}
+_account_routes = {}
+_default_account_name = 'default'
+_accounts_lock = threading.Lock()
+_current_account = contextvars.ContextVar('ytu_account', default=None)
+
+
+def load_accounts(accounts_file=ACCOUNTS_FILE):
+    """
+    Charge (ou recharge) la définition des comptes et des routes.
+
+    Format de data/accounts.json :
+        {
+            "accounts": {"main": {"token_file": "data/token.json", "daily_quota": 10000},
+                         "second": {"token_file": "data/token_second.json",
+                                    "client_secrets": "data/client_secrets_second.json",
+                                    "max_parallel": 2}},
+            "routes": {"SomeChannel": "second"},
+            "default": "main"
+        }
+
+    Sans ce fichier, un seul compte "default" utilise data/token.json. Les
+    comptes déjà chargés sont conservés (credentials, service) tant que leur
+    fichier token ne change pas.
+
+    Args:
+        accounts_file (str): Chemin du fichier des comptes
+    """
+    global _account_routes, _default_account_name
+    definitions, routes, default_name = {'default': {}}, {}, 'default'
+    if os.path.exists(accounts_file):
+        try:
+            with open(accounts_file, 'r') as f:
+                data = json.load(f)
+            definitions = data.get('accounts') or definitions
+            routes = data.get('routes', {})
+            default_name = data.get('default') or next(iter(definitions))
+            if default_name not in definitions:
+                raise ValueError(f"default account '{default_name}' is not defined")
+        except Exception as e:
+            logger.error(f"Error loading {accounts_file}, keeping the current accounts: {e}")
+            if _accounts:
+                return
+            definitions, routes, default_name = {'default': {}}, {}, 'default'
+
+    with _accounts_lock:
+        for name, definition in definitions.items():
+            is_default = name == default_name
+            token_file = definition.get('token_file') or (
+                TOKEN_FILE if is_default else _account_state_file(TOKEN_FILE, name))
+            account = _accounts.get(name)
+            if account is None or account.token_file != token_file:
+                if account is not None:
+                    account.close()
+                account = Account(name, token_file, is_default=is_default)
+                _accounts[name] = account
+            account.client_secrets = definition.get('client_secrets')
+            account.daily_quota = definition.get('daily_quota')
+            account.max_parallel = definition.get('max_parallel')
+        for name in set(_accounts) - set(definitions):
+            _accounts.pop(name).close()
+
+        _account_routes = {}
+        for channel_name, account_name in routes.items():
+            if account_name not in _accounts:
+                logger.warning(f"Route for '{channel_name}' points to unknown account '{account_name}', ignored")
+                continue
+            _account_routes[channel_name.casefold()] = account_name
+        _default_account_name = default_name
+
+
+def get_account(name=None):
+    """
+    Retourne un compte par son nom (le compte par défaut si name est None).
+
+    Args:
+        name (str, optional): Nom du compte
+
+    Returns:
+        Account: Compte, ou None si le nom est inconnu
+    """
+    if not _accounts:
+        load_accounts()
+    with _accounts_lock:
+        return _accounts.get(name or _default_account_name)
+
+
+def get_accounts():
+    """
+    Returns:
+        list: Tous les comptes configurés, le compte par défaut en premier
+    """
+    default_account = get_account()
+    with _accounts_lock:
+        return [default_account] + [account for account in _accounts.values() if account is not default_account]
+
+
+def get_current_account():
+    """
+    Retourne le compte utilisé par le thread courant (voir use_account()).
+
+    Returns:
+        Account: Compte courant, ou le compte par défaut
+    """
+    account = _current_account.get()
+    return account if account is not None else get_account()
+
+
+@contextlib.contextmanager
+def use_account(account):
+    """
+    Fait de account le compte courant le temps d'un bloc : service, quota,
+    cache de playlists et credentials sont alors ceux de ce compte.
+
+    Args:
+        account (Account): Compte à utiliser
+    """
+    token = _current_account.set(account)
+    try:
+        yield account
+    finally:
+        _current_account.reset(token)
+
+
+def route_video(video_path):
+    """
+    Retourne le compte vers lequel une vidéo est routée, d'après sa chaîne.
+
+    Args:
+        video_path (str): Chemin vers le fichier vidéo
+
+    Returns:
+        Account: Compte de la chaîne, ou le compte par défaut
+    """
+    channel_name = extract_channel_name(video_path)
+    if channel_name:
+        account_name = _account_routes.get(channel_name.casefold())
+        if account_name:
+            account = get_account(account_name)
+            if account:
+                return account
+    return get_account()
+
+
+def get_youtube_service(creds):
+    """
+    Retourne le service YouTube du compte courant, construit une seule fois.
+
+    Lors d'un rafraîchissement ou d'une ré-authentification, seuls les
+    credentials du transport sont remplacés : le service n'est pas reconstruit.
+
+    Args:
+        creds: Credentials object
+
+    Returns:
+        googleapiclient.discovery.Resource: YouTube API service object
+    """
+    account = get_current_account()
+    with account._lock:
+        if account.service is None:
+            account.service = build_youtube_service(creds)
+        elif account.service._http.credentials is not creds:
+            account.service._http.credentials = creds
+        return account.service
+
+
+def get_authenticated_service(config, interactive=False):
+    """
+    Authenticates with YouTube API and returns the service object.
+    Améliore la gestion du rafraîchissement automatique des tokens.
+
+    Args:
+        config (Config): Application configuration
+        interactive (bool): Whether to run in interactive mode for authentication.
+
+    Returns:
+        googleapiclient.discovery.Resource: YouTube API service object
+    """
+    account = get_current_account()
+    client_secrets_file = account.client_secrets or config.client_secrets
+    
+    # Réutiliser les credentials suivis par le TokenManager, sinon les charger
+    token_manager = account.token_manager
+    creds = token_manager.credentials if os.path.exists(account.token_file) else None
+    if creds is None:
+        creds = load_credentials(account.token_file)
+    
+    # Vérifier la validité des credentials
+    if creds:
+        if creds.valid:
+            logger.debug("Using existing valid credentials")
+        elif creds.expired and creds.refresh_token:
+            logger.info("Credentials expired, attempting to refresh...")
+            creds = token_manager.refresh(creds)
+            
+            # Si le rafraîchissement échoue, supprimer le token
+            if not creds:
+                logger.warning("Refresh failed, deleting token file...")
+                delete_token_file(account.token_file)
+        elif is_token_expired(creds) and creds.refresh_token:
+            logger.info("Credentials expiring soon, proactively refreshing...")
+            creds = token_manager.refresh(creds)
+        else:
+            logger.info("Credentials invalid and no refresh token available")
+            creds = None
+    
+    # Si aucun credential valide, faire l'authentification
+    if not creds:
+        if not os.path.exists(client_secrets_file):
+            logger.error(f"Client secrets file not found: {client_secrets_file}")
+            return None
+
+        try:
+            flow = InstalledAppFlow.from_client_secrets_file(
+                client_secrets_file, SCOPES)
+
+            if interactive:
+                logger.info("Starting OAuth2 flow...")
+                # Détecter l'environnement
+                in_docker = is_running_in_docker()
+                
+                print("="*60)
+                print("Running interactive authentication...")
+                if in_docker:
+                    print("🐳 Docker environment detected - Using OOB flow")
+                print("="*60)
+                
+                # Priorité à la méthode OOB (compatible Docker)
+                use_oob = in_docker or os.environ.get('YTU_USE_OOB', '').lower() == 'true'
+                
+                if use_oob:
+                    # Méthode OOB (Out-of-Band) - Compatible Docker
+                    print("\n📋 Méthode manuelle (compatible Docker)")
+                    print("="*60)
+                    
                     flow.redirect_uri = 'urn:ietf:wg:oauth:2.0:oob'
                     auth_url, _ = flow.authorization_url(
                         prompt='consent',
@@ -422,8 +1836,7 @@ def get_authenticated_service(interactive=False):
                             open_browser=True
                         )
                     except Exception as e:
-                        print(f"\n⚠ Erreur avec le serveur local: {e}")
-                        print("\nRetour à la méthode manuelle...\n")
+                        logger.warning(f"Local server authentication failed ({e}), falling back to the manual method")
                         
                         # Fallback sur OOB
                         flow.redirect_uri = 'urn:ietf:wg:oauth:2.0:oob'
@@ -437,65 +1850,53 @@ def get_authenticated_service(interactive=False):
                         creds = flow.credentials
                 
                 # Vérifier que le refresh_token a bien été obtenu
-                print("\n" + "="*60)
                 if creds.refresh_token:
-                    print("✓ SUCCESS: Refresh token obtained!")
-                    print("✓ L'authentification automatique est maintenant configurée.")
-                else:
-                    print("⚠ WARNING: No refresh token received!")
-                    print("⚠ Cela peut arriver si vous aviez déjà autorisé cette app.")
-                    print("\nSOLUTION:")
-                    print("1. Allez sur: https://myaccount.google.com/permissions")
-                    print("2. Révoquez l'accès pour votre application YouTube Uploader")
-                    print("3. Relancez: python youtube_uploader.py --reauth")
-                print("="*60 + "\n")
+                    logger.info("Refresh token obtained, automatic authentication is now configured")
             else:
-                print("Authentication token is invalid or expired, and the application is not running in interactive mode.")
-                print("Please run with the --reauth flag to re-authenticate.")
+                logger.error("Authentication token is invalid or expired, and the application is not running "
+                             "in interactive mode. Please run with the --reauth flag to re-authenticate.")
                 return None
         
         except Exception as e:
-            print(f"Error during authentication: {e}")
+            logger.error(f"Error during authentication: {e}")
             return None
 
         # Vérifier que le refresh_token existe avant de sauvegarder
         if not creds.refresh_token:
-            print("\n" + "="*60)
-            print("⚠ CRITICAL WARNING: No refresh_token obtained!")
-            print("="*60)
-            print("L'authentification ne sera pas persistante.")
-            print("Vous devrez vous réauthentifier à chaque fois.")
-            print("\nPour corriger:")
-            print("1. Révoquezl'accès: https://myaccount.google.com/permissions")
-            print("2. Relancez: python youtube_uploader.py --reauth")
-            print("="*60 + "\n")
+            # Arrive si l'application avait déjà été autorisée
+            logger.warning("No refresh token received: authentication will not persist. Revoke the app's access "
+                           "at https://myaccount.google.com/permissions, then run "
+                           "'python youtube_uploader.py --reauth'")
         
         # Sauvegarder les nouveaux credentials
-        if not save_credentials(creds):
-            print("Warning: Failed to save credentials")
+        if not save_credentials(creds, account.token_file):
+            logger.warning("Failed to save credentials")
         elif creds.refresh_token:
-            print("✓ Credentials saved with refresh_token")
+            logger.info("Credentials saved with refresh_token")
+
+    # Le token sera renouvelé en arrière-plan avant son expiration
+    token_manager.set_credentials(creds)
 
-    # Créer le service YouTube
+    # Créer le service YouTube (ou réutiliser celui déjà construit)
     try:
-        service = build(API_SERVICE_NAME, API_VERSION, credentials=creds)
-        print("YouTube API service created successfully")
+        service = get_youtube_service(creds)
+        logger.debug("YouTube API service ready")
         return service
         
     except Exception as e:
-        print(f"Error building YouTube service: {e}")
+        logger.error(f"Error building YouTube service: {e}")
         
         # En cas d'erreur, essayer de rafraîchir une dernière fois
         if creds and creds.refresh_token:
-            print("Attempting final token refresh...")
-            refreshed_creds = refresh_credentials(creds)
+            logger.info("Attempting final token refresh...")
+            refreshed_creds = token_manager.refresh(creds, force=True)
             if refreshed_creds:
                 try:
-                    service = build(API_SERVICE_NAME, API_VERSION, credentials=refreshed_creds)
-                    print("YouTube API service created after refresh")
+                    service = get_youtube_service(refreshed_creds)
+                    logger.info("YouTube API service created after refresh")
                     return service
                 except Exception as e2:
-                    print(f"Service creation failed after refresh: {e2}")
+                    logger.error(f"Service creation failed after refresh: {e2}")
         
         return None
 
@@ -535,153 +1936,725 @@ def extract_channel_name(video_path):
         return None
 
 
-def extract_ganymede_metadata(video_path):
+@dataclasses.dataclass(frozen=True, slots=True)
+class GanymedeRecord:
     """
-    Extracts metadata from Ganymede VOD structure.
+    Métadonnées d'une VOD Ganymede, lues une seule fois depuis ses fichiers annexes.
+    """
+    video_id: str
+    has_info: bool = False
+    title: str = None
+    created_at: str = None
+    user_name: str = None
+    channel_display_name: str = None
+    channel_login: str = None
+    game_name: str = None
+    thumbnail_path: str = None
 
-    Args:
-        video_path (str): Path to the video file
 
-    Returns:
-        dict: Metadata including title, description, and thumbnail path
+_ganymede_records = collections.OrderedDict()
+_ganymede_records_lock = threading.Lock()
+GANYMEDE_RECORDS_MAX = 4096
+
+
+def load_ganymede_record(video_path):
     """
-    # Initialize default metadata
-    metadata = {
-        "title": os.path.basename(video_path),
-        "description": "Uploaded with YTU from Ganymede archive",
-        "thumbnail_path": None
-    }
+    Retourne les métadonnées Ganymede d'une vidéo, mises en cache.
 
-    # Get directory containing the video
-    video_dir = os.path.dirname(video_path)
+    Le fichier {id}-info.json n'est relu que si son chemin, son mtime ou sa
+    taille ont changé. La présence de la miniature fait aussi partie de la
+    clé : Ganymede peut l'écrire après info.json. Le même enregistrement sert à la détection de la
+    chaîne, au choix de la playlist et à la construction de la requête d'upload.
+
+    Args:
+        video_path (str): Chemin vers le fichier vidéo
 
+    Returns:
+        GanymedeRecord: Métadonnées, ou None si le nom ne suit pas le format Ganymede
+    """
     # Extract video ID from filename (assuming format like 320223707005-video.mp4)
     video_id_match = re.search(r'(\d+)-video\.mp4$', os.path.basename(video_path))
     if not video_id_match:
-        return metadata
-
+        return None
     video_id = video_id_match.group(1)
 
-    # Look for the corresponding info.json file
+    video_dir = os.path.dirname(video_path)
     info_file = os.path.join(video_dir, f"{video_id}-info.json")
     thumbnail_file = os.path.join(video_dir, f"{video_id}-thumbnail.jpg")
 
-    # If info file exists, extract title
-    if os.path.exists(info_file):
+    has_thumbnail = os.path.exists(thumbnail_file)
+    try:
+        stat = os.stat(info_file)
+        key = (info_file, stat.st_mtime_ns, stat.st_size, has_thumbnail)
+    except OSError:
+        key = (info_file, None, None, has_thumbnail)
+
+    with _ganymede_records_lock:
+        record = _ganymede_records.get(key)
+        if record is not None:
+            _ganymede_records.move_to_end(key)
+            return record
+
+    info_data = {}
+    has_info = False
+    if key[1] is not None:
         try:
             with open(info_file, 'r', encoding='utf-8') as f:
                 info_data = json.load(f)
+            has_info = True
+        except Exception as e:
+            logger.error(f"Error reading Ganymede info file: {e}")
+
+    channel = info_data.get("channel") or {}
+    created_at = None
+    # Vérifier les différents champs possibles pour la date
+    for date_field in ("created_at", "published_at", "started_at"):
+        if date_field in info_data:
+            created_at = info_data[date_field]
+            break
 
-            # Extract title if available and clean it
-            if "title" in info_data and info_data["title"]:
-                # Nettoyer le titre en utilisant notre nouvelle fonction
-                title = clean_youtube_title(info_data["title"])
-                metadata["title"] = title
-            else:
-                # Utiliser un titre par défaut si aucun titre n'est trouvé
-                metadata["title"] = f"Stream {video_id}"
-
-            # Extraire et formater la date
-            stream_date = ""
-            # Vérifier les différents champs possibles pour la date
-            date_field = None
-            if "created_at" in info_data:
-                date_field = "created_at"
-            elif "published_at" in info_data:
-                date_field = "published_at"
-            elif "started_at" in info_data:
-                date_field = "started_at"
-
-            if date_field:
-                try:
-                    # Convertir la date ISO en objet datetime
-                    date_obj = datetime.datetime.fromisoformat(info_data[date_field].replace("Z", "+00:00"))
-                    # Formater la date en format lisible
-                    stream_date = date_obj.strftime("%d/%m/%Y %H:%M")
-                except Exception as e:
-                    print(f"Error formatting date: {e}")
-
-            # Ajouter les informations à la description
-            channel_name = None
-            if "user_name" in info_data:
-                channel_name = info_data["user_name"]
-            elif "channel" in info_data:
-                # Priorité au display_name, fallback sur name si display_name n'existe pas
-                if "display_name" in info_data["channel"]:
-                    channel_name = info_data["channel"]["display_name"]
-                elif "name" in info_data["channel"]:
-                    channel_name = info_data["channel"]["name"]
-
-            if channel_name:
-                metadata[
-                    "description"] = f"Stream: {info_data.get('title', 'Unknown')}\nChannel: {channel_name}\nDate: {stream_date}\n\nUploaded with YTU from Ganymede archive"
-            else:
-                metadata[
-                    "description"] = f"Stream: {info_data.get('title', 'Unknown')}\nDate: {stream_date}\n\nUploaded with YTU from Ganymede archive"
-
-            # Extraire le nom du jeu
-            if "category" in info_data and info_data["category"]:
-                metadata["game_name"] = info_data["category"]
-            elif "game_name" in info_data and info_data["game_name"]:
-                metadata["game_name"] = info_data["game_name"]
+    record = GanymedeRecord(
+        video_id=video_id,
+        has_info=has_info,
+        title=info_data.get("title"),
+        created_at=created_at,
+        user_name=info_data.get("user_name"),
+        channel_display_name=channel.get("display_name"),
+        channel_login=channel.get("name"),
+        game_name=info_data.get("category") or info_data.get("game_name") or None,
+        thumbnail_path=thumbnail_file if has_thumbnail else None
+    )
 
-        except Exception as e:
-            print(f"Error reading Ganymede info file: {e}")
+    with _ganymede_records_lock:
+        _ganymede_records[key] = record
+        while len(_ganymede_records) > GANYMEDE_RECORDS_MAX:
+            _ganymede_records.popitem(last=False)
+    return record
 
-    # Add thumbnail if available
-    if os.path.exists(thumbnail_file):
-        metadata["thumbnail_path"] = thumbnail_file
 
-    return metadata
+def get_channel_display_name(video_path, fallback_channel_name):
+    """
+    Récupère le display_name de la chaîne depuis les métadonnées Ganymede.
+    
+    Args:
+        video_path (str): Chemin vers le fichier vidéo
+        fallback_channel_name (str): Nom de chaîne de fallback (depuis le dossier)
+    
+    Returns:
+        str: Display name de la chaîne ou fallback
+    """
+    record = load_ganymede_record(video_path)
+    if not record:
+        return fallback_channel_name
+    # Priorité au display_name
+    return record.channel_display_name or record.user_name or fallback_channel_name
 
 
-def upload_video(youtube, video_path, options=None, is_ganymede=False):
+def extract_ganymede_metadata(video_path):
     """
-    Uploads a video to YouTube with the specified options.
+    Extracts metadata from Ganymede VOD structure.
 
     Args:
-        youtube: YouTube API service object
         video_path (str): Path to the video file
-        options (dict, optional): Upload options
-        is_ganymede (bool, optional): Whether to use Ganymede metadata
 
     Returns:
-        dict: Upload result information
+        dict: Metadata including title, description, and thumbnail path
     """
-    if not options:
-        options = {}
+    # Initialize default metadata
+    metadata = {
+        "title": os.path.basename(video_path),
+        "description": "Uploaded with YTU from Ganymede archive",
+        "thumbnail_path": None
+    }
 
-    # If Ganymede mode is enabled, extract metadata
-    if is_ganymede:
-        ganymede_metadata = extract_ganymede_metadata(video_path)
+    record = load_ganymede_record(video_path)
+    if not record:
+        return metadata
 
-        # Use Ganymede title if not explicitly provided
-        if "title" not in options:
-            options["title"] = ganymede_metadata["title"]
+    # If info file was read, use its title, date, channel and game
+    if record.has_info:
+        # Extract title if available and clean it
+        if record.title:
+            metadata["title"] = clean_youtube_title(record.title)
+        else:
+            # Utiliser un titre par défaut si aucun titre n'est trouvé
+            metadata["title"] = f"Stream {record.video_id}"
 
-        # Use Ganymede description if not explicitly provided
-        if "description" not in options:
-            options["description"] = ganymede_metadata["description"]
+        # Extraire et formater la date
+        stream_date = ""
+        if record.created_at:
+            try:
+                # Convertir la date ISO en objet datetime
+                date_obj = datetime.datetime.fromisoformat(record.created_at.replace("Z", "+00:00"))
+                # Formater la date en format lisible
+                stream_date = date_obj.strftime("%d/%m/%Y %H:%M")
+            except Exception as e:
+                logger.error(f"Error formatting date: {e}")
+
+        # Ajouter les informations à la description
+        channel_name = record.user_name or record.channel_display_name or record.channel_login
+        stream_title = record.title if record.title is not None else 'Unknown'
+        if channel_name:
+            metadata[
+                "description"] = f"Stream: {stream_title}\nChannel: {channel_name}\nDate: {stream_date}\n\nUploaded with YTU from Ganymede archive"
+        else:
+            metadata[
+                "description"] = f"Stream: {stream_title}\nDate: {stream_date}\n\nUploaded with YTU from Ganymede archive"
 
-        # Use Ganymede thumbnail if available and not explicitly provided
-        if "thumbnail_path" not in options and ganymede_metadata.get("thumbnail_path"):
-            options["thumbnail_path"] = ganymede_metadata["thumbnail_path"]
+        if record.game_name:
+            metadata["game_name"] = record.game_name
 
-        # Use game name if available
-        if "game_name" in ganymede_metadata:
-            options["game_name"] = ganymede_metadata["game_name"]
+    # Add thumbnail if available
+    if record.thumbnail_path:
+        metadata["thumbnail_path"] = record.thumbnail_path
 
-    # Vérifier et nettoyer le titre pour s'assurer qu'il est valide
-    if "title" in options:
-        options["title"] = clean_youtube_title(options["title"])
-    else:
-        # Utiliser le nom du fichier comme titre par défaut
-        default_title = os.path.splitext(os.path.basename(video_path))[0]
-        options["title"] = clean_youtube_title(default_title)
+    return metadata
 
-    # Prepare the request body
-    body = {
-        'snippet': {
+
+
+class UploadSessionStore:
+    """
+    Sessions d'upload résumables persistées dans data/upload_sessions.json.
+
+    Pour chaque vidéo, on conserve l'URI de session renvoyée par YouTube et le
+    dernier octet confirmé, afin de reprendre l'upload après un redémarrage au
+    lieu de renvoyer tout le fichier.
+    """
+
+    def __init__(self, state_file=UPLOAD_SESSIONS_FILE):
+        """
+        Charge les sessions existantes et supprime celles qui ont expiré.
+
+        Args:
+            state_file (str): Fichier de persistance des sessions
+        """
+        self.state_file = state_file
+        self._lock = threading.Lock()
+        self._sessions = {}
+
+        if os.path.exists(state_file):
+            try:
+                with open(state_file, 'r') as f:
+                    self._sessions = json.load(f)
+            except Exception as e:
+                logger.error(f"Error loading upload sessions: {e}")
+
+        self.cleanup()
+
+    def _save(self):
+        tmp_file = self.state_file + '.tmp'
+        try:
+            with open(tmp_file, 'w') as f:
+                json.dump(self._sessions, f, indent=2)
+            os.replace(tmp_file, self.state_file)
+        except Exception as e:
+            logger.error(f"Error saving upload sessions: {e}")
+
+    @staticmethod
+    def _file_identity(video_path):
+        stat = os.stat(video_path)
+        return stat.st_size, int(stat.st_mtime)
+
+    def get(self, video_path):
+        """
+        Retourne la session enregistrée pour une vidéo si elle est réutilisable.
+
+        Args:
+            video_path (str): Chemin vers le fichier vidéo
+
+        Returns:
+            dict: {'uri', 'offset', ...} ou None
+        """
+        with self._lock:
+            session = self._sessions.get(video_path)
+            if not session:
+                return None
+
+            try:
+                size, mtime = self._file_identity(video_path)
+            except OSError:
+                size, mtime = None, None
+
+            # Le fichier a changé depuis : la session ne correspond plus
+            if session.get('size') != size or session.get('mtime') != mtime or self._is_expired(session):
+                del self._sessions[video_path]
+                self._save()
+                return None
+
+            return dict(session)
+
+    def save(self, video_path, uri, offset):
+        """
+        Enregistre l'URI de session et l'offset confirmé d'un upload.
+
+        Args:
+            video_path (str): Chemin vers le fichier vidéo
+            uri (str): URI de la session résumable
+            offset (int): Nombre d'octets confirmés par YouTube
+        """
+        with self._lock:
+            session = self._sessions.get(video_path)
+            if not session or session.get('uri') != uri:
+                size, mtime = self._file_identity(video_path)
+                session = {
+                    'uri': uri,
+                    'size': size,
+                    'mtime': mtime,
+                    'created_at': datetime.datetime.utcnow().isoformat()
+                }
+                self._sessions[video_path] = session
+            elif session.get('offset') == offset:
+                return
+
+            session['offset'] = offset
+            session['updated_at'] = datetime.datetime.utcnow().isoformat()
+            self._save()
+
+    def remove(self, video_path):
+        """
+        Supprime la session d'une vidéo (upload terminé ou session invalide).
+
+        Args:
+            video_path (str): Chemin vers le fichier vidéo
+        """
+        with self._lock:
+            if self._sessions.pop(video_path, None) is not None:
+                self._save()
+
+    @staticmethod
+    def _is_expired(session):
+        try:
+            created_at = datetime.datetime.fromisoformat(session['created_at'])
+        except Exception:
+            return True
+        return datetime.datetime.utcnow() - created_at > UPLOAD_SESSION_MAX_AGE
+
+    def cleanup(self):
+        """
+        Supprime les sessions expirées ou dont le fichier n'existe plus.
+
+        Returns:
+            int: Nombre de sessions supprimées
+        """
+        with self._lock:
+            stale = [path for path, session in self._sessions.items()
+                     if self._is_expired(session) or not os.path.exists(path)]
+            for path in stale:
+                del self._sessions[path]
+            if stale:
+                self._save()
+                logger.info(f"Removed {len(stale)} expired upload sessions")
+            return len(stale)
+
+
+_upload_sessions = None
+_upload_sessions_lock = threading.Lock()
+
+
+def get_upload_sessions():
+    """
+    Retourne le stockage des sessions d'upload partagé par le processus.
+
+    Returns:
+        UploadSessionStore: Sessions d'upload résumables
+    """
+    global _upload_sessions
+    with _upload_sessions_lock:
+        if _upload_sessions is None:
+            _upload_sessions = UploadSessionStore()
+        return _upload_sessions
+
+
+def _upload_session_id(uri):
+    """
+    Extrait l'identifiant de session d'une URI d'upload résumable.
+
+    Args:
+        uri (str): URI de la session
+
+    Returns:
+        str: Paramètre upload_id, ou dernier segment de l'URI
+    """
+    parsed = urllib.parse.urlparse(uri)
+    upload_id = urllib.parse.parse_qs(parsed.query).get('upload_id')
+    if upload_id:
+        return upload_id[0]
+    return parsed.path.rsplit('/', 1)[-1]
+
+
+def _is_session_gone(error):
+    """
+    Indique si une erreur HTTP signifie que la session résumable n'existe plus.
+
+    Args:
+        error (HttpError): Erreur renvoyée par l'API
+
+    Returns:
+        bool: True si la session a expiré ou est introuvable
+    """
+    return getattr(error, 'resp', None) is not None and error.resp.status in (404, 410)
+
+
+class ChunkSizeController:
+    """
+    Ajuste la taille des chunks d'upload en fonction du débit mesuré.
+
+    Chaque appel à next_chunk() est chronométré : la taille visée est celle qui
+    occupe la liaison pendant environ target_seconds, afin d'amortir la latence
+    et le surcoût HTTP de chaque requête. La taille grandit ou diminue d'un
+    facteur 2 au plus par étape, reste entre min_size et max_size, et est
+    toujours un multiple de 256 Kio. Après une erreur, elle est divisée par deux.
+    """
+
+    def __init__(self, initial_size=DEFAULT_CHUNK_SIZE, min_size=CHUNK_SIZE_UNIT * 4,
+                 max_size=128 * 1024 * 1024, target_seconds=8.0, fixed=False):
+        """
+        Args:
+            initial_size (int): Taille initiale des chunks en octets
+            min_size (int): Taille minimale en octets
+            max_size (int): Taille maximale en octets
+            target_seconds (float): Durée visée pour l'envoi d'un chunk
+            fixed (bool): Désactive l'adaptation (taille imposée par la configuration)
+        """
+        self.min_size = self._round(min_size)
+        self.max_size = max(self.min_size, self._round(max_size))
+        self.target_seconds = target_seconds
+        self.fixed = fixed
+        self.chunk_size = self._clamp(initial_size)
+        self.throughput = None
+
+    @staticmethod
+    def _round(size):
+        return max(CHUNK_SIZE_UNIT, int(size) // CHUNK_SIZE_UNIT * CHUNK_SIZE_UNIT)
+
+    def _clamp(self, size):
+        if self.fixed:
+            return self._round(size)
+        return min(self.max_size, max(self.min_size, self._round(size)))
+
+    def record(self, nbytes, elapsed):
+        """
+        Prend en compte la durée d'envoi d'un chunk et ajuste la taille suivante.
+
+        Args:
+            nbytes (int): Octets confirmés par YouTube pour ce chunk
+            elapsed (float): Durée de l'appel à next_chunk() en secondes
+
+        Returns:
+            int: Nouvelle taille de chunk en octets
+        """
+        if nbytes <= 0 or elapsed <= 0:
+            return self.chunk_size
+
+        throughput = nbytes / elapsed
+        # Moyenne glissante pour lisser les variations ponctuelles
+        if self.throughput is None:
+            self.throughput = throughput
+        else:
+            self.throughput = 0.7 * self.throughput + 0.3 * throughput
+
+        if self.fixed:
+            return self.chunk_size
+
+        wanted = self.throughput * self.target_seconds
+        wanted = min(wanted, self.chunk_size * 2)
+        wanted = max(wanted, self.chunk_size / 2)
+        self.chunk_size = self._clamp(wanted)
+        return self.chunk_size
+
+    def on_error(self):
+        """
+        Réduit la taille des chunks après une erreur d'envoi.
+
+        Returns:
+            int: Nouvelle taille de chunk en octets
+        """
+        if not self.fixed:
+            self.chunk_size = self._clamp(self.chunk_size / 2)
+        return self.chunk_size
+
+
+_chunk_local = threading.local()
+
+
+def get_chunk_controller(config):
+    """
+    Retourne le contrôleur de taille de chunk du thread courant.
+
+    Le contrôleur est conservé d'un upload à l'autre pour un même worker : la
+    taille apprise sur la liaison (et les réductions après erreur) s'applique
+    donc aussi aux fichiers suivants.
+
+    Args:
+        config (Config): Application configuration
+
+    Returns:
+        ChunkSizeController: Contrôleur du worker courant
+    """
+    fixed_size = int(config.chunk_size_mb * 1024 * 1024)
+    max_size = int(config.max_chunk_size_mb * 1024 * 1024)
+    key = (fixed_size, max_size)
+
+    controller = getattr(_chunk_local, 'controller', None)
+    if controller is None or getattr(_chunk_local, 'key', None) != key:
+        if fixed_size > 0:
+            controller = ChunkSizeController(initial_size=fixed_size, fixed=True)
+        else:
+            controller = ChunkSizeController(max_size=max_size)
+        _chunk_local.controller = controller
+        _chunk_local.key = key
+    return controller
+
+
+def _is_retriable_error(error):
+    """
+    Indique si une erreur d'envoi de chunk est temporaire (5xx, 429, réseau).
+
+    Args:
+        error (Exception): Erreur levée par next_chunk()
+
+    Returns:
+        bool: True si le chunk peut être renvoyé
+    """
+    if isinstance(error, HttpError):
+        return getattr(error, 'resp', None) is not None and error.resp.status in RETRIABLE_STATUS_CODES
+    return isinstance(error, RETRIABLE_EXCEPTIONS)
+
+
+def _retry_delay(attempt):
+    """
+    Calcule la pause avant une nouvelle tentative (backoff exponentiel avec jitter).
+
+    Args:
+        attempt (int): Numéro de la tentative (à partir de 1)
+
+    Returns:
+        float: Durée de la pause en secondes
+    """
+    return random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt))
+
+
+class _MmapReader:
+    """
+    Flux en lecture seule sur un mmap, qui renvoie des memoryview (sans copie).
+
+    Chaque lecture est bornée à MEDIA_BLOCK_SIZE octets. Les pages déjà
+    envoyées sont rendues au noyau (MADV_DONTNEED) dès qu'elles sont à plus
+    de MMAP_RESIDENT_SIZE octets derrière la position courante : la mémoire
+    résidente reste bornée quelle que soit la taille des chunks.
+    """
+
+    def __init__(self, mapping, size):
+        self._mapping = mapping
+        self._view = memoryview(mapping) if mapping is not None else memoryview(b'')
+        self._size = size
+        self._position = 0
+        # Début de la zone encore résidente
+        self._released = 0
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        if whence == os.SEEK_CUR:
+            offset += self._position
+        elif whence == os.SEEK_END:
+            offset += self._size
+        offset = max(0, min(offset, self._size))
+        if offset < self._position:
+            # Retour en arrière (reprise après erreur) : tout ce qui a été lu est
+            # rendu au noyau, les pages nécessaires seront relues
+            self._release(self._position)
+            self._released = offset - offset % mmap.PAGESIZE
+        self._position = offset
+        return self._position
+
+    def tell(self):
+        return self._position
+
+    def seekable(self):
+        return True
+
+    def read(self, n=-1):
+        end = self._size if n is None or n < 0 else min(self._size, self._position + n)
+        end = min(end, self._position + MEDIA_BLOCK_SIZE)
+        block = self._view[self._position:end]
+        self._position = end
+        self._release_behind()
+        return block
+
+    def _release_behind(self):
+        limit = self._position - MMAP_RESIDENT_SIZE
+        self._release(limit - limit % mmap.PAGESIZE)
+
+    def _release(self, limit):
+        """
+        Rend au noyau les pages comprises entre la zone déjà libérée et limit.
+        """
+        limit = min(limit, self._size)
+        if limit <= self._released or not hasattr(mmap, 'MADV_DONTNEED'):
+            return
+        self._mapping.madvise(mmap.MADV_DONTNEED, self._released, limit - self._released)
+        self._released = limit
+
+    def close(self):
+        self._view.release()
+
+
+class MmapMediaUpload(MediaUpload):
+    """
+    Source d'upload résumable adossée à un mmap du fichier vidéo.
+
+    Contrairement à MediaFileUpload, les chunks ne sont pas recopiés dans des
+    objets bytes : http.client reçoit des memoryview du mmap, par blocs de
+    MEDIA_BLOCK_SIZE, et la mémoire résidente par worker reste bornée à
+    MMAP_RESIDENT_SIZE (voir _MmapReader).
+    """
+
+    def __init__(self, filename, mimetype='application/octet-stream', chunksize=DEFAULT_CHUNK_SIZE,
+                 resumable=True):
+        """
+        Args:
+            filename (str): Chemin du fichier
+            mimetype (str): Type MIME du fichier
+            chunksize (int): Taille des chunks en octets
+            resumable (bool): Upload résumable
+        """
+        self._filename = filename
+        self._mimetype = mimetype
+        self._chunksize = chunksize
+        self._resumable = resumable
+        with open(filename, 'rb') as f:
+            self._size = os.fstat(f.fileno()).st_size
+            # Un fichier vide ne peut pas être mappé
+            self._mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if self._size else None
+        if self._mapping is not None and hasattr(mmap, 'MADV_SEQUENTIAL'):
+            self._mapping.madvise(mmap.MADV_SEQUENTIAL)
+        self._stream = _MmapReader(self._mapping, self._size)
+
+    def chunksize(self):
+        return self._chunksize
+
+    def mimetype(self):
+        return self._mimetype
+
+    def size(self):
+        return self._size
+
+    def resumable(self):
+        return self._resumable
+
+    def getbytes(self, begin, length):
+        self._stream.seek(begin)
+        return bytes(self._stream._view[begin:begin + length])
+
+    def has_stream(self):
+        return True
+
+    def stream(self):
+        return self._stream
+
+    def close(self):
+        """
+        Libère le mmap (les memoryview encore référencées empêchent sa fermeture).
+        """
+        self._stream.close()
+        if self._mapping is not None:
+            try:
+                self._mapping.close()
+            except BufferError:
+                # Un bloc est encore référencé : le mmap sera libéré avec lui
+                pass
+            self._mapping = None
+
+    def to_json(self):
+        """
+        Returns:
+            str: Représentation JSON, le mmap est recréé par from_json()
+        """
+        return self._to_json(strip=['_stream', '_mapping'])
+
+    @staticmethod
+    def from_json(s):
+        d = json.loads(s)
+        return MmapMediaUpload(d['_filename'], mimetype=d['_mimetype'],
+                               chunksize=d['_chunksize'], resumable=d['_resumable'])
+
+
+def set_video_thumbnail(youtube, video_id, thumbnail_path):
+    """
+    Définit la miniature d'une vidéo déjà uploadée.
+
+    Args:
+        youtube: Service YouTube API
+        video_id (str): ID de la vidéo YouTube
+        thumbnail_path (str): Chemin de l'image
+
+    Raises:
+        HttpError: Erreur renvoyée par l'API
+    """
+    youtube.thumbnails().set(
+        videoId=video_id,
+        media_body=MediaFileUpload(thumbnail_path)
+    ).execute()
+    logger.info(f"Thumbnail set for video {video_id}")
+
+
+def upload_video(youtube, video_path, options=None, is_ganymede=False, limiter=None,
+                 chunk_controller=None, max_retries=10, retry_deadline=1800, progress_interval=30,
+                 set_thumbnail=True, media_class=MediaFileUpload):
+    """
+    Uploads a video to YouTube with the specified options.
+
+    Args:
+        youtube: YouTube API service object
+        video_path (str): Path to the video file
+        options (dict, optional): Upload options
+        is_ganymede (bool, optional): Whether to use Ganymede metadata
+        limiter (UploadThrottle, optional): Bandwidth caps applied while the chunks are sent
+            (needs a service built on ThrottledHttp)
+        chunk_controller (ChunkSizeController, optional): Adaptive chunk size controller
+        max_retries (int, optional): Consecutive retries allowed for a failing chunk
+        retry_deadline (float, optional): Maximum seconds spent retrying a failing chunk
+        progress_interval (float, optional): Minimum seconds between two progress log lines
+        set_thumbnail (bool, optional): Set the thumbnail right after the upload; when False,
+            the thumbnail path is returned for the post-upload stage
+        media_class (type, optional): Media source of the video, MediaFileUpload or MmapMediaUpload
+
+    Returns:
+        dict: Upload result information
+    """
+    if not options:
+        options = {}
+
+    # If Ganymede mode is enabled, extract metadata
+    if is_ganymede:
+        ganymede_metadata = extract_ganymede_metadata(video_path)
+
+        # Use Ganymede title if not explicitly provided
+        if "title" not in options:
+            options["title"] = ganymede_metadata["title"]
+
+        # Use Ganymede description if not explicitly provided
+        if "description" not in options:
+            options["description"] = ganymede_metadata["description"]
+
+        # Use Ganymede thumbnail if available and not explicitly provided
+        if "thumbnail_path" not in options and ganymede_metadata.get("thumbnail_path"):
+            options["thumbnail_path"] = ganymede_metadata["thumbnail_path"]
+
+        # Use game name if available
+        if "game_name" in ganymede_metadata:
+            options["game_name"] = ganymede_metadata["game_name"]
+
+    # Vérifier et nettoyer le titre pour s'assurer qu'il est valide
+    if "title" in options:
+        options["title"] = clean_youtube_title(options["title"])
+    else:
+        # Utiliser le nom du fichier comme titre par défaut
+        default_title = os.path.splitext(os.path.basename(video_path))[0]
+        options["title"] = clean_youtube_title(default_title)
+
+    # Prepare the request body
+    body = {
+        'snippet': {
             'title': options.get('title', 'Untitled Video'),
             'description': options.get('description', 'Uploaded with YTU'),
             'tags': options.get('tags', ['YTU']),
@@ -701,559 +2674,3607 @@ def upload_video(youtube, video_path, options=None, is_ganymede=False):
     # Vérification finale du titre avant upload
     if not body['snippet']['title'] or len(body['snippet']['title'].strip()) == 0:
         body['snippet']['title'] = f"Video {datetime.datetime.now().strftime('%Y-%m-%d %H:%M')}"
-        print(f"Warning: Empty title detected, using default title: {body['snippet']['title']}")
+        logger.warning(f"Empty title detected, using default title: {body['snippet']['title']}")
+
+    if chunk_controller is None:
+        chunk_controller = ChunkSizeController()
 
     # Prepare the media file
-    media = MediaFileUpload(video_path,
-                            chunksize=10 * 1024 * 1024,
-                            resumable=True,
-                            mimetype='video/mp4')
+    media = media_class(video_path,
+                        chunksize=chunk_controller.chunk_size,
+                        resumable=True,
+                        mimetype='video/mp4')
+
+    # Create the upload request
+    try:
+        upload_request = youtube.videos().insert(
+            part=','.join(body.keys()),
+            body=body,
+            media_body=media
+        )
+    except Exception:
+        if isinstance(media, MmapMediaUpload):
+            media.close()
+        raise
+
+    # Reprendre une session interrompue si elle existe encore
+    sessions = get_upload_sessions()
+    session = sessions.get(video_path)
+    sent_bytes = 0
+    # Vrai quand le prochain next_chunk() commence par demander l'offset à YouTube
+    probe = False
+    if session:
+        # En état d'erreur, next_chunk() demande d'abord à YouTube le dernier octet reçu
+        upload_request.resumable_uri = session['uri']
+        upload_request._in_error_state = True
+        probe = True
+        sent_bytes = session.get('offset', 0)
+        logger.info(f"Resuming upload of {video_path} from byte {sent_bytes}...")
+
+    # Execute the upload
+    video_id = None
+    response = None
+
+    logger.info(f"Uploading {video_path}...")
+
+    metrics = get_metrics()
+    worker = threading.current_thread().name
+    upload_started = time.monotonic()
+    resumed_from = sent_bytes
+
+    try:
+        last_progress = -1  # Pour suivre le dernier pourcentage affiché
+        last_progress_time = 0
+
+        logger.debug(f"Initial chunk size: {chunk_controller.chunk_size // 1024 // 1024} MiB")
+        retry_attempt = 0
+        retry_started = None
+
+        while response is None:
+            # La taille du chunk peut changer entre deux appels à next_chunk()
+            media._chunksize = chunk_controller.chunk_size
+            progress_before = upload_request.resumable_progress
+            chunk_start = time.monotonic()
+            metrics.set('ytu_chunk_size_bytes', chunk_controller.chunk_size, worker=worker)
+            try:
+                # Débit limité pendant l'envoi, tranche par tranche
+                with throttle_uploads(limiter):
+                    status, response = upload_request.next_chunk()
+            except Exception as e:
+                if _is_retriable_error(e):
+                    metrics.inc('ytu_upload_retries_total')
+                    retry_attempt += 1
+                    if retry_started is None:
+                        retry_started = time.monotonic()
+                    if (retry_attempt > max_retries
+                            or time.monotonic() - retry_started > retry_deadline):
+                        logger.error(f"Giving up on {video_path} after {retry_attempt - 1} retries")
+                        raise
+
+                    # next_chunk() est en état d'erreur : la prochaine tentative
+                    # redemande l'offset à YouTube et reprend à partir de là
+                    chunk_controller.on_error()
+                    probe = True
+                    delay = _retry_delay(retry_attempt)
+                    logger.warning(f"Retriable error while uploading {video_path}: {e}")
+                    logger.info(f"Retry {retry_attempt}/{max_retries} in {delay:.1f}s "
+                                f"from byte {upload_request.resumable_progress} "
+                                f"(chunk size {chunk_controller.chunk_size // 1024 // 1024} MiB)")
+                    time.sleep(delay)
+                    continue
+
+                if not isinstance(e, HttpError) or not session or not _is_session_gone(e):
+                    raise
+                # La session a expiré côté YouTube : repartir de zéro
+                logger.warning(f"Upload session expired for {video_path}, restarting from the beginning")
+                sessions.remove(video_path)
+                session = None
+                upload_request.resumable_uri = None
+                upload_request.resumable_progress = 0
+                upload_request._in_error_state = False
+                probe = False
+                sent_bytes = 0
+                resumed_from = 0
+                continue
+
+            chunk_elapsed = time.monotonic() - chunk_start
+            metrics.observe('ytu_chunk_duration_seconds', chunk_elapsed)
+            retry_attempt = 0
+            retry_started = None
+
+            if response is None and upload_request.resumable_uri:
+                sessions.save(video_path, upload_request.resumable_uri,
+                              upload_request.resumable_progress)
+
+                # Ajuster la taille du prochain chunk selon le débit mesuré. Après une
+                # reprise ou une erreur, l'avancée inclut les octets acquittés lors
+                # d'appels précédents : cet appel n'est pas mesuré
+                previous_size = chunk_controller.chunk_size
+                if not probe:
+                    new_size = chunk_controller.record(upload_request.resumable_progress - progress_before,
+                                                       chunk_elapsed)
+                    if new_size != previous_size:
+                        logger.debug(f"Chunk size adjusted: {previous_size // 1024 // 1024} MiB -> "
+                                     f"{new_size // 1024 // 1024} MiB "
+                                     f"({chunk_controller.throughput / 1024 / 1024:.1f} MB/s)")
+            probe = False
+
+            # Octets acquittés par YouTube depuis le chunk précédent
+            acknowledged = upload_request.resumable_progress
+            if response is not None:
+                acknowledged = media.size()
+            metrics.inc('ytu_upload_bytes_total', max(0, acknowledged - sent_bytes))
+            sent_bytes = acknowledged
+            if upload_request.resumable_uri:
+                update_log_context(session=_upload_session_id(upload_request.resumable_uri),
+                                   offset=acknowledged)
+
+            if status:
+                progress = int(status.progress() * 100)
+                # Au moins 5% de plus et progress_interval secondes depuis la dernière ligne
+                now = time.monotonic()
+                if progress >= last_progress + 5 and now - last_progress_time >= progress_interval:
+                    logger.info(f"Upload progress: {progress}%")
+                    last_progress = progress
+                    last_progress_time = now
+
+        video_id = response['id']
+        sessions.remove(video_path)
+        upload_mbps = (media.size() - resumed_from) / 1024 / 1024 / max(time.monotonic() - upload_started, 1e-6)
+        metrics.inc('ytu_uploads_total', result='success')
+        metrics.observe('ytu_upload_throughput_mb_per_second', upload_mbps)
+        metrics.set('ytu_last_upload_throughput_mb_per_second', upload_mbps)
+        logger.info(f"Upload complete! Video ID: {video_id} ({upload_mbps:.1f} MB/s)")
+
+        # Set thumbnail if provided
+        thumbnail_path = options.get('thumbnail_path')
+        if thumbnail_path and os.path.exists(thumbnail_path) and set_thumbnail:
+            try:
+                set_video_thumbnail(youtube, video_id, thumbnail_path)
+            except HttpError as e:
+                logger.error(f"Error setting thumbnail: {e}")
+
+        return {
+            'success': True,
+            'video_id': video_id,
+            'title': body['snippet']['title'],
+            'thumbnail_path': thumbnail_path if thumbnail_path and os.path.exists(thumbnail_path) else None,
+            'chunk_size': chunk_controller.chunk_size,
+            'throughput': chunk_controller.throughput
+        }
+
+    except HttpError as e:
+        chunk_controller.on_error()
+        metrics.inc('ytu_uploads_total', result='failure')
+        logger.error(f"An HTTP error occurred: {e}")
+        return {
+            'success': False,
+            'error': str(e)
+        }
+    except Exception as e:
+        chunk_controller.on_error()
+        metrics.inc('ytu_uploads_total', result='failure')
+        logger.error(f"An error occurred: {e}")
+        return {
+            'success': False,
+            'error': str(e)
+        }
+    finally:
+        if isinstance(media, MmapMediaUpload):
+            media.close()
+
+
+def list_playlists(youtube):
+    """
+    Récupère toutes les playlists de la chaîne (titre en minuscules -> ID).
+
+    Args:
+        youtube: Service YouTube API
+
+    Returns:
+        dict: {titre en minuscules: ID de la playlist}
+    """
+    playlists = {}
+    page_token = None
+    while True:
+        request = youtube.playlists().list(
+            part="snippet,id",
+            mine=True,
+            maxResults=50,
+            pageToken=page_token
+        )
+        response = request.execute()
+
+        for item in response.get("items", []):
+            # En cas de doublon, garder la première playlist comme find_playlist_by_name()
+            playlists.setdefault(item["snippet"]["title"].lower(), item["id"])
+
+        page_token = response.get("nextPageToken")
+        if not page_token:
+            return playlists
+
+
+def find_playlist_by_name(youtube, playlist_name):
+    """
+    Recherche une playlist par son nom et retourne son ID.
+
+    Args:
+        youtube: Service YouTube API
+        playlist_name (str): Nom de la playlist à rechercher
+
+    Returns:
+        str: ID de la playlist ou None si non trouvée
+    """
+    try:
+        return list_playlists(youtube).get(playlist_name.lower())
+    except Exception as e:
+        logger.error(f"Error finding playlist: {e}")
+        return None
+
+
+class PlaylistCache:
+    """
+    Cache nom de playlist -> ID, persisté dans data/playlists.json avec un TTL.
+
+    La liste complète des playlists est récupérée une seule fois (au lieu de
+    paginer playlists().list pour chaque vidéo), puis tenue à jour par
+    create_playlist() et invalidée quand YouTube répond 404.
+    """
+
+    def __init__(self, cache_file=PLAYLISTS_CACHE_FILE, ttl_hours=24):
+        """
+        Args:
+            cache_file (str): Fichier de persistance du cache
+            ttl_hours (float): Durée de validité de la liste des playlists
+        """
+        self.cache_file = cache_file
+        self.ttl = timedelta(hours=ttl_hours)
+        self._lock = threading.Lock()
+        self._playlists = {}
+        self._fetched_at = None
+        # Liste déjà récupérée depuis l'API par ce processus
+        self._refreshed = False
+
+        if os.path.exists(cache_file):
+            try:
+                with open(cache_file, 'r') as f:
+                    state = json.load(f)
+                self._playlists = state.get('playlists', {})
+                self._fetched_at = datetime.datetime.fromisoformat(state['fetched_at'])
+            except Exception as e:
+                logger.error(f"Error loading playlist cache: {e}")
+                self._playlists = {}
+                self._fetched_at = None
+
+    def _save(self):
+        tmp_file = self.cache_file + '.tmp'
+        try:
+            with open(tmp_file, 'w') as f:
+                json.dump({
+                    'fetched_at': self._fetched_at.isoformat() if self._fetched_at else None,
+                    'playlists': self._playlists
+                }, f, indent=2)
+            os.replace(tmp_file, self.cache_file)
+        except Exception as e:
+            logger.error(f"Error saving playlist cache: {e}")
+
+    def _is_stale(self):
+        return (self._fetched_at is None
+                or datetime.datetime.utcnow() - self._fetched_at > self.ttl)
+
+    def _refresh(self, youtube):
+        self._playlists = list_playlists(youtube)
+        self._fetched_at = datetime.datetime.utcnow()
+        self._refreshed = True
+        self._save()
+        logger.debug(f"Playlist cache refreshed ({len(self._playlists)} playlists)")
+
+    def lookup(self, youtube, playlist_name):
+        """
+        Retourne l'ID d'une playlist à partir de son nom.
+
+        L'API n'est appelée que si le cache a expiré, ou si le nom est absent
+        d'une liste qui n'a pas encore été rafraîchie par ce processus.
+
+        Args:
+            youtube: Service YouTube API
+            playlist_name (str): Nom de la playlist
+
+        Returns:
+            str: ID de la playlist ou None si non trouvée
+        """
+        key = playlist_name.lower()
+        with self._lock:
+            try:
+                if self._is_stale() or (key not in self._playlists and not self._refreshed):
+                    self._refresh(youtube)
+            except Exception as e:
+                logger.error(f"Error finding playlist: {e}")
+            return self._playlists.get(key)
+
+    def set(self, playlist_name, playlist_id):
+        """
+        Ajoute ou met à jour une playlist dans le cache.
+
+        Args:
+            playlist_name (str): Nom de la playlist
+            playlist_id (str): ID de la playlist
+        """
+        with self._lock:
+            self._playlists[playlist_name.lower()] = playlist_id
+            self._save()
+
+    def invalidate(self, playlist_name):
+        """
+        Retire une playlist du cache (supprimée côté YouTube).
+
+        Args:
+            playlist_name (str): Nom de la playlist
+        """
+        with self._lock:
+            if self._playlists.pop(playlist_name.lower(), None) is not None:
+                self._save()
+
+
+def get_playlist_cache(config=None):
+    """
+    Retourne le cache des playlists du compte courant.
+
+    Args:
+        config (Config, optional): Application configuration (TTL du cache)
+
+    Returns:
+        PlaylistCache: Cache des playlists
+    """
+    return get_current_account().get_playlist_cache(config)
+
+
+def create_playlist(youtube, playlist_name):
+    """
+    Crée une nouvelle playlist et retourne son ID.
+
+    Args:
+        youtube: Service YouTube API
+        playlist_name (str): Nom de la nouvelle playlist
+
+    Returns:
+        str: ID de la playlist créée ou None en cas d'erreur
+    """
+    try:
+        request = youtube.playlists().insert(
+            part="snippet,status",
+            body={
+                "snippet": {
+                    "title": playlist_name,
+                    "description": f"Vidéos de la chaîne {playlist_name}"
+                },
+                "status": {
+                    "privacyStatus": "private"
+                }
+            }
+        )
+        response = request.execute()
+        logger.info(f"Playlist '{playlist_name}' created")
+        playlist_id = response.get("id")
+        if playlist_id:
+            get_playlist_cache().set(playlist_name, playlist_id)
+        return playlist_id
+    except Exception as e:
+        logger.error(f"Error creating playlist: {e}")
+        return None
+
+
+def add_video_to_playlist(youtube, playlist_id, video_id):
+    """
+    Ajoute une vidéo à une playlist.
+
+    Args:
+        youtube: Service YouTube API
+        playlist_id (str): ID de la playlist
+        video_id (str): ID de la vidéo à ajouter
+
+    Returns:
+        dict: Réponse de l'API ou None en cas d'erreur
+    """
+    try:
+        request = youtube.playlistItems().insert(
+            part="snippet",
+            body={
+                "snippet": {
+                    "playlistId": playlist_id,
+                    "resourceId": {
+                        "kind": "youtube#video",
+                        "videoId": video_id
+                    }
+                }
+            }
+        )
+        return request.execute()
+    except Exception as e:
+        logger.error(f"Error adding video to playlist: {e}")
+        return None
+
+
+def _playlist_item_body(playlist_id, video_id):
+    return {
+        "snippet": {
+            "playlistId": playlist_id,
+            "resourceId": {
+                "kind": "youtube#video",
+                "videoId": video_id
+            }
+        }
+    }
+
+
+def _resolve_channel_playlist(youtube, channel_name):
+    """
+    Trouve (via le cache) ou crée la playlist d'une chaîne.
+
+    Args:
+        youtube: Service YouTube API
+        channel_name (str): Nom de la chaîne
+
+    Returns:
+        str: ID de la playlist ou None
+    """
+    playlist_id = get_playlist_cache().lookup(youtube, channel_name)
+    if not playlist_id:
+        playlist_id = create_playlist(youtube, channel_name)
+    return playlist_id
+
+
+def add_videos_to_channel_playlist(youtube, video_ids, channel_name):
+    """
+    Ajoute plusieurs vidéos à la playlist d'une chaîne en une seule requête batch.
+
+    La playlist est résolue une seule fois. Si YouTube répond 404 (playlist
+    supprimée), l'entrée du cache est invalidée et la playlist est recréée.
+
+    Args:
+        youtube: Service YouTube API
+        video_ids (list): IDs des vidéos YouTube
+        channel_name (str): Nom de la chaîne (et de la playlist)
+
+    Returns:
+        list: IDs des vidéos ajoutées avec succès
+    """
+    added = []
+    remaining = list(video_ids)
+
+    for attempt in range(2):
+        playlist_id = _resolve_channel_playlist(youtube, channel_name)
+        if not playlist_id:
+            logger.error(f"Unable to find or create a playlist for '{channel_name}'")
+            return added
+
+        failed = []
+        not_found = []
+
+        def callback(request_id, response, exception):
+            video_id = remaining[int(request_id)]
+            if exception is None:
+                added.append(video_id)
+            elif isinstance(exception, HttpError) and exception.resp.status == 404:
+                not_found.append(video_id)
+            else:
+                if _is_quota_error(exception):
+                    get_quota_ledger().mark_exhausted()
+                failed.append((video_id, exception))
+
+        # Une requête batch accepte au plus 50 appels
+        for start in range(0, len(remaining), 50):
+            batch = youtube.new_batch_http_request(callback=callback)
+            for index in range(start, min(start + 50, len(remaining))):
+                batch.add(youtube.playlistItems().insert(
+                    part="snippet",
+                    body=_playlist_item_body(playlist_id, remaining[index])
+                ), request_id=str(index))
+            # Les appels d'un batch sont facturés individuellement
+            _record_api_call('youtube.playlistItems.insert', count=min(50, len(remaining) - start))
+            try:
+                batch.execute()
+            except Exception as e:
+                logger.error(f"Error adding videos to playlist: {e}")
+                failed.extend((video_id, e) for video_id in remaining[start:start + 50]
+                              if video_id not in added)
+
+        # Les insertions concurrentes dans une même playlist peuvent échouer :
+        # on les rejoue une par une
+        for video_id, exception in failed:
+            if add_video_to_playlist(youtube, playlist_id, video_id):
+                added.append(video_id)
+            else:
+                logger.error(f"Failed to add {video_id} to playlist '{channel_name}': {exception}")
+
+        if not not_found:
+            break
+
+        logger.warning(f"Playlist '{channel_name}' not found (404), invalidating the cache...")
+        get_playlist_cache().invalidate(channel_name)
+        remaining = not_found
+
+    if added:
+        logger.info(f"{len(added)} video(s) added to playlist '{channel_name}'")
+    return added
+
+
+def add_to_channel_playlist(youtube, video_id, channel_name):
+    """
+    Ajoute une vidéo à une playlist correspondant au nom de la chaîne.
+    Si la playlist n'existe pas, elle est créée.
+
+    Args:
+        youtube: Service YouTube API
+        video_id: ID de la vidéo YouTube
+        channel_name: Nom de la chaîne extrait du chemin
+    """
+    add_videos_to_channel_playlist(youtube, [video_id], channel_name)
+
+
+_pending_playlist_lock = threading.Lock()
+
+
+def queue_playlist_addition(channel_name, video_id, reservation=None):
+    """
+    Met de côté l'ajout d'une vidéo à la playlist de sa chaîne jusqu'à la fin du lot.
+
+    Args:
+        channel_name (str): Nom de la chaîne
+        video_id (str): ID de la vidéo YouTube
+        reservation (dict, optional): Réservation de quota de l'upload, dont la
+            part playlistItems.insert est gardée jusqu'à l'ajout
+    """
+    account = get_current_account()
+    with _pending_playlist_lock:
+        account.pending_playlist_additions.setdefault(channel_name, []).append((video_id, reservation))
+
+
+def flush_playlist_additions():
+    """
+    Confie à l'étape de post-traitement l'ajout aux playlists de toutes les
+    vidéos mises de côté pour le compte courant, regroupées par chaîne.
+    """
+    account = get_current_account()
+    with _pending_playlist_lock:
+        pending = account.pending_playlist_additions
+        account.pending_playlist_additions = {}
+
+    for channel_name, additions in pending.items():
+        video_ids = [video_id for video_id, _ in additions]
+        reservations = [reservation for _, reservation in additions if reservation is not None]
+        get_post_processor().submit(_add_to_playlist_job, video_ids, channel_name, reservations)
+
+
+def _add_to_playlist_job(video_ids, channel_name, reservations=()):
+    """
+    Tâche de post-traitement : ajout des vidéos d'une chaîne à sa playlist.
+
+    La part playlistItems.insert des réservations de quota des uploads est
+    consommée par les insertions, puis le reste est libéré.
+    """
+    with use_quota_reservations(reservations):
+        get_post_processor().run_step('playlist', channel_name, add_videos_to_channel_playlist,
+                                      get_worker_service(), video_ids, channel_name)
+    quota = get_quota_ledger()
+    for reservation in reservations:
+        quota.release(reservation, 'youtube.playlistItems.insert')
+
+
+def compute_fingerprint(video_path):
+    """
+    Calcule l'empreinte rapide d'un fichier : sa taille et le SHA-256 de
+    FINGERPRINT_SAMPLES blocs répartis du début à la fin du fichier.
+
+    Args:
+        video_path (str): Chemin vers le fichier vidéo
+
+    Returns:
+        str: Empreinte au format "taille:hash"
+    """
+    digest = hashlib.sha256()
+    with open(video_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        last_offset = max(0, size - FINGERPRINT_BLOCK_SIZE)
+        for index in range(FINGERPRINT_SAMPLES):
+            offset = last_offset * index // (FINGERPRINT_SAMPLES - 1)
+            digest.update(os.pread(f.fileno(), FINGERPRINT_BLOCK_SIZE, offset))
+    return f'{size}:{digest.hexdigest()[:32]}'
+
+
+def compute_content_hash(video_path):
+    """
+    Calcule le SHA-256 complet d'un fichier en le lisant par blocs.
+
+    Args:
+        video_path (str): Chemin vers le fichier vidéo
+
+    Returns:
+        str: Hash hexadécimal
+    """
+    digest = hashlib.sha256()
+    with open(video_path, 'rb') as f:
+        for block in iter(lambda: f.read(CONTENT_HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class UploadLedger:
+    """
+    Registre des uploads stocké dans une base SQLite (data/uploads.db).
+
+    Les chemins déjà uploadés sont gardés en mémoire dans un set, chargé une
+    seule fois par cycle via reload(), ce qui rend les tests d'appartenance en
+    O(1) au lieu de relire tout le fichier JSON pour chaque vidéo.
+    L'ancien fichier data/uploads.json est importé automatiquement au premier
+    démarrage puis renommé en uploads.json.migrated.
+
+    Chaque upload est aussi enregistré avec son empreinte (voir
+    compute_fingerprint()) : un fichier déplacé ou renommé est reconnu et
+    rattaché à la vidéo YouTube existante au lieu d'être uploadé à nouveau.
+    Seuls les fichiers dont la taille correspond à un upload connu sont lus.
+    Si full_hash est activé, le hash complet est calculé en arrière-plan et
+    vérifié avant de rattacher un fichier déplacé.
+    """
+
+    def __init__(self, db_path=LEDGER_FILE, legacy_file=UPLOADS_FILE):
+        """
+        Ouvre (ou crée) la base et migre l'ancien registre JSON si présent.
+
+        Args:
+            db_path (str): Chemin de la base SQLite
+            legacy_file (str): Ancien fichier JSON à migrer s'il existe
+        """
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS uploads ('
+            'video_path TEXT PRIMARY KEY, '
+            'video_id TEXT NOT NULL, '
+            'upload_time TEXT NOT NULL)'
+        )
+        columns = {row[1] for row in self._conn.execute('PRAGMA table_info(uploads)')}
+        for column, column_type in (('size', 'INTEGER'), ('fingerprint', 'TEXT'), ('content_hash', 'TEXT')):
+            if column not in columns:
+                self._conn.execute(f'ALTER TABLE uploads ADD COLUMN {column} {column_type}')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS uploads_fingerprint ON uploads (fingerprint)')
+        self._conn.commit()
+        self._paths = set()
+        self._sizes = set()
+        self._fingerprints = {}
+        self._verifications = {}
+        self._hash_mismatches = set()
+        self.content_dedup = True
+        self.full_hash = False
+        self._hash_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=CONTENT_HASH_WORKERS, thread_name_prefix='hash')
+
+        self._migrate_legacy(legacy_file)
+        self.reload()
+        # Les uploads enregistrés avant l'ajout des empreintes sont complétés en arrière-plan
+        self._hash_executor.submit(self._backfill_fingerprints)
+
+    def _migrate_legacy(self, legacy_file):
+        """
+        Importe l'ancien registre JSON dans la base SQLite (une seule fois).
+
+        Args:
+            legacy_file (str): Chemin vers l'ancien data/uploads.json
+        """
+        if not legacy_file or not os.path.exists(legacy_file):
+            return
+
+        try:
+            with open(legacy_file, 'r') as f:
+                uploads = json.load(f)
+        except Exception as e:
+            logger.error(f"Error loading legacy uploads file: {e}")
+            return
+
+        rows = []
+        for video_path, entry in uploads.items():
+            if isinstance(entry, dict):
+                rows.append((video_path, entry.get('video_id') or '', entry.get('upload_time') or ''))
+            else:
+                rows.append((video_path, str(entry), ''))
+
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(
+                    'INSERT OR IGNORE INTO uploads (video_path, video_id, upload_time) VALUES (?, ?, ?)',
+                    rows
+                )
+
+        os.replace(legacy_file, legacy_file + '.migrated')
+        logger.info(f"Migrated {len(rows)} entries from {legacy_file} to the upload ledger")
+
+    def reload(self):
+        """
+        Recharge l'index en mémoire depuis la base (à appeler une fois par cycle).
+        """
+        with self._lock:
+            cursor = self._conn.execute('SELECT video_path, size FROM uploads')
+            self._paths = set()
+            self._sizes = set()
+            for video_path, size in cursor:
+                self._paths.add(video_path)
+                if size is not None:
+                    self._sizes.add(size)
+            self._fingerprints = {}
+
+    def _backfill_fingerprints(self):
+        """
+        Calcule l'empreinte des uploads enregistrés sans empreinte dont le fichier existe encore.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT video_path FROM uploads WHERE fingerprint IS NULL').fetchall()
+        filled = 0
+        for (video_path,) in rows:
+            try:
+                fingerprint = compute_fingerprint(video_path)
+            except OSError:
+                continue
+            size = int(fingerprint.split(':', 1)[0])
+            with self._lock:
+                with self._conn:
+                    self._conn.execute('UPDATE uploads SET size = ?, fingerprint = ? WHERE video_path = ?',
+                                       (size, fingerprint, video_path))
+                self._sizes.add(size)
+            filled += 1
+        if filled:
+            logger.info(f"Computed fingerprints for {filled} previously uploaded videos")
+
+    def _store_content_hash(self, video_path):
+        try:
+            content_hash = compute_content_hash(video_path)
+        except OSError as e:
+            logger.error(f"Error hashing {video_path}: {e}")
+            return
+        with self._lock:
+            with self._conn:
+                self._conn.execute('UPDATE uploads SET content_hash = ? WHERE video_path = ?',
+                                   (content_hash, video_path))
+
+    def _fingerprint(self, video_path, sizes):
+        """
+        Empreinte d'un fichier, mise en cache jusqu'au prochain reload() tant
+        que sa taille et sa date de modification ne changent pas.
+
+        Appelé sans le verrou du registre : la lecture du fichier (parfois sur
+        un partage réseau lent) ne bloque pas record().
+
+        Args:
+            video_path (str): Chemin du fichier
+            sizes (set): Tailles des uploads connus
+
+        Returns:
+            str: Empreinte, ou None si le fichier est illisible ou si aucun
+            upload connu n'a la même taille
+        """
+        try:
+            stat = os.stat(video_path)
+        except OSError:
+            return None
+        if stat.st_size not in sizes:
+            return None
+        with self._lock:
+            cached = self._fingerprints.get(video_path)
+        if cached and cached[0] == (stat.st_size, stat.st_mtime_ns):
+            return cached[1]
+        try:
+            fingerprint = compute_fingerprint(video_path)
+        except OSError as e:
+            logger.error(f"Error fingerprinting {video_path}: {e}")
+            return None
+        with self._lock:
+            self._fingerprints[video_path] = ((stat.st_size, stat.st_mtime_ns), fingerprint)
+        return fingerprint
+
+    def _match_moved(self, video_path, fingerprint):
+        """
+        Reconnaît un fichier déjà uploadé sous un autre chemin et le rattache
+        à la vidéo YouTube existante (appelé avec le verrou).
+
+        Args:
+            video_path (str): Chemin absent du registre
+            fingerprint (str): Empreinte du fichier, ou None
+
+        Returns:
+            bool: True si le fichier ne doit pas être uploadé (déjà connu, ou
+            vérification du hash complet en cours)
+        """
+        if fingerprint is None or (video_path, fingerprint) in self._hash_mismatches:
+            return False
+        row = self._conn.execute(
+            'SELECT video_path, video_id, size, content_hash FROM uploads WHERE fingerprint = ? LIMIT 1',
+            (fingerprint,)
+        ).fetchone()
+        if not row:
+            return False
+        previous_path, video_id, size, content_hash = row
+
+        if self.full_hash and content_hash:
+            # Le hash complet est calculé en arrière-plan : le fichier attend le cycle suivant
+            future = self._verifications.get(video_path)
+            if future is None:
+                self._verifications[video_path] = self._hash_executor.submit(compute_content_hash, video_path)
+                return True
+            if not future.done():
+                return True
+            del self._verifications[video_path]
+            try:
+                matches = future.result() == content_hash
+            except OSError:
+                matches = False
+            if not matches:
+                logger.warning(f"{video_path} matches the fingerprint of {previous_path} "
+                               f"but not its content hash, it will be uploaded")
+                self._hash_mismatches.add((video_path, fingerprint))
+                return False
+
+        with self._conn:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO uploads (video_path, video_id, upload_time, size, fingerprint, content_hash) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (video_path, video_id, datetime.datetime.now().isoformat(), size, fingerprint, content_hash)
+            )
+            # L'ancien chemin n'existe plus : c'est un déplacement, pas une copie
+            if not os.path.exists(previous_path):
+                self._conn.execute('DELETE FROM uploads WHERE video_path = ?', (previous_path,))
+                self._paths.discard(previous_path)
+        self._paths.add(video_path)
+        logger.info(f"{video_path} is already on YouTube as {video_id} "
+                    f"(previously {previous_path}), not uploading it again")
+        return True
+
+    def __len__(self):
+        with self._lock:
+            return len(self._paths)
+
+    def __contains__(self, video_path):
+        with self._lock:
+            return video_path in self._paths
+
+    def get(self, video_path):
+        """
+        Retourne l'entrée du registre pour une vidéo.
+
+        Args:
+            video_path (str): Chemin vers le fichier vidéo
+
+        Returns:
+            dict: {'video_id', 'upload_time'} ou None si absente
+        """
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT video_id, upload_time FROM uploads WHERE video_path = ?',
+                (video_path,)
+            ).fetchone()
+        if not row:
+            return None
+        return {'video_id': row[0], 'upload_time': row[1]}
+
+    def filter_new(self, video_paths):
+        """
+        Retourne, dans l'ordre d'origine, les chemins absents du registre.
+
+        Args:
+            video_paths (list): Chemins des vidéos trouvées au scan
+
+        Returns:
+            list: Chemins des vidéos pas encore uploadées
+        """
+        with self._lock:
+            new_paths = [path for path in video_paths if path not in self._paths]
+            if not self.content_dedup or not self._sizes:
+                return new_paths
+            sizes = set(self._sizes)
+
+        # Empreintes calculées hors du verrou, seules la recherche et l'insertion le prennent
+        fingerprints = {path: self._fingerprint(path, sizes) for path in new_paths}
+        with self._lock:
+            return [path for path in new_paths
+                    if path not in self._paths and not self._match_moved(path, fingerprints[path])]
+
+    def record(self, video_path, video_id):
+        """
+        Enregistre un upload réussi.
+
+        Args:
+            video_path (str): Chemin vers le fichier vidéo
+            video_id (str): ID de la vidéo YouTube
+        """
+        try:
+            fingerprint = compute_fingerprint(video_path)
+            size = int(fingerprint.split(':', 1)[0])
+        except OSError:
+            fingerprint, size = None, None
+
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO uploads (video_path, video_id, upload_time, size, fingerprint) '
+                    'VALUES (?, ?, ?, ?, ?)',
+                    (video_path, video_id, datetime.datetime.now().isoformat(), size, fingerprint)
+                )
+            self._paths.add(video_path)
+            if size is not None:
+                self._sizes.add(size)
+
+        if self.full_hash and fingerprint:
+            self._hash_executor.submit(self._store_content_hash, video_path)
+
+
+_ledger = None
+_ledger_lock = threading.Lock()
+
+
+def get_ledger():
+    """
+    Retourne le registre des uploads partagé par le processus.
+
+    Returns:
+        UploadLedger: Registre des uploads
+    """
+    global _ledger
+    with _ledger_lock:
+        if _ledger is None:
+            _ledger = UploadLedger()
+        return _ledger
+
+
+def is_already_uploaded(video_path):
+    """
+    Checks if a video has already been uploaded.
+
+    Args:
+        video_path (str): Path to the video file
+
+    Returns:
+        bool: True if already uploaded, False otherwise
+    """
+    try:
+        return video_path in get_ledger()
+    except Exception as e:
+        logger.error(f"Error checking upload status: {e}")
+        return False
+
+
+def filter_new_videos(video_paths):
+    """
+    Returns the videos that have not been uploaded yet.
+
+    Args:
+        video_paths (list): Paths returned by scan_for_videos()
+
+    Returns:
+        list: Paths not present in the upload ledger
+    """
+    try:
+        return get_ledger().filter_new(video_paths)
+    except Exception as e:
+        logger.error(f"Error checking upload status: {e}")
+        return list(video_paths)
+
+
+def record_upload(video_path, video_id):
+    """
+    Records a successful upload.
+
+    Args:
+        video_path (str): Path to the video file
+        video_id (str): YouTube video ID
+    """
+    try:
+        get_ledger().record(video_path, video_id)
+    except Exception as e:
+        logger.error(f"Error saving upload to ledger: {e}")
+
+
+def parse_rate_schedule(value):
+    """
+    Lit un calendrier de débit : plages horaires locales séparées par des
+    virgules, chacune au format HH:MM-HH:MM=MB/s (0 = illimité). Une plage
+    peut passer minuit, par exemple "22:00-02:00=1".
+
+    Args:
+        value (str): Calendrier, par exemple "02:00-08:00=0,18:00-23:00=2.5"
+
+    Returns:
+        tuple: Plages (début en minutes, fin en minutes, débit en MB/s)
+
+    Raises:
+        ValueError: Plage mal formée
+    """
+    windows = []
+    for entry in filter(None, (part.strip() for part in value.split(','))):
+        match = re.fullmatch(r'(\d{1,2}):(\d{2})\s*-\s*(\d{1,2}):(\d{2})\s*=\s*([\d.]+)', entry)
+        if not match:
+            raise ValueError(f"Invalid upload rate schedule entry '{entry}' (expected HH:MM-HH:MM=MB/s)")
+        start = int(match[1]) * 60 + int(match[2])
+        end = int(match[3]) * 60 + int(match[4])
+        if start >= 24 * 60 or end > 24 * 60:
+            raise ValueError(f"Invalid time in upload rate schedule entry '{entry}'")
+        windows.append((start, end, float(match[5])))
+    return tuple(windows)
+
+
+def scheduled_rate(schedule, default_rate, now=None):
+    """
+    Retourne le plafond de débit applicable à une heure donnée.
+
+    Args:
+        schedule (tuple): Plages renvoyées par parse_rate_schedule()
+        default_rate (float): Débit en dehors des plages, en MB/s
+        now (datetime.datetime, optional): Heure locale (maintenant par défaut)
+
+    Returns:
+        float: Débit en MB/s (0 = illimité)
+    """
+    now = now or datetime.datetime.now()
+    minute = now.hour * 60 + now.minute
+    for start, end, rate in schedule:
+        if start <= minute < end or (end <= start and (minute >= start or minute < end)):
+            return rate
+    return default_rate
+
+
+class BandwidthLimiter:
+    """
+    Seau à jetons qui plafonne le débit d'upload (global ou par worker).
+
+    Le débit peut suivre un calendrier : il est alors réévalué à chaque
+    envoi. La rafale est limitée à THROTTLE_BURST_SECONDS de débit, et les
+    envois sont débités par tranches de THROTTLE_SLICE_SIZE octets (voir
+    ThrottledHTTPConnection) : le plafond reste respecté quelle que soit la
+    taille des chunks.
+    """
+
+    def __init__(self, rate_bytes_per_sec, schedule=()):
+        """
+        Args:
+            rate_bytes_per_sec (float): Débit maximum en octets par seconde (0 = illimité)
+            schedule (tuple, optional): Plages horaires de parse_rate_schedule()
+        """
+        self.rate = float(rate_bytes_per_sec)
+        self.schedule = schedule
+        self._tokens = self._capacity(self.current_rate())
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _capacity(rate):
+        return max(THROTTLE_SLICE_SIZE, rate * THROTTLE_BURST_SECONDS)
+
+    def current_rate(self):
+        """
+        Returns:
+            float: Débit maximum actuel en octets par seconde (0 = illimité)
+        """
+        if not self.schedule:
+            return self.rate
+        return scheduled_rate(self.schedule, self.rate / 1024 / 1024) * 1024 * 1024
+
+    def consume(self, nbytes):
+        """
+        Débite nbytes du seau et attend si le débit maximum est dépassé.
+
+        Args:
+            nbytes (int): Nombre d'octets à envoyer
+        """
+        rate = self.current_rate()
+        if nbytes <= 0 or rate <= 0:
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._capacity(rate), self._tokens + (now - self._last) * rate)
+            self._last = now
+            self._tokens -= nbytes
+            wait = -self._tokens / rate if self._tokens < 0 else 0
+
+        if wait > 0:
+            time.sleep(wait)
+
+
+class UploadThrottle:
+    """
+    Ensemble des limiteurs appliqués à un upload : plafond global partagé
+    et plafond propre au worker.
+    """
+
+    def __init__(self, *limiters):
+        """
+        Args:
+            *limiters (BandwidthLimiter): Limiteurs à respecter (None ignorés)
+        """
+        self.limiters = [limiter for limiter in limiters if limiter is not None]
+
+    def consume(self, nbytes):
+        """
+        Attend que chaque limiteur autorise l'envoi de nbytes octets.
+        """
+        for limiter in self.limiters:
+            limiter.consume(nbytes)
+
+
+class DailyUploadCap:
+    """
+    Limite le nombre d'uploads par jour (jour YouTube, heure du Pacifique).
+    Le compteur est persisté dans data/daily_uploads.json.
+    """
+
+    def __init__(self, max_uploads, state_file=DAILY_UPLOADS_FILE):
+        """
+        Args:
+            max_uploads (int): Nombre maximum d'uploads par jour
+            state_file (str): Fichier de persistance du compteur
+        """
+        self.max_uploads = max_uploads
+        self.state_file = state_file
+        self._lock = threading.Lock()
+        self._day = None
+        self._count = 0
+        self._load()
+
+    @staticmethod
+    def _today():
+        return datetime.datetime.now(ZoneInfo(QUOTA_TIMEZONE)).date().isoformat()
+
+    def _load(self):
+        self._day = self._today()
+        if not os.path.exists(self.state_file):
+            return
+        try:
+            with open(self.state_file, 'r') as f:
+                state = json.load(f)
+            if state.get('day') == self._day:
+                self._count = int(state.get('count', 0))
+        except Exception as e:
+            logger.error(f"Error loading daily upload counter: {e}")
+
+    def _save(self):
+        tmp_file = self.state_file + '.tmp'
+        try:
+            with open(tmp_file, 'w') as f:
+                json.dump({'day': self._day, 'count': self._count}, f)
+            os.replace(tmp_file, self.state_file)
+        except Exception as e:
+            logger.error(f"Error saving daily upload counter: {e}")
+
+    def _roll_day(self):
+        today = self._today()
+        if today != self._day:
+            self._day = today
+            self._count = 0
+
+    def reserve(self):
+        """
+        Réserve un upload pour aujourd'hui.
+
+        Returns:
+            bool: True si la limite journalière n'est pas atteinte
+        """
+        with self._lock:
+            self._roll_day()
+            if self._count >= self.max_uploads:
+                return False
+            self._count += 1
+            self._save()
+            return True
+
+    def release(self):
+        """
+        Libère une réservation (upload échoué avant d'avoir abouti).
+        """
+        with self._lock:
+            self._roll_day()
+            if self._count > 0:
+                self._count -= 1
+                self._save()
+
+
+class QuotaLedger:
+    """
+    Comptabilise les unités de quota de l'API consommées dans la journée.
+
+    Le quota YouTube est remis à zéro à minuit, heure du Pacifique. Chaque
+    upload réserve son coût estimé avant de démarrer, ce qui permet de ne pas
+    lancer un upload que le budget restant ne couvre pas, même avec plusieurs
+    workers. Chaque appel imputé pendant l'upload ou son post-traitement
+    consomme la part correspondante de la réservation, pour ne pas être compté
+    deux fois. L'état est persisté dans data/quota.json.
+    """
+
+    def __init__(self, daily_quota, state_file=QUOTA_FILE):
+        """
+        Args:
+            daily_quota (int): Budget journalier en unités de quota
+            state_file (str): Fichier de persistance du compteur
+        """
+        self.daily_quota = daily_quota
+        self.state_file = state_file
+        self._lock = threading.Lock()
+        self._day = None
+        self._spent = 0
+        self._reserved = 0
+        self._exhausted = False
+        self._by_method = {}
+        self._load()
+
+    @staticmethod
+    def _now():
+        return datetime.datetime.now(ZoneInfo(QUOTA_TIMEZONE))
+
+    def _load(self):
+        self._day = self._now().date().isoformat()
+        if not os.path.exists(self.state_file):
+            return
+        try:
+            with open(self.state_file, 'r') as f:
+                state = json.load(f)
+            if state.get('day') == self._day:
+                self._spent = int(state.get('spent', 0))
+                self._exhausted = bool(state.get('exhausted', False))
+                self._by_method = dict(state.get('by_method', {}))
+        except Exception as e:
+            logger.error(f"Error loading quota ledger: {e}")
+
+    def _save(self):
+        tmp_file = self.state_file + '.tmp'
+        try:
+            with open(tmp_file, 'w') as f:
+                json.dump({
+                    'day': self._day,
+                    'spent': self._spent,
+                    'exhausted': self._exhausted,
+                    'by_method': self._by_method
+                }, f, indent=2)
+            os.replace(tmp_file, self.state_file)
+        except Exception as e:
+            logger.error(f"Error saving quota ledger: {e}")
+
+    def _roll_day(self):
+        today = self._now().date().isoformat()
+        if today != self._day:
+            self._day = today
+            self._spent = 0
+            self._exhausted = False
+            self._by_method = {}
+
+    def charge(self, method_id, count=1, reservations=()):
+        """
+        Impute le coût d'un ou plusieurs appels à une méthode de l'API.
+
+        Args:
+            method_id (str): Identifiant de la méthode (ex: youtube.videos.insert)
+            count (int): Nombre d'appels
+            reservations (iterable): Réservations couvrant ces appels, dont la
+                part pour cette méthode est consommée
+        """
+        units = QUOTA_COSTS.get(method_id, QUOTA_DEFAULT_COST) * count
+        with self._lock:
+            self._roll_day()
+            self._spent += units
+            self._by_method[method_id] = self._by_method.get(method_id, 0) + units
+            uncovered = units
+            for reservation in reservations:
+                used = min(uncovered, reservation.get(method_id, 0))
+                if used:
+                    reservation[method_id] -= used
+                    self._reserved = max(0, self._reserved - used)
+                    uncovered -= used
+            self._save()
+
+    def reserve(self, costs):
+        """
+        Réserve des unités pour une opération à venir.
+
+        Args:
+            costs (dict): Coût estimé de l'opération, par méthode de l'API
+
+        Returns:
+            dict: Réservation (unités restantes par méthode), ou None si le
+                budget restant ne couvre pas l'opération
+        """
+        units = sum(costs.values())
+        with self._lock:
+            self._roll_day()
+            if self._exhausted or self._spent + self._reserved + units > self.daily_quota:
+                return None
+            self._reserved += units
+            return dict(costs)
+
+    def release(self, reservation, *method_ids):
+        """
+        Libère la part d'une réservation qui n'a pas été consommée par charge().
+
+        Args:
+            reservation (dict): Réservation renvoyée par reserve()
+            *method_ids (str): Méthodes dont la part est libérée (toutes par défaut)
+        """
+        with self._lock:
+            for method_id in method_ids or list(reservation):
+                self._reserved = max(0, self._reserved - reservation.pop(method_id, 0))
+
+    def mark_exhausted(self):
+        """
+        Enregistre un refus quotaExceeded : plus aucun upload jusqu'à la remise à zéro.
+        """
+        with self._lock:
+            self._roll_day()
+            if not self._exhausted:
+                logger.warning(f"YouTube reported the daily quota as exhausted, "
+                               f"pausing uploads until {self.reset_time():%Y-%m-%d %H:%M %Z}")
+            self._exhausted = True
+            self._save()
+
+    def remaining(self):
+        """
+        Returns:
+            int: Unités encore disponibles aujourd'hui (hors réservations)
+        """
+        with self._lock:
+            self._roll_day()
+            if self._exhausted:
+                return 0
+            return max(0, self.daily_quota - self._spent)
+
+    def reset_time(self):
+        """
+        Returns:
+            datetime.datetime: Prochain minuit, heure du Pacifique
+        """
+        tomorrow = self._now().date() + timedelta(days=1)
+        return datetime.datetime.combine(tomorrow, datetime.time(), tzinfo=ZoneInfo(QUOTA_TIMEZONE))
+
+    def status(self):
+        """
+        Returns:
+            dict: État du quota pour l'affichage (--status, résumé de cycle)
+        """
+        remaining = self.remaining()
+        with self._lock:
+            return {
+                'day': self._day,
+                'daily_quota': self.daily_quota,
+                'spent': self._spent,
+                'reserved': self._reserved,
+                'remaining': remaining,
+                'exhausted': self._exhausted,
+                'reset_at': self.reset_time().isoformat(),
+                'by_method': dict(self._by_method)
+            }
+
+
+_quota_reservations = contextvars.ContextVar('ytu_quota_reservations', default=())
+
+
+@contextlib.contextmanager
+def use_quota_reservations(reservations):
+    """
+    Impute les appels à l'API faits pendant la durée d'un bloc aux réservations
+    de quota données (voir QuotaLedger.charge()).
+
+    Args:
+        reservations (iterable): Réservations renvoyées par QuotaLedger.reserve()
+    """
+    token = _quota_reservations.set(tuple(reservations))
+    try:
+        yield
+    finally:
+        _quota_reservations.reset(token)
+
+
+_bandwidth_limiter = None
+_daily_upload_cap = None
+_limits_lock = threading.Lock()
+_throttle_local = threading.local()
+
+
+def get_bandwidth_limiter(config):
+    """
+    Retourne le limiteur de débit global, ou None si aucun plafond n'est configuré.
+
+    Args:
+        config (Config): Application configuration
+
+    Returns:
+        BandwidthLimiter: Limiteur partagé ou None
+    """
+    global _bandwidth_limiter
+    rate = config.max_upload_rate * 1024 * 1024
+    schedule = config.upload_rate_schedule
+    with _limits_lock:
+        if rate <= 0 and not any(window_rate > 0 for _, _, window_rate in schedule):
+            _bandwidth_limiter = None
+        elif _bandwidth_limiter is None or (_bandwidth_limiter.rate, _bandwidth_limiter.schedule) != (rate, schedule):
+            _bandwidth_limiter = BandwidthLimiter(rate, schedule)
+        return _bandwidth_limiter
+
+
+def get_worker_limiter(config):
+    """
+    Retourne le limiteur de débit du worker courant, ou None sans plafond par worker.
+
+    Args:
+        config (Config): Application configuration
+
+    Returns:
+        BandwidthLimiter: Limiteur du thread courant ou None
+    """
+    rate = config.max_worker_upload_rate * 1024 * 1024
+    if rate <= 0:
+        return None
+    limiter = getattr(_throttle_local, 'limiter', None)
+    if limiter is None or limiter.rate != rate:
+        limiter = BandwidthLimiter(rate)
+        _throttle_local.limiter = limiter
+    return limiter
+
+
+def get_upload_throttle(config):
+    """
+    Retourne les plafonds de débit à appliquer à un upload du worker courant.
+
+    Args:
+        config (Config): Application configuration
+
+    Returns:
+        UploadThrottle: Plafonds global et par worker, ou None sans plafond
+    """
+    throttle = UploadThrottle(get_bandwidth_limiter(config), get_worker_limiter(config))
+    return throttle if throttle.limiters else None
+
+
+def get_daily_upload_cap(config):
+    """
+    Retourne le plafond journalier d'uploads, ou None si aucun plafond n'est configuré.
+
+    Args:
+        config (Config): Application configuration
+
+    Returns:
+        DailyUploadCap: Plafond partagé ou None
+    """
+    global _daily_upload_cap
+    max_uploads = config.max_daily_uploads
+    with _limits_lock:
+        if max_uploads <= 0:
+            _daily_upload_cap = None
+        elif _daily_upload_cap is None:
+            _daily_upload_cap = DailyUploadCap(max_uploads)
+        else:
+            _daily_upload_cap.max_uploads = max_uploads
+        return _daily_upload_cap
+
+
+def get_quota_ledger(config=None):
+    """
+    Retourne le registre de quota du compte courant.
+
+    Args:
+        config (Config): Application configuration (met à jour le budget si fourni)
+
+    Returns:
+        QuotaLedger: Registre du compte
+    """
+    return get_current_account().get_quota_ledger(config)
+
+
+def estimate_upload_cost(video_path, config):
+    """
+    Estime le coût en quota de l'upload d'une vidéo et de ses appels annexes.
+
+    Args:
+        video_path (str): Chemin vers le fichier vidéo
+        config (Config): Application configuration
+
+    Returns:
+        dict: Nombre d'unités de quota par méthode de l'API
+    """
+    costs = {'youtube.videos.insert': QUOTA_COSTS['youtube.videos.insert']}
+    if config.ganymede_mode:
+        record = load_ganymede_record(video_path)
+        if record and record.thumbnail_path:
+            costs['youtube.thumbnails.set'] = QUOTA_COSTS['youtube.thumbnails.set']
+        if config.auto_playlist:
+            costs['youtube.playlistItems.insert'] = QUOTA_COSTS['youtube.playlistItems.insert']
+    return costs
+
+
+def print_status(config):
+    """
+    Prints the remaining API quota and the upload history size.
+
+    Args:
+        config (Config): Application configuration
+    """
+    accounts = get_accounts()
+    for account in accounts:
+        status = account.get_quota_ledger(config).status()
+        if len(accounts) > 1:
+            channels = sorted(channel for channel, name in _account_routes.items() if name == account.name)
+            print(f"Account: {account.name} (token: {account.token_file}"
+                  f"{', channels: ' + ', '.join(channels) if channels else ''})")
+        print(f"Quota day (Pacific time): {status['day']}")
+        print(f"Quota budget: {status['daily_quota']} units")
+        print(f"Quota spent: {status['spent']} units")
+        print(f"Quota remaining: {status['remaining']} units"
+              f"{' (exhausted)' if status['exhausted'] else ''}")
+        print(f"Quota resets at: {status['reset_at']}")
+        for method_id, units in sorted(status['by_method'].items()):
+            print(f"  {method_id}: {units} units")
+    print(f"Uploads in history: {len(get_ledger())}")
+
+
+_worker_local = threading.local()
+
+
+def get_worker_service(account=None):
+    """
+    Retourne un service YouTube propre au thread courant et au compte.
+
+    httplib2.Http n'est pas thread-safe : chaque worker construit, une fois
+    par compte, son propre service avec sa propre connexion, en partageant les
+    credentials suivis par le TokenManager du compte. Les workers d'upload et
+    de post-traitement sont des threads durables : le service et ses
+    connexions servent d'un lot à l'autre.
+
+    Args:
+        account (Account, optional): Compte du service (le compte courant par défaut)
+
+    Returns:
+        googleapiclient.discovery.Resource: Service dédié au worker
+    """
+    account = account or get_current_account()
+    creds = account.token_manager.credentials
+    services = getattr(_worker_local, 'services', None)
+    if services is None:
+        services = _worker_local.services = {}
+    service = services.get(account.name)
+    if service is not None:
+        # Après un rafraîchissement, seuls les credentials changent
+        if service._http.credentials is not creds:
+            service._http.credentials = creds
+        return service
+
+    # Transport propre au worker, limité en débit au niveau du socket
+    http = google_auth_httplib2.AuthorizedHttp(creds, http=build_throttled_http())
+    service = services[account.name] = build_youtube_service(http=http)
+    return service
+
+
+def parse_arguments():
+    """
+    Parses command line arguments.
+
+    Returns:
+        argparse.Namespace: Parsed arguments
+    """
+    parser = argparse.ArgumentParser(description='YouTube Uploader')
+    parser.add_argument('-s', '--setup', action='store_true', help='Run interactive setup')
+    parser.add_argument('--reauth', action='store_true', help='Force re-authentication by deleting the token file')
+    parser.add_argument('--account', help='Account used by --setup and --reauth (see data/accounts.json)')
+    parser.add_argument('-r', '--run-once', action='store_true', help='Run once and exit (don\'t start scheduler)')
+    parser.add_argument('-i', '--interval', type=int, help='Set scan interval in minutes')
+    parser.add_argument('-f', '--folder', type=str, help='Set videos folder path')
+    parser.add_argument('-g', '--ganymede', action='store_true', help='Enable Ganymede mode for VOD metadata')
+    parser.add_argument('-p', '--auto-playlist', action='store_true', help='Auto-add videos to channel playlists')
+    parser.add_argument('-j', '--parallel', type=int, help='Number of videos to upload in parallel')
+    parser.add_argument('-w', '--watch', action='store_true', help='Watch the videos folder with inotify between scans')
+    parser.add_argument('--queue-policy', type=str, choices=sorted(QUEUE_POLICIES),
+                        help='Upload order: fifo, newest, smallest, round_robin or deadline')
+    parser.add_argument('--show-queue', action='store_true', help='Print the upload queue saved by the running uploader and exit')
+    parser.add_argument('--status', action='store_true', help='Print the remaining API quota and exit')
+    return parser.parse_args()
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class Config:
+    """
+    Application configuration, built once at startup.
+
+    The object is immutable: a SIGHUP reload builds a new Config, while
+    uploads already running keep the instance they were started with.
+    """
+    videos_folder: str = ''
+    privacy_status: str = 'private'
+    check_interval: int = 60
+    client_secrets: str = 'data/client_secrets.json'
+    video_category: str = '22'
+    description: str = 'Uploaded with YTU'
+    tags: tuple = ('YTU Upload',)
+    ganymede_mode: bool = False
+    auto_playlist: bool = False
+    discord_webhook: str = ''
+    max_parallel_uploads: int = 1
+    max_upload_rate: float = 0.0
+    max_worker_upload_rate: float = 0.0
+    upload_rate_schedule: tuple = ()
+    max_daily_uploads: int = 0
+    chunk_size_mb: float = 0.0
+    max_chunk_size_mb: float = 128.0
+    upload_max_retries: int = 10
+    upload_retry_deadline: float = 30.0
+    watch_mode: bool = False
+    scan_cache: bool = True
+    stability_seconds: int = 60
+    check_moov: bool = False
+    playlist_cache_ttl: float = 24.0
+    health_check_interval: float = 30.0
+    queue_policy: str = 'fifo'
+    upload_deadline_hours: float = 24.0
+    daily_quota: int = DEFAULT_DAILY_QUOTA
+    metrics_port: int = 0
+    log_format: str = 'text'
+    log_level: str = 'INFO'
+    log_progress_interval: float = 30.0
+    content_dedup: bool = True
+    full_hash: bool = False
+    mmap_upload: bool = False
+
+
+def load_config_file(config_file):
+    """
+    Lit un fichier de configuration au format KEY=VALUE (une variable YTU_* par ligne).
+
+    Args:
+        config_file (str): Chemin du fichier
+
+    Returns:
+        dict: Variables lues (vide si le fichier n'existe pas)
+    """
+    settings = {}
+    if not config_file or not os.path.exists(config_file):
+        return settings
+
+    try:
+        with open(config_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith('#') or '=' not in line:
+                    continue
+                key, value = line.split('=', 1)
+                settings[key.strip()] = value.strip().strip('"').strip("'")
+    except Exception as e:
+        logger.error(f"Error reading config file {config_file}: {e}")
+    return settings
+
+
+def get_config(args=None):
+    """
+    Gets the application configuration from environment variables and command line arguments.
+
+    Values from the optional YTU_CONFIG_FILE (default data/config.env) override
+    the environment, so they can be changed at runtime and reloaded with SIGHUP.
+
+    Args:
+        args (argparse.Namespace, optional): Parsed command line arguments
+
+    Returns:
+        Config: Application configuration
+    """
+    env = dict(os.environ)
+    env.update(load_config_file(env.get('YTU_CONFIG_FILE', CONFIG_FILE)))
+
+    config = {
+        'videos_folder': env.get('YTU_VIDEOS_FOLDER', ''),
+        'privacy_status': env.get('YTU_PRIVACY_STATUS', 'private'),
+        'check_interval': int(env.get('YTU_CHECK_INTERVAL', '60')),
+        'client_secrets': env.get('YTU_CLIENT_SECRETS', 'data/client_secrets.json'),
+        'video_category': env.get('YTU_VIDEO_CATEGORY', '22'),
+        'description': env.get('YTU_DESCRIPTION', 'Uploaded with YTU'),
+        'tags': tuple(env.get('YTU_TAGS', 'YTU Upload').split(',')),
+        'ganymede_mode': env.get('YTU_GANYMEDE_MODE', 'false').lower() == 'true',
+        'auto_playlist': env.get('YTU_AUTO_PLAYLIST', 'false').lower() == 'true',
+        'discord_webhook': env.get('YTU_DISCORD_WEBHOOK', ''),
+        'max_parallel_uploads': max(1, int(env.get('YTU_MAX_PARALLEL_UPLOADS', '1'))),
+        'max_upload_rate': float(env.get('YTU_MAX_UPLOAD_RATE', '0')),
+        'max_worker_upload_rate': float(env.get('YTU_MAX_WORKER_UPLOAD_RATE', '0')),
+        'upload_rate_schedule': parse_rate_schedule(env.get('YTU_UPLOAD_RATE_SCHEDULE', '')),
+        'max_daily_uploads': int(env.get('YTU_MAX_DAILY_UPLOADS', '0')),
+        'chunk_size_mb': float(env.get('YTU_CHUNK_SIZE_MB', '0')),
+        'max_chunk_size_mb': float(env.get('YTU_MAX_CHUNK_SIZE_MB', '128')),
+        'upload_max_retries': int(env.get('YTU_UPLOAD_MAX_RETRIES', '10')),
+        'upload_retry_deadline': float(env.get('YTU_UPLOAD_RETRY_DEADLINE', '30')),
+        'watch_mode': env.get('YTU_WATCH_MODE', 'false').lower() == 'true',
+        'scan_cache': env.get('YTU_SCAN_CACHE', 'true').lower() == 'true',
+        'stability_seconds': int(env.get('YTU_STABILITY_SECONDS', '60')),
+        'check_moov': env.get('YTU_CHECK_MOOV', 'false').lower() == 'true',
+        'playlist_cache_ttl': float(env.get('YTU_PLAYLIST_CACHE_TTL', '24')),
+        'health_check_interval': float(env.get('YTU_HEALTH_CHECK_INTERVAL', '30')),
+        'queue_policy': env.get('YTU_QUEUE_POLICY', 'fifo').lower(),
+        'upload_deadline_hours': float(env.get('YTU_UPLOAD_DEADLINE_HOURS', '24')),
+        'daily_quota': int(env.get('YTU_DAILY_QUOTA', DEFAULT_DAILY_QUOTA)),
+        'metrics_port': int(env.get('YTU_METRICS_PORT', '0')),
+        'log_format': env.get('YTU_LOG_FORMAT', 'text').lower(),
+        'log_level': env.get('YTU_LOG_LEVEL', 'INFO').upper(),
+        'log_progress_interval': float(env.get('YTU_LOG_PROGRESS_INTERVAL', '30')),
+        'content_dedup': env.get('YTU_CONTENT_DEDUP', 'true').lower() == 'true',
+        'full_hash': env.get('YTU_FULL_HASH', 'false').lower() == 'true',
+        'mmap_upload': env.get('YTU_MMAP_UPLOAD', 'false').lower() == 'true'
+    }
+
+    # Override with command line arguments if provided
+    if args is not None:
+        if args.interval:
+            config['check_interval'] = args.interval
+        if args.folder:
+            config['videos_folder'] = args.folder
+        if args.ganymede:
+            config['ganymede_mode'] = True
+        if args.auto_playlist:
+            config['auto_playlist'] = True
+        if args.parallel:
+            config['max_parallel_uploads'] = max(1, args.parallel)
+        if args.watch:
+            config['watch_mode'] = True
+        if args.queue_policy:
+            config['queue_policy'] = args.queue_policy
+
+    return Config(**config)
+
+
+_reload_requested = threading.Event()
+
+
+def _handle_sighup(signum, frame):
+    """
+    Signal handler: asks the scheduler to reload its configuration.
+    """
+    _reload_requested.set()
+
+
+def reload_config(config, args):
+    """
+    Builds a new configuration and reports what changed.
+
+    Args:
+        config (Config): Current configuration
+        args (argparse.Namespace): Parsed command line arguments
+
+    Returns:
+        Config: New configuration (the current one if the reload failed)
+    """
+    try:
+        new_config = get_config(args)
+    except Exception as e:
+        logger.error(f"Error reloading configuration, keeping the current one: {e}")
+        return config
+
+    changes = [field.name for field in dataclasses.fields(Config)
+               if getattr(config, field.name) != getattr(new_config, field.name)]
+    if changes:
+        logger.info(f"Configuration reloaded, changed: {', '.join(changes)}")
+    else:
+        logger.info("Configuration reloaded, no changes")
+    return new_config
+
+
+def apply_runtime_config(config):
+    """
+    Pushes configuration values into the long-lived shared components.
+
+    Args:
+        config (Config): Application configuration
+    """
+    setup_logging(config.log_format, config.log_level)
+    ledger = get_ledger()
+    ledger.content_dedup = config.content_dedup
+    ledger.full_hash = config.full_hash
+    load_accounts()
+    for account in get_accounts():
+        account.get_playlist_cache(config)
+        account.get_quota_ledger(config)
+        account.health.check_interval = timedelta(minutes=config.health_check_interval)
+    # Les routes chaîne -> compte ont pu changer
+    if _upload_queue is not None:
+        _upload_queue.reroute()
+
+
+def is_video_candidate(filename, config):
+    """
+    Checks whether a file name matches the videos handled by the uploader.
+
+    Args:
+        filename (str): File name (without directory)
+        config (Config): Application configuration
+
+    Returns:
+        bool: True if the file should be uploaded
+    """
+    # In Ganymede mode, look specifically for *-video.mp4 files
+    if config.ganymede_mode:
+        return filename.endswith('-video.mp4')
+    # Standard mode - look for all .mp4 files
+    return filename.endswith('.mp4')
+
+
+class ScanCache:
+    """
+    Cache du scan incrémental, persisté dans data/scan_cache.json.
+
+    Pour chaque dossier, on garde son mtime, ses sous-dossiers et les vidéos
+    candidates qu'il contient. Un dossier dont le mtime n'a pas changé n'est
+    pas relu : seul un stat() est nécessaire. Le mtime d'un dossier change dès
+    qu'une entrée y est ajoutée, supprimée ou renommée.
+    """
+
+    # Un mtime trop récent peut encore changer dans la même seconde sur les
+    # systèmes de fichiers à faible résolution (NFS, SMB) : on ne s'y fie pas
+    MTIME_GRACE_SECONDS = 2
+
+    def __init__(self, cache_file=SCAN_CACHE_FILE):
+        """
+        Args:
+            cache_file (str): Fichier de persistance du cache
+        """
+        self.cache_file = cache_file
+        self._key = None
+        self._dirs = {}
+        self.last_stats = {'listed': 0, 'skipped': 0, 'files': 0, 'duration': 0.0}
+
+        if os.path.exists(cache_file):
+            try:
+                with open(cache_file, 'r') as f:
+                    state = json.load(f)
+                self._key = state.get('key')
+                self._dirs = state.get('dirs', {})
+            except Exception as e:
+                logger.error(f"Error loading scan cache: {e}")
+
+    def _save(self):
+        tmp_file = self.cache_file + '.tmp'
+        try:
+            with open(tmp_file, 'w') as f:
+                json.dump({'key': self._key, 'dirs': self._dirs}, f)
+            os.replace(tmp_file, self.cache_file)
+        except Exception as e:
+            logger.error(f"Error saving scan cache: {e}")
+
+    @staticmethod
+    def _list_directory(directory, config):
+        subdirs = []
+        files = []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir():
+                        # Comme os.walk : ne pas suivre les liens symboliques
+                        if entry.name != 'temp' and not entry.is_symlink():
+                            subdirs.append(entry.name)
+                    elif is_video_candidate(entry.name, config):
+                        files.append(entry.name)
+                except OSError:
+                    continue
+        return subdirs, files
+
+    def scan(self, config):
+        """
+        Parcourt le dossier des vidéos en ne relisant que les dossiers modifiés.
+
+        Args:
+            config (Config): Application configuration
+
+        Returns:
+            list: List of video paths to upload
+        """
+        started = time.monotonic()
+        videos_folder = config.videos_folder
+        key = [os.path.abspath(videos_folder), bool(config.ganymede_mode)]
+        if key != self._key:
+            # Dossier ou mode différent : le cache n'est plus valable
+            self._key = key
+            self._dirs = {}
+
+        now = time.time()
+        new_dirs = {}
+        videos = []
+        listed = skipped = 0
+        stack = [videos_folder]
+
+        while stack:
+            directory = stack.pop()
+            try:
+                mtime_ns = os.stat(directory).st_mtime_ns
+            except OSError:
+                continue
+
+            entry = self._dirs.get(directory)
+            if entry and entry['mtime'] == mtime_ns:
+                skipped += 1
+                subdirs, files = entry['dirs'], entry['files']
+            else:
+                try:
+                    subdirs, files = self._list_directory(directory, config)
+                except OSError as e:
+                    logger.error(f"Error listing {directory}: {e}")
+                    continue
+                listed += 1
+
+            # Un mtime très récent sera vérifié à nouveau au prochain scan
+            trusted_mtime = mtime_ns if now - mtime_ns / 1e9 > self.MTIME_GRACE_SECONDS else None
+            new_dirs[directory] = {'mtime': trusted_mtime, 'dirs': subdirs, 'files': files}
+
+            videos.extend(os.path.join(directory, file) for file in files)
+            # Même ordre que os.walk : fichiers du dossier puis sous-dossiers
+            stack.extend(os.path.join(directory, subdir) for subdir in reversed(subdirs))
+
+        changed = listed > 0 or len(new_dirs) != len(self._dirs)
+        self._dirs = new_dirs
+        if changed:
+            self._save()
+
+        self.last_stats = {
+            'listed': listed,
+            'skipped': skipped,
+            'files': len(videos),
+            'duration': time.monotonic() - started
+        }
+        return videos
+
+
+_scan_cache = None
+
+
+def get_scan_cache():
+    """
+    Retourne le cache de scan partagé par le processus.
+
+    Returns:
+        ScanCache: Cache du scan incrémental
+    """
+    global _scan_cache
+    if _scan_cache is None:
+        _scan_cache = ScanCache()
+    return _scan_cache
+
+
+def scan_for_videos(config):
+    """
+    Scans the configured folder for videos to upload.
+
+    Args:
+        config (Config): Application configuration
+
+    Returns:
+        list: List of video paths to upload
+    """
+    videos_folder = config.videos_folder
+    if not os.path.exists(videos_folder):
+        logger.warning(f"Videos folder not found: {videos_folder}")
+        return []
+
+    # Scan incrémental : seuls les dossiers modifiés sont relus
+    if config.scan_cache:
+        cache = get_scan_cache()
+        videos_to_upload = cache.scan(config)
+        stats = cache.last_stats
+        logger.info(f"Scan: {stats['listed']} folders re-listed, {stats['skipped']} unchanged folders skipped, "
+                    f"{stats['files']} videos found in {stats['duration']:.2f}s")
+        get_metrics().set('ytu_scan_duration_seconds', stats['duration'])
+        get_metrics().set('ytu_scan_videos', len(videos_to_upload))
+        return videos_to_upload
+
+    scan_started = time.monotonic()
+    videos_to_upload = []
+
+    for root, dirs, files in os.walk(videos_folder):
+        # Exclure le dossier 'temp'
+        if 'temp' in dirs:
+            dirs.remove('temp')
+        for file in files:
+            if is_video_candidate(file, config):
+                videos_to_upload.append(os.path.join(root, file))
+
+    get_metrics().set('ytu_scan_duration_seconds', time.monotonic() - scan_started)
+    get_metrics().set('ytu_scan_videos', len(videos_to_upload))
+    return videos_to_upload
+
+
+def has_moov_atom(video_path):
+    """
+    Vérifie que le fichier mp4 contient un atome 'moov' complet au premier niveau.
+
+    Un enregistrement interrompu ou encore en cours d'écriture n'a souvent pas
+    encore son atome 'moov' (index de la vidéo) : YouTube ne pourrait pas le lire.
+
+    Args:
+        video_path (str): Chemin vers le fichier vidéo
+
+    Returns:
+        bool: True si l'atome 'moov' est présent
+    """
+    try:
+        file_size = os.path.getsize(video_path)
+        with open(video_path, 'rb') as f:
+            offset = 0
+            while offset + 8 <= file_size:
+                f.seek(offset)
+                header = f.read(8)
+                if len(header) < 8:
+                    return False
+                box_size, box_type = struct.unpack('>I4s', header)
+                if box_size == 1:
+                    # Taille sur 64 bits juste après l'en-tête
+                    large_size = f.read(8)
+                    if len(large_size) < 8:
+                        return False
+                    box_size = struct.unpack('>Q', large_size)[0]
+                elif box_size == 0:
+                    # La boîte s'étend jusqu'à la fin du fichier
+                    box_size = file_size - offset
+                if box_size < 8 or offset + box_size > file_size:
+                    return False
+                if box_type == b'moov':
+                    return True
+                offset += box_size
+    except OSError as e:
+        logger.error(f"Error reading {video_path}: {e}")
+    return False
+
+
+class FileStabilityGate:
+    """
+    Écarte les fichiers encore en cours d'écriture ou de déplacement.
+
+    Un fichier n'est uploadé que lorsque sa taille et son mtime n'ont pas
+    changé depuis quiet_seconds. Les observations sont gardées en mémoire d'un
+    cycle à l'autre : aucun appel API supplémentaire n'est nécessaire.
+    """
+
+    # Les observations de fichiers disparus sont oubliées au bout d'un jour
+    FORGET_AFTER_SECONDS = 24 * 3600
+
+    def __init__(self, quiet_seconds=60, check_moov=False):
+        """
+        Args:
+            quiet_seconds (float): Durée sans modification requise
+            check_moov (bool): Exiger la présence de l'atome mp4 'moov'
+        """
+        self.quiet_seconds = quiet_seconds
+        self.check_moov = check_moov
+        self._lock = threading.Lock()
+        # chemin -> (taille, mtime_ns, stable depuis, vu pour la dernière fois)
+        self._observations = {}
+
+    def filter_stable(self, video_paths):
+        """
+        Retourne les vidéos stables ; les autres seront réexaminées plus tard.
+
+        Args:
+            video_paths (list): Chemins des vidéos candidates
+
+        Returns:
+            list: Chemins des vidéos prêtes à être uploadées
+        """
+        now = time.time()
+        stable = []
+        with self._lock:
+            for video_path in video_paths:
+                try:
+                    stat = os.stat(video_path)
+                except OSError:
+                    self._observations.pop(video_path, None)
+                    continue
+
+                previous = self._observations.get(video_path)
+                if previous is None:
+                    # Première observation : le mtime indique depuis quand le fichier n'a pas bougé
+                    since = stat.st_mtime
+                elif previous[0] != stat.st_size or previous[1] != stat.st_mtime_ns:
+                    # Le fichier a changé depuis le dernier passage
+                    since = now
+                else:
+                    since = previous[2]
+                self._observations[video_path] = (stat.st_size, stat.st_mtime_ns, since, now)
+
+                if now - since < self.quiet_seconds:
+                    logger.debug(f"Waiting for {video_path} to stop changing "
+                                 f"({int(now - since)}s/{int(self.quiet_seconds)}s quiet)")
+                    continue
+                if self.check_moov and not has_moov_atom(video_path):
+                    logger.warning(f"Skipping {video_path}: mp4 'moov' atom not found (incomplete file?)")
+                    continue
+                stable.append(video_path)
+
+            for video_path in [path for path, obs in self._observations.items()
+                               if now - obs[3] > self.FORGET_AFTER_SECONDS]:
+                del self._observations[video_path]
+
+        return stable
+
+    def pending_delay(self, video_paths):
+        """
+        Durée avant que la prochaine vidéo en attente puisse devenir stable.
+
+        Args:
+            video_paths (iterable): Chemins des vidéos en attente
+
+        Returns:
+            float: Délai en secondes, ou None si aucune vidéo n'est suivie
+        """
+        now = time.time()
+        with self._lock:
+            delays = [self.quiet_seconds - (now - self._observations[path][2])
+                      for path in video_paths if path in self._observations]
+        if not delays:
+            return None
+        return max(1.0, min(delays))
+
+
+_stability_gate = None
+
+
+def get_stability_gate(config):
+    """
+    Retourne le filtre de stabilité partagé par le processus.
+
+    Args:
+        config (Config): Application configuration
+
+    Returns:
+        FileStabilityGate: Filtre de stabilité
+    """
+    global _stability_gate
+    if _stability_gate is None:
+        _stability_gate = FileStabilityGate()
+    _stability_gate.quiet_seconds = config.stability_seconds
+    _stability_gate.check_moov = config.check_moov
+    return _stability_gate
+
+
+def filter_stable_videos(video_paths, config):
+    """
+    Removes videos that are still being written or moved.
+
+    Args:
+        video_paths (list): Candidate video paths
+        config (Config): Application configuration
+
+    Returns:
+        list: Paths of the videos ready to be uploaded
+    """
+    stable = get_stability_gate(config).filter_stable(video_paths)
+    if len(stable) < len(video_paths):
+        logger.warning(f"{len(video_paths) - len(stable)} videos are not stable yet and will be checked again later")
+    return stable
+
+
+class InotifyWatcher:
+    """
+    Surveille récursivement le dossier des vidéos avec inotify (Linux).
+
+    Les fichiers vidéo terminés (fermés après écriture ou déplacés dans
+    l'arborescence) sont signalés en quelques secondes, sans parcourir tout
+    le dossier. Les dossiers 'temp' sont ignorés comme dans scan_for_videos().
+    """
+
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE_SELF = 0x00000400
+    IN_MOVE_SELF = 0x00000800
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ONLYDIR = 0x01000000
+    IN_ISDIR = 0x40000000
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+
+    WATCH_MASK = (IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_MOVED_FROM
+                  | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+    EVENT_HEADER = struct.Struct('iIII')
+
+    def __init__(self, config, settle_seconds=2.0):
+        """
+        Initialise inotify et pose une surveillance sur chaque sous-dossier.
+
+        Args:
+            config (Config): Application configuration
+            settle_seconds (float): Délai de regroupement des événements
+
+        Raises:
+            OSError: Si inotify n'est pas disponible sur ce système
+        """
+        self.config = config
+        self.settle_seconds = settle_seconds
+        self.overflowed = False
+        self._watches = {}
+
+        libc_name = ctypes.util.find_library('c') or 'libc.so.6'
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self._libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._fd = self._libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"inotify_init1 failed: {os.strerror(errno)}")
+
+        self._add_tree(config.videos_folder)
+
+    @property
+    def watch_count(self):
+        """
+        Nombre de dossiers actuellement surveillés.
+        """
+        return len(self._watches)
+
+    def close(self):
+        """
+        Ferme le descripteur inotify.
+        """
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def _add_watch(self, path):
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), self.WATCH_MASK)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"inotify_add_watch failed for {path}: {os.strerror(errno)}")
+        self._watches[wd] = path
+
+    def _add_tree(self, root):
+        """
+        Surveille un dossier et ses sous-dossiers.
+
+        Args:
+            root (str): Dossier à surveiller
+
+        Returns:
+            list: Vidéos déjà présentes dans l'arborescence ajoutée
+        """
+        found = []
+        for current, dirs, files in os.walk(root):
+            # Exclure le dossier 'temp'
+            if 'temp' in dirs:
+                dirs.remove('temp')
+            self._add_watch(current)
+            for file in files:
+                if is_video_candidate(file, self.config):
+                    found.append(os.path.join(current, file))
+        return found
+
+    def _read_events(self):
+        """
+        Lit les événements disponibles et retourne les vidéos terminées.
+
+        Returns:
+            list: Chemins des vidéos créées ou déplacées
+        """
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        found = []
+        offset = 0
+        while offset + self.EVENT_HEADER.size <= len(data):
+            wd, mask, _cookie, name_len = self.EVENT_HEADER.unpack_from(data, offset)
+            offset += self.EVENT_HEADER.size
+            name = data[offset:offset + name_len].rstrip(b'\0')
+            offset += name_len
+
+            if mask & self.IN_Q_OVERFLOW:
+                # Des événements ont été perdus : un scan complet est nécessaire
+                self.overflowed = True
+                continue
+
+            if mask & self.IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+
+            directory = self._watches.get(wd)
+            if directory is None or not name:
+                continue
+            path = os.path.join(directory, os.fsdecode(name))
+
+            if mask & self.IN_ISDIR:
+                # Nouveau dossier (créé ou déplacé) : le surveiller à son tour
+                if mask & (self.IN_CREATE | self.IN_MOVED_TO) and os.path.basename(path) != 'temp':
+                    try:
+                        found.extend(self._add_tree(path))
+                    except OSError as e:
+                        logger.error(f"Unable to watch new folder {path}: {e}")
+                continue
+
+            if mask & (self.IN_CLOSE_WRITE | self.IN_MOVED_TO) and is_video_candidate(os.path.basename(path), self.config):
+                found.append(path)
+
+        return found
+
+    def wait_for_videos(self, timeout):
+        """
+        Attend l'arrivée de nouvelles vidéos.
+
+        Dès qu'une vidéo est détectée, les événements sont encore collectés
+        pendant settle_seconds pour traiter les arrivées groupées en un seul lot.
+
+        Args:
+            timeout (float): Durée maximale d'attente en secondes
+
+        Returns:
+            list: Chemins des vidéos détectées (sans doublons), vide si timeout
+        """
+        found = []
+        deadline = time.monotonic() + max(0, timeout)
+        while True:
+            remaining = deadline - time.monotonic()
+            if found:
+                remaining = min(remaining, self.settle_seconds)
+            if remaining <= 0:
+                break
+
+            readable, _, _ = select.select([self._fd], [], [], remaining)
+            if not readable:
+                if found:
+                    break
+                continue
+            found.extend(self._read_events())
+            if self.overflowed:
+                break
+
+        return list(dict.fromkeys(found))
+
+
+def create_folder_watcher(config):
+    """
+    Crée le watcher inotify si le mode watch est activé.
+
+    Args:
+        config (Config): Application configuration
+
+    Returns:
+        InotifyWatcher: Watcher actif, ou None (scan périodique uniquement)
+    """
+    if not config.watch_mode:
+        return None
+    if not sys.platform.startswith('linux'):
+        logger.warning("Watch mode requires Linux inotify, falling back to periodic scans")
+        return None
+    if not os.path.isdir(config.videos_folder):
+        logger.warning(f"Videos folder not found: {config.videos_folder}")
+        return None
+
+    try:
+        watcher = InotifyWatcher(config)
+    except OSError as e:
+        logger.warning(f"Unable to start folder watcher ({e}), falling back to periodic scans")
+        return None
+
+    logger.info(f"Watching {watcher.watch_count} folders for new videos")
+    return watcher
+
+
+def _parse_iso_timestamp(value):
+    """
+    Convertit une date ISO (Ganymede) en timestamp Unix.
+
+    Args:
+        value (str): Date au format ISO 8601
+
+    Returns:
+        float: Timestamp Unix, ou None si la date est invalide
+    """
+    if not value:
+        return None
+    try:
+        return datetime.datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+def describe_queue_entry(video_path, config):
+    """
+    Collecte les informations utiles à l'ordonnancement d'une vidéo.
+
+    Args:
+        video_path (str): Chemin vers le fichier vidéo
+        config (Config): Application configuration
+
+    Returns:
+        dict: {'path', 'channel', 'size', 'created_at'}
+    """
+    channel_name = extract_channel_name(video_path)
+    created_at = None
+    if config.ganymede_mode:
+        channel_name = get_channel_display_name(video_path, channel_name)
+        record = load_ganymede_record(video_path)
+        if record:
+            created_at = _parse_iso_timestamp(record.created_at)
+
+    try:
+        stat = os.stat(video_path)
+        size = stat.st_size
+        if created_at is None:
+            created_at = stat.st_mtime
+    except OSError:
+        size = 0
+
+    return {
+        'path': video_path,
+        'channel': channel_name or '',
+        'size': size,
+        'created_at': created_at or 0
+    }
+
+
+def _policy_fifo(entries, config):
+    return list(entries)
+
+
+def _policy_newest(entries, config):
+    return sorted(entries, key=lambda entry: entry['created_at'], reverse=True)
+
+
+def _policy_smallest(entries, config):
+    return sorted(entries, key=lambda entry: entry['size'])
+
+
+def _policy_round_robin(entries, config):
+    # Une vidéo par chaîne à tour de rôle, la plus récente d'abord dans chaque chaîne
+    by_channel = collections.OrderedDict()
+    for entry in _policy_newest(entries, config):
+        by_channel.setdefault(entry['channel'], collections.deque()).append(entry)
+
+    ordered = []
+    while by_channel:
+        for channel in list(by_channel):
+            ordered.append(by_channel[channel].popleft())
+            if not by_channel[channel]:
+                del by_channel[channel]
+    return ordered
+
+
+def _policy_deadline(entries, config):
+    # Les vidéos encore dans leur délai passent d'abord, la plus urgente en tête ;
+    # les vidéos déjà en retard (archives) suivent, les plus récentes d'abord
+    now = time.time()
+    deadline_seconds = config.upload_deadline_hours * 3600
+    on_time = [entry for entry in entries if entry['created_at'] + deadline_seconds >= now]
+    overdue = [entry for entry in entries if entry['created_at'] + deadline_seconds < now]
+    return (sorted(on_time, key=lambda entry: entry['created_at'])
+            + _policy_newest(overdue, config))
+
+
+QUEUE_POLICIES = {
+    'fifo': _policy_fifo,
+    'newest': _policy_newest,
+    'smallest': _policy_smallest,
+    'round_robin': _policy_round_robin,
+    'deadline': _policy_deadline,
+}
+
+
+def register_queue_policy(name, policy):
+    """
+    Ajoute une politique d'ordonnancement utilisable via YTU_QUEUE_POLICY.
+
+    Args:
+        name (str): Nom de la politique
+        policy (callable): Fonction (entries, config) -> entries triées
+    """
+    QUEUE_POLICIES[name] = policy
+
+
+_unknown_queue_policies = set()
+
+
+def order_upload_queue(entries, config):
+    """
+    Orders queue entries according to the configured queue policy.
+
+    Args:
+        entries (list): Entries built by describe_queue_entry()
+        config (Config): Application configuration
+
+    Returns:
+        list: Entries in upload order
+    """
+    policy = QUEUE_POLICIES.get(config.queue_policy)
+    if policy is None:
+        if config.queue_policy not in _unknown_queue_policies:
+            _unknown_queue_policies.add(config.queue_policy)
+            logger.warning(f"Unknown queue policy '{config.queue_policy}', using fifo")
+        policy = _policy_fifo
+    return policy(entries, config)
+
+
+class UploadQueue:
+    """
+    File d'attente des uploads, alimentée au fil de l'eau par le scan complet
+    et par le watcher.
+
+    Chaque upload (ou chaque worker libre) prend la prochaine vidéo selon la
+    politique d'ordonnancement : une VOD arrivée pendant un lot passe devant
+    l'arriéré si la politique le veut. Chaque vidéo est routée vers son compte
+    une seule fois, à l'ajout, et l'ordre d'envoi de chaque compte est gardé
+    en cache : il n'est recalculé qu'après de nouvelles arrivées ou au bout de
+    QUEUE_REORDER_INTERVAL secondes (politiques dépendant de l'heure).
+
+    Les vidéos en attente et en cours d'upload sont persistées dans
+    data/queue.json (affiché par --show-queue), au plus toutes les
+    QUEUE_SAVE_INTERVAL secondes et à la fin de chaque lot, puis reprises au
+    démarrage suivant après une nouvelle vérification de stabilité.
+    """
+
+    def __init__(self, state_file=UPLOAD_QUEUE_FILE):
+        """
+        Args:
+            state_file (str): Fichier de persistance de la file
+        """
+        self.state_file = state_file
+        # Source d'arrivées interrogée avant chaque upload (WatcherFeed), si le mode watch est actif
+        self.feed = None
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._config = None
+        self._entries = {}
+        self._uploading = {}
+        self._added = 0
+        # chemin -> nom du compte cible, calculé une fois par vidéo
+        self._routes = {}
+        self._counts = collections.Counter()
+        # nom du compte (None : tous) -> (politique, date de calcul, deque des chemins dans l'ordre d'envoi)
+        self._orders = {}
+        # Vidéos reprises de data/queue.json, à router et à revérifier avant l'envoi
+        self._restored = set()
+        self._unrouted = []
+        self._dirty = False
+        self._saved_at = 0
+
+        if os.path.exists(state_file):
+            try:
+                with open(state_file, 'r') as f:
+                    state = json.load(f)
+                # Les uploads interrompus par l'arrêt repassent en attente
+                for entry in state.get('uploading', []) + state.get('items', []):
+                    self._entries[entry['path']] = entry
+                self._restored = set(self._entries)
+                self._unrouted = list(self._entries)
+                if self._entries:
+                    logger.info(f"Restored {len(self._entries)} queued videos")
+            except Exception as e:
+                logger.error(f"Error loading upload queue: {e}")
+
+    @property
+    def added_count(self):
+        """
+        Returns:
+            int: Nombre total de vidéos ajoutées (détecte les arrivées pendant un lot)
+        """
+        with self._lock:
+            return self._added
+
+    def _route_pending(self):
+        # Appelé avec le verrou : routage des vidéos reprises au démarrage
+        # (les comptes ne sont pas encore chargés quand la file est créée)
+        for video_path in self._unrouted:
+            if video_path in self._entries:
+                account_name = self._routes[video_path] = route_video(video_path).name
+                self._counts[account_name] += 1
+        self._unrouted = []
+
+    def _changed(self):
+        # Appelé avec le verrou
+        self._dirty = True
+        get_metrics().set('ytu_queue_depth', len(self._entries))
+
+    def reroute(self):
+        """
+        Recalcule le compte cible de chaque vidéo (après un rechargement des comptes).
+        """
+        with self._lock:
+            self._routes = {}
+            self._counts = collections.Counter()
+            self._orders = {}
+            self._unrouted = list(self._entries)
+            self._route_pending()
+
+    def add(self, video_paths, config):
+        """
+        Fusionne des vidéos dans la file (celles déjà en file ou en cours d'upload sont ignorées).
+
+        Args:
+            video_paths (list): Chemins des vidéos à uploader
+            config (Config): Application configuration
+
+        Returns:
+            int: Nombre de vidéos ajoutées
+        """
+        with self._lock:
+            self._config = config
+            new_paths = [path for path in dict.fromkeys(video_paths)
+                         if path not in self._entries and path not in self._uploading]
+        # Lecture des métadonnées et routage hors du verrou
+        entries = [(describe_queue_entry(path, config), route_video(path).name) for path in new_paths]
+        with self._lock:
+            added = 0
+            for entry, account_name in entries:
+                video_path = entry['path']
+                if video_path in self._entries or video_path in self._uploading:
+                    continue
+                self._entries[video_path] = entry
+                if video_path not in self._routes:
+                    self._routes[video_path] = account_name
+                    self._counts[account_name] += 1
+                # L'ordre d'envoi de ce compte sera recalculé au prochain pop()
+                self._orders.pop(self._routes[video_path], None)
+                self._orders.pop(None, None)
+                added += 1
+            self._added += added
+            if added:
+                self._changed()
+        self.save()
+        return added
+
+    def _dispatch_order(self, account_name, config):
+        # Appelé avec le verrou : ordre d'envoi en cache, recalculé si périmé
+        self._route_pending()
+        cached = self._orders.get(account_name)
+        if (cached is None or cached[0] != config.queue_policy
+                or time.monotonic() - cached[1] >= QUEUE_REORDER_INTERVAL):
+            entries = [entry for path, entry in self._entries.items()
+                       if account_name is None or self._routes[path] == account_name]
+            order = collections.deque(entry['path'] for entry in order_upload_queue(entries, config))
+            cached = self._orders[account_name] = (config.queue_policy, time.monotonic(), order)
+        return cached[2]
+
+    def _take(self, video_path):
+        # Appelé avec le verrou
+        entry = self._entries.pop(video_path)
+        self._counts[self._routes[video_path]] -= 1
+        self._changed()
+        return entry
+
+    def pop(self, config, account=None):
+        """
+        Retire de la file la prochaine vidéo à uploader selon la politique,
+        après avoir pris en compte les dernières arrivées du watcher.
+
+        Args:
+            config (Config): Application configuration
+            account (Account, optional): Ne prendre que les vidéos routées vers ce compte
+
+        Returns:
+            str: Chemin de la vidéo, ou None si la file est vide
+        """
+        if self.feed is not None:
+            self.feed.poll(config, WATCHER_POLL_TIMEOUT)
+        account_name = account.name if account is not None else None
+        while True:
+            with self._lock:
+                self._config = config
+                order = self._dispatch_order(account_name, config)
+                video_path = None
+                while order:
+                    path = order.popleft()
+                    # Chemin déjà pris via un autre index (compte / tous)
+                    if path in self._entries:
+                        video_path = path
+                        break
+                if video_path is None:
+                    return None
+                self._uploading[video_path] = self._take(video_path)
+                restored = video_path in self._restored
+                self._restored.discard(video_path)
+
+            # Vérifications hors du verrou : les autres workers ne les attendent pas
+            if not os.path.exists(video_path):
+                # Vidéo supprimée ou déplacée depuis son ajout : le prochain scan la retrouvera
+                self.done(video_path)
+                continue
+            if restored and not get_stability_gate(config).filter_stable([video_path]):
+                logger.info(f"Restored queue entry is not stable yet, leaving it to the next scan: {video_path}")
+                self.done(video_path)
+                continue
+            self.save()
+            return video_path
+
+    def done(self, video_path, requeue=False):
+        """
+        Signale la fin de l'upload d'une vidéo prise par pop().
+
+        Args:
+            video_path (str): Chemin de la vidéo
+            requeue (bool): Remettre la vidéo en file (upload reporté)
+        """
+        with self._lock:
+            entry = self._uploading.pop(video_path, None)
+            if requeue and entry is not None:
+                # Reprend sa place en tête, devant les vidéos qui la suivaient
+                self._entries = {video_path: entry, **self._entries}
+                account_name = self._routes.get(video_path)
+                if account_name is None:
+                    # Routes recalculées (reroute) pendant l'upload
+                    account_name = self._routes[video_path] = route_video(video_path).name
+                self._counts[account_name] += 1
+                for key in (account_name, None):
+                    if key in self._orders:
+                        self._orders[key][2].appendleft(video_path)
+            elif entry is not None:
+                self._routes.pop(video_path, None)
+            self._changed()
+        self.save()
+
+    def save(self, force=False):
+        """
+        Enregistre la file dans data/queue.json si elle a changé, au plus toutes
+        les QUEUE_SAVE_INTERVAL secondes sauf si force=True.
+
+        Args:
+            force (bool): Enregistrer sans attendre (fin de lot, arrêt)
+        """
+        with self._save_lock:
+            with self._lock:
+                if not self._dirty or (not force and time.monotonic() - self._saved_at < QUEUE_SAVE_INTERVAL):
+                    return
+                self._dirty = False
+                self._saved_at = time.monotonic()
+                config = self._config
+                entries = list(self._entries.values())
+                uploading = list(self._uploading.values())
+
+            # Tri et écriture hors du verrou de la file
+            if config is not None:
+                entries = order_upload_queue(entries, config)
+            tmp_file = self.state_file + '.tmp'
+            try:
+                with open(tmp_file, 'w') as f:
+                    json.dump({
+                        'policy': config.queue_policy if config else None,
+                        'updated_at': datetime.datetime.now().isoformat(),
+                        'uploading': uploading,
+                        'items': entries
+                    }, f, indent=2)
+                os.replace(tmp_file, self.state_file)
+            except Exception as e:
+                logger.error(f"Error saving upload queue: {e}")
+
+    def count(self, account=None):
+        """
+        Args:
+            account (Account, optional): Ne compter que les vidéos routées vers ce compte
+
+        Returns:
+            int: Nombre de vidéos en attente
+        """
+        with self._lock:
+            if account is None:
+                return len(self._entries)
+            self._route_pending()
+            return self._counts[account.name]
+
+    def count_by_account(self):
+        """
+        Returns:
+            dict: Nombre de vidéos en attente par compte cible
+        """
+        with self._lock:
+            self._route_pending()
+            counts = {}
+            for account_name, count in self._counts.items():
+                account = get_account(account_name) if count > 0 else None
+                if account is not None:
+                    counts[account] = count
+            return counts
+
+
+_upload_queue = None
+_upload_queue_lock = threading.Lock()
+
+
+def get_upload_queue():
+    """
+    Retourne la file d'attente des uploads du processus.
 
-    # Create the upload request
-    upload_request = youtube.videos().insert(
-        part=','.join(body.keys()),
-        body=body,
-        media_body=media
-    )
+    Returns:
+        UploadQueue: File d'attente
+    """
+    global _upload_queue
+    with _upload_queue_lock:
+        if _upload_queue is None:
+            _upload_queue = UploadQueue()
+        return _upload_queue
 
-    # Execute the upload
-    video_id = None
-    response = None
 
-    print(f"Uploading {video_path}...")
+class WatcherFeed:
+    """
+    Ajoute à la file d'uploads les vidéos signalées par le watcher, une fois stables.
 
-    try:
-        status, response = upload_request.next_chunk()
-        last_progress = -1  # Pour suivre le dernier pourcentage affiché
+    Interrogé par la boucle d'attente entre deux scans complets et, sans
+    attendre, avant chaque upload d'un lot en cours.
+    """
 
-        while response is None:
-            status, response = upload_request.next_chunk()
-            if status:
-                progress = int(status.progress() * 100)
-                # N'afficher que si le pourcentage a changé d'au moins 5%
-                if progress >= last_progress + 5 or progress == 100:
-                    print(f"Upload progress: {progress}%")
-                    last_progress = progress
+    def __init__(self, watcher):
+        """
+        Args:
+            watcher (InotifyWatcher): Watcher du dossier des vidéos
+        """
+        self.watcher = watcher
+        self._lock = threading.Lock()
+        # Vidéos signalées par le watcher mais pas encore stables
+        self._pending = []
+
+    def poll(self, config, timeout):
+        """
+        Collecte les vidéos signalées par le watcher et ajoute les vidéos stables à la file.
+
+        Args:
+            config (Config): Application configuration
+            timeout (float): Durée maximale d'attente en secondes
+
+        Returns:
+            int: Nombre de vidéos ajoutées à la file
+        """
+        # Un seul thread lit le watcher à la fois, les autres n'attendent pas
+        if not self._lock.acquire(blocking=False):
+            return 0
+        try:
+            gate = get_stability_gate(config)
+            pending_delay = gate.pending_delay(self._pending)
+            if pending_delay is not None:
+                timeout = min(timeout, pending_delay)
 
-        video_id = response['id']
-        print(f"Upload complete! Video ID: {video_id}")
+            videos = self.watcher.wait_for_videos(timeout)
+            if self.watcher.overflowed or not (videos or self._pending):
+                return 0
 
-        # Set thumbnail if provided
-        thumbnail_path = options.get('thumbnail_path')
-        if thumbnail_path and os.path.exists(thumbnail_path):
-            try:
-                youtube.thumbnails().set(
-                    videoId=video_id,
-                    media_body=MediaFileUpload(thumbnail_path)
-                ).execute()
-                print(f"Thumbnail set for video {video_id}")
-            except HttpError as e:
-                print(f"Error setting thumbnail: {e}")
+            candidates = filter_new_videos(list(dict.fromkeys(self._pending + videos)))
+            stable = gate.filter_stable(candidates)
+            self._pending = [path for path in candidates if path not in stable]
+            if not stable:
+                return 0
+            logger.info(f"Watcher detected {len(stable)} new videos.")
+            return get_upload_queue().add(stable, config)
+        finally:
+            self._lock.release()
 
-        return {
-            'success': True,
-            'video_id': video_id,
-            'title': body['snippet']['title']
-        }
 
-    except HttpError as e:
-        print(f"An HTTP error occurred: {e}")
-        return {
-            'success': False,
-            'error': str(e)
-        }
-    except Exception as e:
-        print(f"An error occurred: {e}")
-        return {
-            'success': False,
-            'error': str(e)
-        }
+def _print_queue_entry(prefix, entry):
+    created_at = datetime.datetime.fromtimestamp(entry['created_at']).strftime('%Y-%m-%d %H:%M')
+    print(f"{prefix} [{entry['channel']}] {created_at} "
+          f"{entry['size'] / 1024 / 1024 / 1024:.2f} GB  {entry['path']}")
 
 
-def find_playlist_by_name(youtube, playlist_name):
+def show_upload_queue(config):
     """
-    Recherche une playlist par son nom et retourne son ID.
+    Prints the upload queue saved by the running uploader, without scanning
+    or uploading anything.
 
     Args:
-        youtube: Service YouTube API
-        playlist_name (str): Nom de la playlist à rechercher
-
-    Returns:
-        str: ID de la playlist ou None si non trouvée
+        config (Config): Application configuration
     """
-    try:
-        request = youtube.playlists().list(
-            part="snippet,id",
-            mine=True,
-            maxResults=50
-        )
-        response = request.execute()
+    if not os.path.exists(UPLOAD_QUEUE_FILE):
+        print(f"Upload queue is empty ({UPLOAD_QUEUE_FILE} not written yet)")
+        return
+    with open(UPLOAD_QUEUE_FILE, 'r') as f:
+        state = json.load(f)
 
-        for item in response.get("items", []):
-            if item["snippet"]["title"].lower() == playlist_name.lower():
-                return item["id"]
-
-        # Si la playlist n'est pas trouvée dans les 50 premiers résultats
-        # et qu'il y a un nextPageToken, continuer la recherche
-        next_page_token = response.get("nextPageToken")
-        while next_page_token:
-            request = youtube.playlists().list(
-                part="snippet,id",
-                mine=True,
-                maxResults=50,
-                pageToken=next_page_token
-            )
-            response = request.execute()
+    entries = state.get('items', [])
+    uploading = state.get('uploading', [])
+    print(f"Upload queue ({state.get('policy') or config.queue_policy}, updated {state.get('updated_at')}): "
+          f"{len(entries)} videos waiting, {len(uploading)} uploading")
+    for entry in uploading:
+        _print_queue_entry("    >>", entry)
+    for position, entry in enumerate(entries, 1):
+        _print_queue_entry(f"{position:5d}.", entry)
 
-            for item in response.get("items", []):
-                if item["snippet"]["title"].lower() == playlist_name.lower():
-                    return item["id"]
 
-            next_page_token = response.get("nextPageToken")
+class PostUploadProcessor:
+    """
+    Étape de post-traitement des uploads, exécutée hors du chemin critique.
+
+    Les workers d'upload ne font qu'envoyer des octets : dès qu'une vidéo est
+    terminée (et enregistrée dans le registre), la miniature, l'ajout aux
+    playlists et la notification Discord sont confiés à ce pool, et l'upload
+    suivant démarre aussitôt. Chaque étape a ses propres essais avec backoff.
+    Les tâches s'exécutent avec le compte (et le contexte de log) de l'upload
+    qui les a soumises.
+    """
 
-        return None
-    except Exception as e:
-        print(f"Error finding playlist: {e}")
-        return None
+    def __init__(self, workers=POST_UPLOAD_WORKERS, max_attempts=POST_UPLOAD_MAX_ATTEMPTS):
+        """
+        Args:
+            workers (int): Nombre de threads de post-traitement
+            max_attempts (int): Nombre d'essais par étape
+        """
+        self.max_attempts = max_attempts
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers,
+                                                               thread_name_prefix='post-upload')
+        self._lock = threading.Lock()
+        self._pending = set()
+
+    def submit(self, job, *args):
+        """
+        Planifie une tâche de post-traitement.
+
+        Args:
+            job (callable): Tâche à exécuter (ses étapes passent par run_step())
+            *args: Arguments de la tâche
+
+        Returns:
+            concurrent.futures.Future: Tâche planifiée
+        """
+        future = self._executor.submit(contextvars.copy_context().run, job, *args)
+        with self._lock:
+            self._pending.add(future)
+            get_metrics().set('ytu_post_upload_pending', len(self._pending))
+        future.add_done_callback(self._on_done)
+        return future
+
+    def _on_done(self, future):
+        with self._lock:
+            self._pending.discard(future)
+            idle = not self._pending
+            get_metrics().set('ytu_post_upload_pending', len(self._pending))
+        if idle:
+            # Plus rien en cours : les notifications du lot partent ensemble
+            flush_discord_notifications()
+
+    def run_step(self, step, target, function, *args):
+        """
+        Exécute une étape, en la réessayant sur les erreurs temporaires.
+
+        Args:
+            step (str): Type d'étape ('thumbnail', 'playlist')
+            target (str): Vidéo ou playlist concernée (pour les logs)
+            function (callable): Fonction à exécuter
+            *args: Arguments de la fonction
+
+        Returns:
+            Résultat de l'étape, ou None en cas d'échec
+        """
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                result = function(*args)
+                get_metrics().inc('ytu_post_upload_steps_total', step=step, result='success')
+                return result
+            except Exception as e:
+                if isinstance(e, HttpError) and _is_quota_error(e):
+                    get_quota_ledger().mark_exhausted()
+                if attempt >= self.max_attempts or not _is_retriable_error(e):
+                    get_metrics().inc('ytu_post_upload_steps_total', step=step, result='failure')
+                    logger.error(f"Post-upload {step} for {target} failed: {e}")
+                    return None
+                delay = _retry_delay(attempt)
+                get_metrics().inc('ytu_post_upload_steps_total', step=step, result='retry')
+                logger.warning(f"Post-upload {step} for {target} failed ({e}), retry {attempt} in {delay:.1f}s")
+                time.sleep(delay)
+
+    def wait(self, timeout=None):
+        """
+        Attend la fin des tâches en cours.
+
+        Args:
+            timeout (float, optional): Durée maximale d'attente en secondes
+
+        Returns:
+            bool: True si toutes les tâches sont terminées
+        """
+        with self._lock:
+            pending = list(self._pending)
+        _, not_done = concurrent.futures.wait(pending, timeout)
+        return not not_done
+
+
+_post_processor = None
+_post_processor_lock = threading.Lock()
+
+
+def get_post_processor():
+    """
+    Retourne l'étape de post-traitement du processus (démarrée à la demande).
+
+    Returns:
+        PostUploadProcessor: Pool de post-traitement
+    """
+    global _post_processor
+    with _post_processor_lock:
+        if _post_processor is None:
+            _post_processor = PostUploadProcessor()
+        return _post_processor
 
 
-def create_playlist(youtube, playlist_name):
+def wait_for_post_processing(timeout=None):
     """
-    Crée une nouvelle playlist et retourne son ID.
+    Attend la fin du post-traitement, s'il a été démarré (avant l'arrêt du programme).
 
     Args:
-        youtube: Service YouTube API
-        playlist_name (str): Nom de la nouvelle playlist
+        timeout (float, optional): Durée maximale d'attente en secondes
+    """
+    if _post_processor is not None and not _post_processor.wait(timeout):
+        logger.warning("Some post-upload steps are still running")
 
-    Returns:
-        str: ID de la playlist créée ou None en cas d'erreur
+
+def _post_process_upload(video_id, thumbnail_path, webhook_url, embed, reservation=None):
     """
-    try:
-        request = youtube.playlists().insert(
-            part="snippet,status",
-            body={
-                "snippet": {
-                    "title": playlist_name,
-                    "description": f"Vidéos de la chaîne {playlist_name}"
-                },
-                "status": {
-                    "privacyStatus": "private"
-                }
-            }
-        )
-        response = request.execute()
-        print(f"Playlist '{playlist_name}' créée avec succès")
-        return response.get("id")
-    except Exception as e:
-        print(f"Error creating playlist: {e}")
-        return None
+    Tâche de post-traitement d'une vidéo : miniature puis notification Discord.
+
+    La notification part après la miniature pour que l'embed affiche la bonne image.
+    La part thumbnails.set de la réservation de quota n'est libérée qu'une fois
+    la miniature envoyée (ou abandonnée).
+    """
+    if thumbnail_path:
+        with use_quota_reservations([reservation] if reservation is not None else []):
+            get_post_processor().run_step('thumbnail', video_id, set_video_thumbnail,
+                                          get_worker_service(), video_id, thumbnail_path)
+    if reservation is not None:
+        get_quota_ledger().release(reservation, 'youtube.thumbnails.set')
+    if webhook_url:
+        # Envoyé en arrière-plan, regroupé avec les autres uploads du lot
+        get_discord_notifier().enqueue(webhook_url, embed)
 
 
-def add_video_to_playlist(youtube, playlist_id, video_id):
+def process_video(youtube, video_path, config):
     """
-    Ajoute une vidéo à une playlist.
+    Processes a single video for upload.
 
     Args:
-        youtube: Service YouTube API
-        playlist_id (str): ID de la playlist
-        video_id (str): ID de la vidéo à ajouter
+        youtube: YouTube API service object
+        video_path (str): Path to the video file
+        config (Config): Application configuration
 
     Returns:
-        dict: Réponse de l'API ou None en cas d'erreur
+        dict: Upload result, or None if the video was skipped
     """
-    try:
-        request = youtube.playlistItems().insert(
-            part="snippet",
-            body={
-                "snippet": {
-                    "playlistId": playlist_id,
-                    "resourceId": {
-                        "kind": "youtube#video",
-                        "videoId": video_id
-                    }
-                }
-            }
-        )
-        return request.execute()
-    except Exception as e:
-        print(f"Error adding video to playlist: {e}")
-        return None
+    # Chaque ligne de log de cet upload porte le chemin de la vidéo et la durée écoulée
+    with log_context(video=video_path, started=time.monotonic()):
+        # Check if already uploaded
+        if is_already_uploaded(video_path):
+            logger.debug(f"Skipping already uploaded video: {video_path}")
+            return None
 
+        # Respecter le plafond journalier d'uploads
+        daily_cap = get_daily_upload_cap(config)
+        if daily_cap and not daily_cap.reserve():
+            logger.warning(f"Daily upload cap reached ({daily_cap.max_uploads}), postponing: {video_path}")
+            return None
 
-def add_to_channel_playlist(youtube, video_id, channel_name):
-    """
-    Ajoute une vidéo à une playlist correspondant au nom de la chaîne.
-    Si la playlist n'existe pas, elle est créée.
+        # Ne pas démarrer un upload que le quota restant ne couvre pas
+        quota = get_quota_ledger()
+        quota_costs = estimate_upload_cost(video_path, config)
+        reservation = quota.reserve(quota_costs)
+        if reservation is None:
+            logger.info(f"Not enough API quota left ({quota.remaining()} units, "
+                        f"{sum(quota_costs.values())} needed), postponing: {video_path}")
+            if daily_cap:
+                daily_cap.release()
+            return None
 
-    Args:
-        youtube: Service YouTube API
-        video_id: ID de la vidéo YouTube
-        channel_name: Nom de la chaîne extrait du chemin
-    """
-    # Rechercher si une playlist avec ce nom existe déjà
-    playlist_id = find_playlist_by_name(youtube, channel_name)
+        # Extract channel name for playlist
+        channel_name = extract_channel_name(video_path)
 
-    # Si aucune playlist n'existe, en créer une nouvelle
-    if not playlist_id:
-        playlist_id = create_playlist(youtube, channel_name)
+        # Si on est en mode Ganymede, utiliser le display_name des métadonnées
+        if config.ganymede_mode:
+            channel_name = get_channel_display_name(video_path, channel_name)
+
+        if channel_name:
+            logger.debug(f"Detected channel: {channel_name}")
 
-    # Ajouter la vidéo à la playlist
-    if playlist_id:
-        result = add_video_to_playlist(youtube, playlist_id, video_id)
-        if result:
-            print(f"Vidéo ajoutée à la playlist '{channel_name}'")
+        # Prepare upload options
+        options = {
+            "categoryId": config.video_category,
+            "privacyStatus": config.privacy_status,
+            "tags": list(config.tags),
+        }
+
+        # If not in Ganymede mode, use filename as title and default description
+        if not config.ganymede_mode:
+            options["title"] = os.path.splitext(os.path.basename(video_path))[0]
+            options["description"] = config.description
+
+        # Upload the video
+        result = None
+        try:
+            with use_quota_reservations([reservation]):
+                result = upload_video(youtube, video_path, options, is_ganymede=config.ganymede_mode,
+                                      limiter=get_upload_throttle(config),
+                                      chunk_controller=get_chunk_controller(config),
+                                      max_retries=config.upload_max_retries,
+                                      retry_deadline=config.upload_retry_deadline * 60,
+                                      progress_interval=config.log_progress_interval,
+                                      set_thumbnail=False,
+                                      media_class=MmapMediaUpload if config.mmap_upload else MediaFileUpload)
+        finally:
+            if result and result.get('success'):
+                # videos.insert est imputé à l'ouverture de la session ; les parts de
+                # la miniature et de la playlist restent réservées jusqu'à leur appel
+                quota.release(reservation, 'youtube.videos.insert')
+            else:
+                quota.release(reservation)
+
+        if daily_cap and not (result and result.get('success')):
+            daily_cap.release()
+
+        # Un upload abouti prouve que la connexion et les credentials sont valides
+        if result and result.get('success'):
+            get_connection_health().record_success()
         else:
-            print(f"Échec de l'ajout à la playlist '{channel_name}'")
-    else:
-        print(f"Impossible de créer ou trouver une playlist pour '{channel_name}'")
+            get_connection_health().record_failure()
+
+        # Record the upload
+        if result and result.get('success'):
+            video_id = result.get('video_id')
+            video_title = result.get('title')
+            # Écrit tout de suite : un arrêt pendant le post-traitement ne doit pas provoquer de doublon
+            record_upload(video_path, video_id)
+
+            # Add to channel playlist if auto_playlist enabled AND Ganymede mode is active
+            if config.auto_playlist and channel_name and config.ganymede_mode:
+                # Regroupé par chaîne et envoyé en batch à la fin du lot
+                queue_playlist_addition(channel_name, video_id, reservation)
+            else:
+                quota.release(reservation, 'youtube.playlistItems.insert')
+                if config.auto_playlist and channel_name and not config.ganymede_mode:
+                    logger.info("Playlist addition disabled (Ganymede mode inactive)")
+
+            # Send Discord notification if webhook URL is configured
+            webhook_url = config.discord_webhook
+            embed = None
+            if webhook_url:
+                video_url = f"https://www.youtube.com/watch?v={video_id}"
+                thumbnail_url = f"https://img.youtube.com/vi/{video_id}/maxresdefault.jpg"
+
+                embed = {
+                    "title": video_title,
+                    "description": "Nouvelle vidéo mise en ligne avec succès !",
+                    "url": video_url,
+                    "color": 5814783,
+                    "fields": [
+                        {
+                            "name": "Chaîne",
+                            "value": channel_name if channel_name else "Non spécifiée",
+                            "inline": True
+                        },
+                        {
+                            "name": "Statut",
+                            "value": options["privacyStatus"],
+                            "inline": True
+                        }
+                    ],
+                    "footer": {
+                        "text": "Uploaded with PyYTUploader"
+                    },
+                    "timestamp": get_local_timestamp(),
+                    "image": {
+                        "url": thumbnail_url
+                    }
+                }
 
+            # Miniature et notification : hors du chemin critique, l'upload suivant démarre aussitôt
+            if not result.get('thumbnail_path'):
+                quota.release(reservation, 'youtube.thumbnails.set')
+            if result.get('thumbnail_path') or webhook_url:
+                get_post_processor().submit(_post_process_upload, video_id,
+                                            result.get('thumbnail_path'), webhook_url, embed, reservation)
 
-def is_already_uploaded(video_path):
+        return result
+
+
+def _process_video_in_worker(video_path, config):
     """
-    Checks if a video has already been uploaded.
+    Exécute process_video() dans un worker avec son propre service YouTube.
 
     Args:
         video_path (str): Path to the video file
+        config (Config): Application configuration
 
     Returns:
-        bool: True if already uploaded, False otherwise
+        dict: Upload result, or None if the video was skipped
     """
-    if not os.path.exists(UPLOADS_FILE):
-        return False
-
     try:
-        with open(UPLOADS_FILE, 'r') as f:
-            uploads = json.load(f)
-
-        return video_path in uploads
+        return process_video(get_worker_service(), video_path, config)
     except Exception as e:
-        print(f"Error checking upload status: {e}")
-        return False
+        logger.error(f"Error processing {video_path}: {e}")
+        return {'success': False, 'error': str(e)}
 
 
-def record_upload(video_path, video_id):
+def _upload_from_queue(youtube, config, worker=False):
     """
-    Records a successful upload.
+    Uploade une à une les vidéos de la file routées vers le compte courant,
+    en prenant à chaque fois la prochaine selon la politique de la file.
 
     Args:
-        video_path (str): Path to the video file
-        video_id (str): YouTube video ID
+        youtube: YouTube API service object
+        config (Config): Application configuration
+        worker (bool): Exécuté par un worker du pool (connexion déjà vérifiée pour le lot)
+
+    Returns:
+        tuple: (service to use afterwards or None, number of successful uploads)
     """
-    uploads = {}
+    queue = get_upload_queue()
+    account = get_current_account()
+    quota = get_quota_ledger()
+    succeeded = 0
+    while True:
+        if quota.remaining() < QUOTA_COSTS['youtube.videos.insert']:
+            if not worker and queue.count(account):
+                logger.warning("API quota exhausted, remaining videos postponed to the next quota day")
+            break
 
-    # Load existing uploads if file exists
-    if os.path.exists(UPLOADS_FILE):
-        try:
-            with open(UPLOADS_FILE, 'r') as f:
-                uploads = json.load(f)
-        except Exception as e:
-            print(f"Error loading uploads file: {e}")
+        video_path = queue.pop(config, account)
+        if video_path is None:
+            break
 
-    # Add the new upload
-    uploads[video_path] = {
-        'video_id': video_id,
-        'upload_time': datetime.datetime.now().isoformat()
-    }
+        if not worker:
+            # Vérifier la connexion seulement après un échec ou si le dernier succès est ancien
+            youtube = ensure_api_connection(youtube, config)
+            if not youtube:
+                queue.done(video_path, requeue=True)
+                logger.warning("Re-authentication failed, skipping this upload cycle")
+                break
 
-    # Save the updated uploads
-    try:
-        with open(UPLOADS_FILE, 'w') as f:
-            json.dump(uploads, f, indent=2)
-    except Exception as e:
-        print(f"Error saving uploads file: {e}")
+        result = None
+        try:
+            if worker:
+                result = _process_video_in_worker(video_path, config)
+            else:
+                result = process_video(youtube, video_path, config)
+        finally:
+            # Plafond journalier ou quota atteint : la vidéo reste en file pour plus tard
+            postponed = result is None and not is_already_uploaded(video_path)
+            queue.done(video_path, requeue=postponed)
+        if postponed:
+            break
+        if result and result.get('success'):
+            succeeded += 1
 
+    return youtube, succeeded
 
-def parse_arguments():
-    """
-    Parses command line arguments.
 
-    Returns:
-        argparse.Namespace: Parsed arguments
+def upload_videos_parallel(youtube, config):
     """
-    parser = argparse.ArgumentParser(description='YouTube Uploader')
-    parser.add_argument('-s', '--setup', action='store_true', help='Run interactive setup')
-    parser.add_argument('--reauth', action='store_true', help='Force re-authentication by deleting the token file')
-    parser.add_argument('-r', '--run-once', action='store_true', help='Run once and exit (don\'t start scheduler)')
-    parser.add_argument('-i', '--interval', type=int, help='Set scan interval in minutes')
-    parser.add_argument('-f', '--folder', type=str, help='Set videos folder path')
-    parser.add_argument('-g', '--ganymede', action='store_true', help='Enable Ganymede mode for VOD metadata')
-    parser.add_argument('-p', '--auto-playlist', action='store_true', help='Auto-add videos to channel playlists')
-    return parser.parse_args()
+    Uploads the queued videos of the current account with a bounded worker pool.
 
+    Args:
+        youtube: YouTube API service object (credentials are shared by workers)
+        config (Config): Application configuration
 
-def get_config():
+    Returns:
+        int: Number of successful uploads
     """
-    Gets the application configuration from environment variables and command line arguments.
+    account = get_current_account()
+    queue = get_upload_queue()
+    queued = queue.count(account)
+    max_workers = max(1, min(account.parallel_uploads(config), queued))
+    logger.info(f"Uploading {queued} queued videos with {max_workers} parallel workers...")
+
+    # Pool durable du compte : les workers gardent leur service d'un lot à l'autre
+    executor = account.get_upload_executor(config)
+    # Chaque worker hérite du compte courant (et du contexte de log) et prend
+    # la prochaine vidéo de la file dès qu'il se libère
+    futures = [executor.submit(contextvars.copy_context().run,
+                               _upload_from_queue, youtube, config, True)
+               for _ in range(max_workers)]
+    succeeded = 0
+    for future in concurrent.futures.as_completed(futures):
+        succeeded += future.result()[1]
+
+    logger.info(f"Parallel upload batch finished: {succeeded} succeeded, {queue.count(account)} still queued")
+    return succeeded
+
+
+def upload_batch(youtube, config):
+    """
+    Uploads the videos queued for the current account, sequentially or with the worker pool.
+
+    Args:
+        youtube: YouTube API service object
+        config (Config): Application configuration
 
     Returns:
-        dict: Application configuration
+        googleapiclient.discovery.Resource: Service to use afterwards (None if re-auth failed)
     """
-    config = {
-        'videos_folder': os.environ.get('YTU_VIDEOS_FOLDER', ''),
-        'privacy_status': os.environ.get('YTU_PRIVACY_STATUS', 'private'),
-        'check_interval': int(os.environ.get('YTU_CHECK_INTERVAL', '60')),
-        'client_secrets': os.environ.get('YTU_CLIENT_SECRETS', 'data/client_secrets.json'),
-        'video_category': os.environ.get('YTU_VIDEO_CATEGORY', '22'),
-        'description': os.environ.get('YTU_DESCRIPTION', 'Uploaded with YTU'),
-        'tags': os.environ.get('YTU_TAGS', 'YTU Upload').split(','),
-        'ganymede_mode': os.environ.get('YTU_GANYMEDE_MODE', 'false').lower() == 'true',
-        'auto_playlist': os.environ.get('YTU_AUTO_PLAYLIST', 'false').lower() == 'true',
-        'discord_webhook': os.environ.get('YTU_DISCORD_WEBHOOK', '')
-    }
-
-    # Override with command line arguments if provided
-    args = parse_arguments()
-    if args.interval:
-        config['check_interval'] = args.interval
-    if args.folder:
-        config['videos_folder'] = args.folder
-    if args.ganymede:
-        config['ganymede_mode'] = True
-    if args.auto_playlist:
-        config['auto_playlist'] = True
+    # Quota épuisé : les uploads reprennent automatiquement après minuit (Pacifique)
+    quota = get_quota_ledger()
+    if quota.remaining() < QUOTA_COSTS['youtube.videos.insert']:
+        logger.warning(f"API quota exhausted ({quota.remaining()} units left), uploads paused until "
+                       f"{quota.reset_time():%Y-%m-%d %H:%M %Z}")
+        return youtube
+
+    account = get_current_account()
+    if account.parallel_uploads(config) > 1 and get_upload_queue().count(account) > 1:
+        # Les workers partagent les credentials : une seule vérification par lot
+        youtube = ensure_api_connection(youtube, config)
+        if youtube:
+            upload_videos_parallel(youtube, config)
+            flush_playlist_additions()
+        else:
+            logger.warning("Re-authentication failed, skipping this upload cycle")
+        return youtube
 
-    return config
+    youtube, _ = _upload_from_queue(youtube, config)
+    if youtube:
+        flush_playlist_additions()
+    return youtube
 
 
-def scan_for_videos(config):
+def _upload_account_batch(account, config):
     """
-    Scans the configured folder for videos to upload.
+    Uploade les vidéos en file pour un compte secondaire, avec son propre service.
 
     Args:
-        config (dict): Application configuration
+        account (Account): Compte cible
+        config (Config): Application configuration
+    """
+    with use_account(account), log_context(account=account.name):
+        # Jamais d'authentification interactive ici : elle bloquerait les autres comptes
+        youtube = account.service or get_authenticated_service(config, interactive=False)
+        if not youtube:
+            logger.error(f"Account '{account.name}' is not authenticated, "
+                         f"{get_upload_queue().count(account)} videos kept in the queue. "
+                         f"Run 'python youtube_uploader.py --reauth --account {account.name}'")
+            return
+        upload_batch(youtube, config)
 
-    Returns:
-        list: List of video paths to upload
+
+def upload_routed(youtube, config):
     """
-    videos_folder = config['videos_folder']
-    if not os.path.exists(videos_folder):
-        print(f"Videos folder not found: {videos_folder}")
-        return []
+    Uploade la file d'attente : chaque compte traite en parallèle les vidéos
+    routées vers lui d'après leur chaîne, avec son service, son quota et ses
+    workers. Un nouveau tour est lancé si des vidéos sont arrivées pendant le
+    lot pour un compte qui avait déjà terminé.
 
-    videos_to_upload = []
+    Args:
+        youtube: Service YouTube API du compte par défaut
+        config (Config): Application configuration
 
-    # If in Ganymede mode, look specifically for *-video.mp4 files
-    if config['ganymede_mode']:
-        for root, dirs, files in os.walk(videos_folder):
-            # Exclure le dossier 'temp'
-            if 'temp' in dirs:
-                dirs.remove('temp')
-            for file in files:
-                if file.endswith('-video.mp4'):
-                    videos_to_upload.append(os.path.join(root, file))
-    else:
-        # Standard mode - look for all .mp4 files
-        for root, dirs, files in os.walk(videos_folder):
-            # Exclure le dossier 'temp'
-            if 'temp' in dirs:
-                dirs.remove('temp')
-            for file in files:
-                if file.endswith('.mp4'):
-                    videos_to_upload.append(os.path.join(root, file))
+    Returns:
+        googleapiclient.discovery.Resource: Service du compte par défaut (None if re-auth failed)
+    """
+    queue = get_upload_queue()
+    default_account = get_account()
+    while youtube:
+        added = queue.added_count
+        groups = queue.count_by_account()
+        if not groups:
+            break
 
-    return videos_to_upload
+        other_accounts = [account for account in groups if account is not default_account]
+        if other_accounts:
+            logger.info("Uploading to " + ", ".join(f"{account.name} ({count} videos)"
+                                                    for account, count in groups.items()))
+        threads = []
+        for account in other_accounts:
+            thread = threading.Thread(target=contextvars.copy_context().run,
+                                      args=(_upload_account_batch, account, config),
+                                      name=f'account-{account.name}', daemon=True)
+            thread.start()
+            threads.append(thread)
+
+        if default_account in groups:
+            youtube = upload_batch(youtube, config)
+        for thread in threads:
+            thread.join()
+
+        # Vidéos restantes sans nouvelle arrivée : reportées (quota, plafond journalier)
+        if queue.added_count == added:
+            break
+    queue.save(force=True)
+    return youtube
 
 
-def process_video(youtube, video_path, config):
+def wait_for_next_cycle(youtube, feed, config):
     """
-    Processes a single video for upload.
+    Waits until the next full scan, uploading videos reported by the watcher meanwhile.
 
     Args:
         youtube: YouTube API service object
-        video_path (str): Path to the video file
-        config (dict): Application configuration
-    """
-    # Check if already uploaded
-    if is_already_uploaded(video_path):
-        print(f"Skipping already uploaded video: {video_path}")
-        return
-
-    # Extract channel name for playlist
-    channel_name = extract_channel_name(video_path)
-
-    # Si on est en mode Ganymede, utiliser le display_name des métadonnées
-    if config['ganymede_mode']:
-        channel_name = get_channel_display_name(video_path, channel_name)
+        feed (WatcherFeed): Folder watcher feeding the upload queue, or None for a plain sleep
+        config (Config): Application configuration
 
-    if channel_name:
-        print(f"Detected channel: {channel_name}")
+    Returns:
+        googleapiclient.discovery.Resource: Service to use afterwards (None if re-auth failed)
+    """
+    interval = config.check_interval * 60
+    if not feed:
+        # L'attente est interrompue par un SIGHUP (rechargement de la configuration)
+        _reload_requested.wait(interval)
+        return youtube
+
+    deadline = time.monotonic() + interval
+    while youtube and not _reload_requested.is_set():
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
 
-    # Prepare upload options
-    options = {
-        "categoryId": config['video_category'],
-        "privacyStatus": config['privacy_status'],
-        "tags": config['tags'],
-    }
+        # Attendre par tranches courtes pour réagir rapidement à un SIGHUP
+        added = feed.poll(config, min(remaining, 5))
+        if feed.watcher.overflowed:
+            # File d'événements saturée : le scan complet prend le relais
+            logger.warning("Watcher event queue overflowed, running a full scan...")
+            feed.watcher.overflowed = False
+            break
 
-    # If not in Ganymede mode, use filename as title and default description
-    if not config['ganymede_mode']:
-        options["title"] = os.path.splitext(os.path.basename(video_path))[0]
-        options["description"] = config['description']
-
-    # Upload the video
-    result = upload_video(youtube, video_path, options, is_ganymede=config['ganymede_mode'])
-
-    # Record the upload
-    if result and result.get('success'):
-        video_id = result.get('video_id')
-        video_title = result.get('title')
-        record_upload(video_path, video_id)
-
-        # Add to channel playlist if auto_playlist enabled AND Ganymede mode is active
-        if config['auto_playlist'] and channel_name and config['ganymede_mode']:
-            add_to_channel_playlist(youtube, video_id, channel_name)
-        elif config['auto_playlist'] and channel_name and not config['ganymede_mode']:
-            print("Ajout à la playlist désactivé (Ganymede Mode inactif)")
-
-        # Send Discord notification if webhook URL is configured
-        webhook_url = config.get('discord_webhook')
-        if webhook_url:
-            video_url = f"https://www.youtube.com/watch?v={video_id}"
-            thumbnail_url = f"https://img.youtube.com/vi/{video_id}/maxresdefault.jpg"
-
-            message = {
-                "embeds": [
-                    {
-                        "title": video_title,
-                        "description": f"Nouvelle vidéo mise en ligne avec succès !",
-                        "url": video_url,
-                        "color": 5814783,
-                        "fields": [
-                            {
-                                "name": "Chaîne",
-                                "value": channel_name if channel_name else "Non spécifiée",
-                                "inline": True
-                            },
-                            {
-                                "name": "Statut",
-                                "value": options["privacyStatus"],
-                                "inline": True
-                            }
-                        ],
-                        "footer": {
-                            "text": "Uploaded with PyYTUploader"
-                        },
-                        "timestamp": get_local_timestamp(),
-                        "image": {
-                            "url": thumbnail_url
-                        }
-                    }
-                ]
-            }
+        if added:
+            youtube = upload_routed(youtube, config)
 
-            send_discord_notification(webhook_url, message)
+    return youtube
 
 
 def run_uploader():
     """
     Main function to run the uploader with improved token management.
     """
-    config = get_config()
     args = parse_arguments()
+    config = get_config(args)
 
     # Create data directory if it doesn't exist
     os.makedirs('data', exist_ok=True)
+    apply_runtime_config(config)
+
+    # Reprendre l'envoi des notifications Discord restées en attente
+    if os.path.exists(NOTIFICATIONS_FILE):
+        get_discord_notifier()
+
+    # Afficher le quota restant sans rien uploader
+    if args.status:
+        print_status(config)
+        return
+
+    # Afficher la file d'attente sans rien uploader
+    if args.show_queue:
+        show_upload_queue(config)
+        return
+
+    account = get_account(args.account)
+    if account is None:
+        logger.error(f"Unknown account '{args.account}' (see {ACCOUNTS_FILE})")
+        return
 
     # Re-authentication mode
     if args.reauth:
-        delete_token_file()
-        print("Running setup to re-authenticate...")
-        youtube = get_authenticated_service(interactive=True)
-        if youtube and test_api_connection(youtube):
-            print("Re-authentication successful!")
-        else:
-            print("Re-authentication failed.")
+        with use_account(account):
+            delete_token_file(account.token_file)
+            logger.info(f"Running setup to re-authenticate account '{account.name}'...")
+            youtube = get_authenticated_service(config, interactive=True)
+            if youtube and test_api_connection(youtube):
+                logger.info("Re-authentication successful!")
+            else:
+                logger.error("Re-authentication failed.")
         return
 
     # Setup mode
     if args.setup:
-        print("Running setup...")
-        youtube = get_authenticated_service(interactive=True)
-        if youtube and test_api_connection(youtube):
-            print("Authentication successful!")
-        else:
-            print("Setup failed.")
+        with use_account(account):
+            logger.info(f"Running setup for account '{account.name}'...")
+            youtube = get_authenticated_service(config, interactive=True)
+            if youtube and test_api_connection(youtube):
+                logger.info("Authentication successful!")
+            else:
+                logger.error("Setup failed.")
         return
 
     # Run once mode
     if args.run_once:
-        youtube = get_authenticated_service(interactive=True)
+        youtube = get_authenticated_service(config, interactive=True)
         if not youtube:
-            print("Authentication failed.")
+            logger.error("Authentication failed.")
             return
 
         if not test_api_connection(youtube):
-            print("API connection test failed.")
+            logger.error("API connection test failed.")
             return
 
-        videos = scan_for_videos(config)
-        print(f"Found {len(videos)} videos to upload.")
+        videos = filter_stable_videos(filter_new_videos(scan_for_videos(config)), config)
+        get_upload_queue().add(videos, config)
+        logger.info(f"Found {len(videos)} videos to upload, {get_upload_queue().count()} queued.")
 
-        for video_path in videos:
-            process_video(youtube, video_path, config)
+        upload_routed(youtube, config)
+        wait_for_post_processing()
+        flush_discord_notifications(wait=True)
+        write_status_file()
 
         return
 
     # Scheduler mode avec gestion améliorée des tokens
-    print(f"Starting YouTube Uploader scheduler...")
-    print(f"Videos folder: {config['videos_folder']}")
-    print(f"Check interval: {config['check_interval']} minutes")
-    print(f"Ganymede mode: {'Enabled' if config['ganymede_mode'] else 'Disabled'}")
-    print(f"Auto-playlist: {'Enabled' if config['auto_playlist'] else 'Disabled'}")
-    print(f"Discord notifications: {'Enabled' if config['discord_webhook'] else 'Disabled'}")
-
+    logger.info("Starting YouTube Uploader scheduler...")
+    logger.info(f"Videos folder: {config.videos_folder}")
+    logger.info(f"Check interval: {config.check_interval} minutes")
+    logger.info(f"Ganymede mode: {'Enabled' if config.ganymede_mode else 'Disabled'}")
+    logger.info(f"Auto-playlist: {'Enabled' if config.auto_playlist else 'Disabled'}")
+    logger.info(f"Discord notifications: {'Enabled' if config.discord_webhook else 'Disabled'}")
+    logger.info(f"Parallel uploads: {config.max_parallel_uploads}")
+    logger.info(f"Watch mode: {'Enabled' if config.watch_mode else 'Disabled'}")
+
+    if config.metrics_port:
+        start_metrics_server(config.metrics_port)
+
+    # SIGHUP : recharger la configuration sans redémarrer ni couper les uploads en cours
+    if hasattr(signal, 'SIGHUP'):
+        signal.signal(signal.SIGHUP, _handle_sighup)
+
+    watcher = create_folder_watcher(config)
+    feed = get_upload_queue().feed = WatcherFeed(watcher) if watcher else None
     youtube = None
     last_auth_check = datetime.datetime.utcnow()
     auth_check_interval = timedelta(minutes=30)  # Vérifier l'auth toutes les 30 minutes
 
     while True:
         try:
+            if _reload_requested.is_set():
+                _reload_requested.clear()
+                previous_config = config
+                config = reload_config(config, args)
+                apply_runtime_config(config)
+                if (config.watch_mode, config.videos_folder, config.ganymede_mode) != (
+                        previous_config.watch_mode, previous_config.videos_folder, previous_config.ganymede_mode):
+                    if watcher:
+                        watcher.close()
+                    watcher = create_folder_watcher(config)
+                    feed = get_upload_queue().feed = WatcherFeed(watcher) if watcher else None
+
             current_time = datetime.datetime.utcnow()
             
             # Vérifier périodiquement si une ré-authentification est nécessaire
             if not youtube or (current_time - last_auth_check) >= auth_check_interval:
-                print("Checking authentication status...")
-                youtube = get_authenticated_service(interactive=False)
+                logger.info("Checking authentication status...")
+                youtube = get_authenticated_service(config, interactive=False)
                 last_auth_check = current_time
                 
                 if not youtube:
-                    print("Authentication failed. Retrying in 5 minutes...")
+                    logger.warning("Authentication failed. Retrying in 5 minutes...")
                     time.sleep(300)
                     continue
                     
                 if not test_api_connection(youtube):
-                    print("API connection test failed. Retrying in 5 minutes...")
+                    logger.warning("API connection test failed. Retrying in 5 minutes...")
                     youtube = None
                     time.sleep(300)
                     continue
 
-            videos = scan_for_videos(config)
-            if videos:
-                print(f"Found {len(videos)} videos to upload.")
-
-                for video_path in videos:
-                    # Avant chaque upload, vérifier si le service est toujours valide
-                    if not test_api_connection(youtube):
-                        print("API connection lost, re-authenticating...")
-                        youtube = get_authenticated_service(interactive=False)
-                        if not youtube:
-                            print("Re-authentication failed, skipping this upload cycle")
-                            break
-                    
-                    process_video(youtube, video_path, config)
+            # Recharger le registre une seule fois par cycle
+            get_ledger().reload()
+            get_upload_sessions().cleanup()
+            videos = filter_stable_videos(filter_new_videos(scan_for_videos(config)), config)
+            queue = get_upload_queue()
+            queue.add(videos, config)
+            if queue.count():
+                logger.info(f"Found {len(videos)} videos to upload, {queue.count()} queued "
+                            f"({config.queue_policy} order).")
+                youtube = upload_routed(youtube, config)
             else:
-                print("No videos found to upload.")
+                logger.info("No videos found to upload.")
+
+            probes = skipped_probes = 0
+            for account in get_accounts():
+                account_probes, account_skipped = account.health.reset_counters()
+                probes += account_probes
+                skipped_probes += account_skipped
+            write_status_file()
+            quota_summary = ', '.join(
+                f"{name} {status['remaining']}/{status['daily_quota']}"
+                for name, status in update_quota_gauges().items())
+            logger.info(f"Cycle summary: {probes} API connection checks, "
+                        f"{skipped_probes} checks skipped (channels.list round trips saved), "
+                        f"quota remaining: {quota_summary} units")
 
             # Wait for the next check
-            print(f"Next check in {config['check_interval']} minutes...")
-            time.sleep(config['check_interval'] * 60)
+            if watcher:
+                logger.info(f"Watching for new videos, next full scan in {config.check_interval} minutes...")
+            else:
+                logger.info(f"Next check in {config.check_interval} minutes...")
+            youtube = wait_for_next_cycle(youtube, feed, config)
 
         except KeyboardInterrupt:
-            print("Uploader stopped by user.")
+            logger.info("Uploader stopped by user.")
+            if watcher:
+                watcher.close()
+            get_upload_queue().save(force=True)
+            wait_for_post_processing(timeout=60)
+            flush_discord_notifications(wait=True)
             break
         except Exception as e:
-            print(f"An error occurred: {e}")
-            print("Retrying in 5 minutes...")
+            logger.exception(f"An error occurred, retrying in 5 minutes: {e}")
             youtube = None  # Force re-authentication on next cycle
             time.sleep(300)
 